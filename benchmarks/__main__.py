@@ -0,0 +1,59 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Benchmark CLI
+# File         : __main__.py
+# Author       : AHMED ZARAI
+# Purpose      : `python -m benchmarks run|compare` with regression gating
+# =============================================================================
+
+import os
+import sys
+import argparse
+
+from benchmarks import bench_core, bench_pipeline  # noqa: F401  (registers benchmarks)
+from benchmarks.harness import run_suite, compare, save_report, load_report
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BASE_DIR, "results", "benchmarks")
+LATEST_REPORT = os.path.join(RESULTS_DIR, "latest.json")
+BASELINE_REPORT = os.path.join(RESULTS_DIR, "baseline.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="EmergenceLab hot-path benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the suite and write a JSON report")
+    run.add_argument("--filter", default=None, help="Only benchmarks whose name contains this")
+    run.add_argument("--quick", action="store_true", help="First value of every sweep axis only")
+    run.add_argument("--rounds", type=int, default=7)
+    run.add_argument("--min-time", type=float, default=0.25, help="Seconds spent timing each case")
+    run.add_argument("--output", default=LATEST_REPORT)
+    run.add_argument("--save-baseline", action="store_true", help="Also store the report as the baseline")
+
+    cmp = commands.add_parser("compare", help="Fail if the current report regressed against the baseline")
+    cmp.add_argument("--baseline", default=BASELINE_REPORT)
+    cmp.add_argument("--current", default=LATEST_REPORT)
+    cmp.add_argument("--threshold", type=float, default=0.15, help="Allowed relative slowdown of the median")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_suite(args.filter, quick=args.quick, rounds=args.rounds, min_time=args.min_time)
+        save_report(report, args.output)
+        print(f"💾 Results written to {args.output}")
+        if args.save_baseline:
+            save_report(report, BASELINE_REPORT)
+            print(f"📌 Baseline updated: {BASELINE_REPORT}")
+        return 0
+
+    regressions = compare(load_report(args.baseline), load_report(args.current), args.threshold)
+    if regressions:
+        print(f"❌ {len(regressions)} benchmark(s) failed, missing or slower than baseline "
+              f"by more than {args.threshold:.0%}")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
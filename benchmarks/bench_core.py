@@ -0,0 +1,73 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Core Hot-Path Benchmarks
+# File         : bench_core.py
+# Author       : AHMED ZARAI
+# Purpose      : Field, noise, entropy, KL and mutual-information timings
+# =============================================================================
+
+import numpy as np
+
+from benchmarks.harness import register, STATE_DIMS, AGENT_COUNTS
+from environment.entropy_field import EntropyField
+from environment.noise_model import NoiseModel, NOISE_KINDS
+from metrics.entropy import shannon_entropy
+from metrics.kl_divergence import kl_divergence, kl_matrix
+from metrics.mutual_information import compute_mutual_information
+
+SEED = 1234
+
+
+def _beliefs(rng, num_agents, state_dim):
+    return rng.dirichlet(np.ones(state_dim), num_agents)
+
+
+# =============================================================================
+# 🌍 Environment
+# =============================================================================
+@register("entropy_field.step", state_dim=STATE_DIMS, num_agents=AGENT_COUNTS)
+def bench_field_step(state_dim, num_agents):
+    rng = np.random.default_rng(SEED)
+    field = EntropyField(state_dim=state_dim)
+    noise = NoiseModel(noise_level=0.05, state_dim=state_dim, seed=SEED)
+    actions = rng.integers(0, state_dim, num_agents)
+    return lambda: field.step(actions, noise)
+
+
+@register("noise_model.sample", state_dim=STATE_DIMS, kind=NOISE_KINDS, ar_coeff=(0.0, 0.8))
+def bench_noise_sample(state_dim, kind, ar_coeff):
+    noise = NoiseModel(noise_level=0.05, state_dim=state_dim, seed=SEED, kind=kind, ar_coeff=ar_coeff)
+    return lambda: noise.sample(state_dim)
+
+
+# =============================================================================
+# 📊 Metrics
+# =============================================================================
+@register("shannon_entropy.continuous", state_dim=STATE_DIMS)
+def bench_entropy_continuous(state_dim):
+    state = np.random.default_rng(SEED).standard_normal(state_dim)
+    return lambda: shannon_entropy(state)
+
+
+@register("shannon_entropy.discrete", state_dim=STATE_DIMS, num_agents=AGENT_COUNTS)
+def bench_entropy_discrete(state_dim, num_agents):
+    actions = np.random.default_rng(SEED).integers(0, state_dim, num_agents)
+    return lambda: shannon_entropy(actions)
+
+
+@register("kl_divergence.pair", state_dim=STATE_DIMS)
+def bench_kl_pair(state_dim):
+    p, q = _beliefs(np.random.default_rng(SEED), 2, state_dim)
+    return lambda: kl_divergence(p, q)
+
+
+@register("kl_divergence.matrix", state_dim=STATE_DIMS, num_agents=AGENT_COUNTS)
+def bench_kl_matrix(state_dim, num_agents):
+    beliefs = _beliefs(np.random.default_rng(SEED), num_agents, state_dim)
+    out = np.empty((num_agents, num_agents))
+    return lambda: kl_matrix(beliefs, out=out)
+
+
+@register("mutual_information", state_dim=STATE_DIMS, num_agents=AGENT_COUNTS)
+def bench_mutual_information(state_dim, num_agents):
+    beliefs = _beliefs(np.random.default_rng(SEED), num_agents, state_dim)
+    return lambda: compute_mutual_information(beliefs)
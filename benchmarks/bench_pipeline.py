@@ -0,0 +1,176 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Pipeline Benchmarks
+# File         : bench_pipeline.py
+# Author       : AHMED ZARAI
+# Purpose      : Trainer step, dashboard serialization and trainer → socket latency
+# =============================================================================
+
+import os
+import sys
+import json
+import time
+import uuid
+import tempfile
+import subprocess
+import multiprocessing
+
+from benchmarks.harness import register, STATE_DIMS, AGENT_COUNTS
+from config.loader import load_config, with_overrides
+from metrics.kl_divergence import kl_matrix
+import simulation.trainer as trainer_module
+from simulation.trainer import Trainer, CONFIG_PATH, BASE_DIR
+
+TRANSPORTS = ("shm", "json")
+WRITE_INTERVAL = 0.1     # Longer than the JSON poll interval, so no frame is coalesced
+ATTACH_GRACE = 0.5       # Time given to the watcher to attach / drain the ring
+
+
+def _trainer(state_dim, num_agents):
+    config = with_overrides(load_config(CONFIG_PATH), {
+        "environment.state_dim": state_dim,
+        "agents.num_agents": num_agents,
+        "agents.vocabulary_size": state_dim,
+    })
+    return Trainer(config, headless=True, seed=0, metrics_dir=None)
+
+
+def _dashboard_payload(trainer):
+    """Arguments of `_write_dashboard` for every agent of the population."""
+    beliefs = trainer.population.beliefs
+    n = beliefs.shape[0]
+    return (
+        trainer.step_count, 1.0, 0.5, 0.5,
+        [{"agent": f"A{i+1}", "belief": b.tolist()} for i, b in enumerate(beliefs)],
+        kl_matrix(beliefs).tolist(),
+        [[i, (i + 1) % n, 0.5] for i in range(n)],
+    )
+
+
+# =============================================================================
+# 🧠 Simulation Step
+# =============================================================================
+@register("trainer.step", state_dim=STATE_DIMS, num_agents=AGENT_COUNTS)
+def bench_trainer_step(state_dim, num_agents):
+    trainer = _trainer(state_dim, num_agents)
+    return trainer.step
+
+
+# =============================================================================
+# 💾 Dashboard Serialization
+# =============================================================================
+@register("trainer.write_dashboard", state_dim=STATE_DIMS, num_agents=AGENT_COUNTS)
+def bench_write_dashboard(state_dim, num_agents):
+    trainer = _trainer(state_dim, num_agents)
+    args = _dashboard_payload(trainer)
+    path = os.path.join(tempfile.mkdtemp(prefix="emergencelab_bench_"), "live_dashboard.json")
+
+    def write():
+        # LIVE_JSON is read at call time; point it at a scratch file
+        saved, trainer_module.LIVE_JSON = trainer_module.LIVE_JSON, path
+        try:
+            trainer._write_dashboard(*args)
+        finally:
+            trainer_module.LIVE_JSON = saved
+    return write
+
+
+# =============================================================================
+# 📡 End-to-End Latency (trainer write → watch_json emit)
+# =============================================================================
+@register("pipeline.emit_latency", samples=True, transport=TRANSPORTS,
+          state_dim=STATE_DIMS, num_agents=AGENT_COUNTS)
+def bench_emit_latency(transport, state_dim, num_agents, quick=False):
+    """
+    Run a probe process (dashboard server side) that spawns a writer
+    process (trainer side) and reports one latency sample per frame.
+    """
+    frames = 5 if quick else 20
+    # A private segment per run, so a benchmark never touches a live trainer's ring
+    ring_name = f"emergencelab_bench_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+    env = dict(os.environ, EMERGENCELAB_TRANSPORT=transport, EMERGENCELAB_RING=ring_name)
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_pipeline",
+         transport, str(state_dim), str(num_agents), str(frames), ring_name],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, timeout=600,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "probe failed")
+
+    samples = json.loads(proc.stdout.strip().splitlines()[-1])
+    if not samples:
+        raise RuntimeError("no frame reached the broadcaster")
+    return samples
+
+
+def _writer(transport, data_path, ring_name, state_dim, num_agents, frames, results):
+    """
+    Trainer side: publish `frames` frames and report when each one was
+    complete (wall clock, comparable across processes).
+    """
+    trainer = _trainer(state_dim, num_agents)
+    args = list(_dashboard_payload(trainer))
+    beliefs = trainer.population.beliefs.astype("float32")
+    kl = kl_matrix(trainer.population.beliefs)
+
+    ring = None
+    if transport == "shm":
+        from utils.frame_ring import FrameRing
+        ring = FrameRing.create(num_agents=num_agents, belief_dim=state_dim, name=ring_name)
+    trainer_module.LIVE_JSON = data_path
+    time.sleep(ATTACH_GRACE)
+
+    written = {}
+    for step in range(1, frames + 1):
+        if ring is not None:
+            ring.write(step, 1.0, 0.5, 0.5, beliefs, kl)
+        else:
+            args[0] = step
+            trainer._write_dashboard(*args)
+        written[step] = time.time()
+        time.sleep(WRITE_INTERVAL)
+
+    time.sleep(ATTACH_GRACE)
+    if ring is not None:
+        ring.close()
+    results.put(written)
+
+
+def _probe(transport, ring_name, state_dim, num_agents, frames):
+    """
+    Server side: run the real `watch_json` loop (started when the module
+    is imported) with the broadcaster's `publish` replaced by a timestamp
+    capture.
+    """
+    from utils.frame_ring import DEFAULT_RING_NAME
+    if DEFAULT_RING_NAME != ring_name:
+        # watch_json attaches to the default name, set from EMERGENCELAB_RING
+        raise RuntimeError(f"EMERGENCELAB_RING must be {ring_name!r} for the probe")
+    import visualization.websocket as ws
+
+    ws.DATA_PATH = os.path.join(tempfile.mkdtemp(prefix="emergencelab_bench_"), "live_dashboard.json")
+    ws.broadcaster.add("benchmark-probe")  # one JSON client, so frames are decoded
+
+    received = {}
+
+    def capture(data=None, packet=None, data_nbytes=None):
+        received.setdefault(int(data["step"]), time.time())
+    ws.broadcaster.publish = capture
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    writer = context.Process(
+        target=_writer, args=(transport, ws.DATA_PATH, ring_name, state_dim, num_agents, frames, results),
+    )
+    writer.start()
+    while writer.is_alive():
+        ws.socketio.sleep(0.002)
+    writer.join()
+
+    written = results.get(timeout=10)
+    samples = [received[step] - t for step, t in written.items() if step in received]
+    print(json.dumps(samples))
+
+
+if __name__ == "__main__":
+    transport, state_dim, num_agents, frames, ring_name = sys.argv[1:6]
+    _probe(transport, ring_name, int(state_dim), int(num_agents), int(frames))
@@ -0,0 +1,240 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Benchmark Harness
+# File         : harness.py
+# Author       : AHMED ZARAI
+# Purpose      : Registry, timing loop, JSON results and baseline comparison
+# =============================================================================
+
+import gc
+import os
+import json
+import time
+import platform
+import itertools
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# 📐 Parameter Sweeps
+# -----------------------------------------------------------------------------
+STATE_DIMS = (5, 12, 64)
+AGENT_COUNTS = (6, 100, 1000)
+RESULTS_VERSION = 1
+
+BENCHMARKS = []
+
+
+# =============================================================================
+# 🔎 Registry
+# =============================================================================
+def register(name, samples=False, **grid):
+    """
+    Register a benchmark over the cartesian product of `grid`.
+
+    The decorated function receives one parameter combination as keyword
+    arguments. By default it does its setup and returns a zero-argument
+    callable, which the harness times. With `samples=True` it measures
+    itself and returns a list of per-event durations in seconds (used for
+    cross-process latencies).
+    """
+    def decorator(fn):
+        BENCHMARKS.append({"name": name, "fn": fn, "grid": grid, "samples": samples})
+        return fn
+    return decorator
+
+
+def expand(benchmark, quick=False):
+    """Parameter dicts for one benchmark (first value of each axis if quick)."""
+    grid = benchmark["grid"]
+    keys = list(grid)
+    axes = [grid[k][:1] if quick else grid[k] for k in keys]
+    return [dict(zip(keys, values)) for values in itertools.product(*axes)]
+
+
+def result_key(name, params):
+    inner = ",".join(f"{k}={v}" for k, v in params.items())
+    return f"{name}[{inner}]" if inner else name
+
+
+# =============================================================================
+# ⏱️ Timing
+# =============================================================================
+def measure(fn, rounds=7, min_time=0.25):
+    """
+    Time a callable: calibrate the inner loop so one round lasts at least
+    `min_time / rounds`, then record `rounds` per-call durations.
+
+    Returns
+    -------
+    tuple
+        (per-call seconds for each round, calls per round)
+    """
+    fn()  # warm-up (caches, lazy allocations)
+
+    number, target = 1, min_time / rounds
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= target or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(target / elapsed) + 1))
+
+    times = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            times.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return times, number
+
+
+def summarize(values):
+    v = np.asarray(values, dtype=np.float64)
+    return {
+        "median": float(np.median(v)),
+        "mean": float(v.mean()),
+        "min": float(v.min()),
+        "max": float(v.max()),
+        "p95": float(np.percentile(v, 95)),
+        "stdev": float(v.std()),
+    }
+
+
+# =============================================================================
+# 🚀 Run Suite
+# =============================================================================
+def run_suite(pattern=None, quick=False, rounds=7, min_time=0.25, log=print):
+    """
+    Run every registered benchmark whose name contains `pattern`.
+
+    Returns
+    -------
+    dict
+        Machine-readable report (see `machine_info` and the `results` list).
+    """
+    results = []
+    for benchmark in BENCHMARKS:
+        if pattern and pattern not in benchmark["name"]:
+            continue
+        for params in expand(benchmark, quick):
+            key = result_key(benchmark["name"], params)
+            try:
+                if benchmark["samples"]:
+                    values = benchmark["fn"](quick=quick, **params)
+                    number = 1
+                else:
+                    values, number = measure(benchmark["fn"](**params), rounds, min_time)
+            except Exception as e:
+                log(f"⚠️ {key}: skipped ({type(e).__name__}: {e})")
+                results.append({"key": key, "name": benchmark["name"], "params": params, "error": str(e)})
+                continue
+
+            stats = summarize(values)
+            results.append({
+                "key": key, "name": benchmark["name"], "params": params, "unit": "s",
+                "rounds": len(values), "number": number, **stats,
+            })
+            log(f"⏱️ {key:<64} {_fmt(stats['median'])} (p95 {_fmt(stats['p95'])})")
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_info(),
+        "results": results,
+    }
+
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _fmt(seconds):
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.3f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+# =============================================================================
+# 💾 Report I/O
+# =============================================================================
+def save_report(report, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(report, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def load_report(path):
+    with open(path, "r") as f:
+        report = json.load(f)
+    if report.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported results version {report.get('version')!r}")
+    return report
+
+
+# =============================================================================
+# ⚖️ Compare Against Baseline
+# =============================================================================
+def compare(baseline, current, threshold=0.15, log=print):
+    """
+    Compare median timings key by key.
+
+    Parameters
+    ----------
+    baseline, current : dict
+        Reports produced by `run_suite`.
+    threshold : float
+        Allowed relative slowdown (0.15 → fail when 15% slower).
+
+    Returns
+    -------
+    list of str
+        Keys that regressed past the threshold, plus baseline keys that
+        failed or are missing in the current report.
+    """
+    base = {r["key"]: r for r in baseline["results"] if "median" in r}
+    regressions = []
+
+    for r in current["results"]:
+        if "median" not in r:
+            if base.pop(r["key"], None) is not None:
+                regressions.append(r["key"])
+                log(f"💥 {r['key']:<64} failed: {r.get('error', 'no timing')}")
+            continue
+        b = base.pop(r["key"], None)
+        if b is None:
+            log(f"🆕 {r['key']:<64} {_fmt(r['median'])}")
+            continue
+
+        ratio = r["median"] / b["median"] if b["median"] > 0 else float("inf")
+        if ratio > 1.0 + threshold:
+            regressions.append(r["key"])
+            mark = "❌"
+        elif ratio < 1.0 / (1.0 + threshold):
+            mark = "🚀"
+        else:
+            mark = "✅"
+        log(f"{mark} {r['key']:<64} {_fmt(b['median'])} → {_fmt(r['median'])} ({ratio:5.2f}x)")
+
+    for key in base:
+        regressions.append(key)
+        log(f"➖ {key:<64} missing from current run")
+
+    if baseline.get("machine") != current.get("machine"):
+        log("⚠️ Baseline was recorded on a different machine/environment")
+    return regressions
@@ -6,8 +6,8 @@
 # =============================================================================
 
 import yaml
-from dataclasses import dataclass
-from typing import Any, Dict
+from dataclasses import MISSING, asdict, dataclass, field, fields, replace
+from typing import Any, Dict, List, Optional, get_origin
 
 
 # =============================================================================
@@ -22,6 +22,10 @@ class EnvironmentConfig:
     steps: int
     noise_level: float
     seed: int
+    noise_kind: str = "gaussian"
+    noise_ar: float = 0.0
+    noise_corr: float = 0.0
+    noise_df: float = 3.0
 
 
 @dataclass
@@ -31,6 +35,10 @@ class AgentConfig:
     """
     num_agents: int
     coupling_alpha: float
+    vocabulary_size: int = 16
+    topology: str = "complete"
+    degree: int = 4
+    rewire: float = 0.1
 
 
 @dataclass
@@ -39,6 +47,31 @@ class TrainingConfig:
     Configuration for training/simulation parameters.
     """
     step_delay: float
+    publish_rate: float = 10.0
+    log_frequency: int = 10
+    log_interval: float = 1.0
+    checkpoint_every: int = 250
+    early_stop: bool = False
+    converge_window: int = 200
+    converge_tol: float = 0.01
+    converge_kl: float = 1e-3
+
+
+@dataclass
+class SweepConfig:
+    """
+    Configuration for parameter/seed sweeps (experiments/sweep.py).
+
+    `grid` maps dotted keys (e.g. "agents.coupling_alpha") to value lists
+    and is expanded as a cartesian product; `runs` lists explicit override
+    dicts instead. Every point is repeated for `seeds` independent streams.
+    """
+    steps: int
+    seeds: int = 1
+    workers: int = 0
+    grid: Dict[str, List[Any]] = field(default_factory=dict)
+    runs: List[Dict[str, Any]] = field(default_factory=list)
+    output: str = "results/sweeps/default"
 
 
 @dataclass
@@ -49,6 +82,7 @@ class AppConfig:
     environment: EnvironmentConfig
     agents: AgentConfig
     training: TrainingConfig
+    sweep: Optional[SweepConfig] = None
 
 
 # =============================================================================
@@ -67,12 +101,145 @@ def load_config(path: str) -> AppConfig:
     -------
     AppConfig
         Structured configuration for environment, agents, and training.
+
+    Raises
+    ------
+    ValueError
+        On unknown sections or keys, missing required keys, or values of
+        the wrong type (ints are accepted, and converted, for float keys).
     """
     with open(path, "r") as f:
-        raw: Dict[str, Any] = yaml.safe_load(f)
+        raw: Dict[str, Any] = yaml.safe_load(f) or {}
+
+    unknown = sorted(set(raw) - set(SECTIONS))
+    if unknown:
+        raise ValueError(f"{path}: unknown config section(s) {unknown}; expected {list(SECTIONS)}")
+    for name in ("environment", "agents", "training"):
+        if name not in raw:
+            raise ValueError(f"{path}: missing config section '{name}'")
 
     return AppConfig(
-        environment=EnvironmentConfig(**raw["environment"]),
-        agents=AgentConfig(**raw["agents"]),
-        training=TrainingConfig(**raw["training"]),
-    )
\ No newline at end of file
+        environment=_build_section("environment", raw["environment"]),
+        agents=_build_section("agents", raw["agents"]),
+        training=_build_section("training", raw["training"]),
+        sweep=_build_section("sweep", raw["sweep"]) if raw.get("sweep") else None,
+    )
+
+
+# -----------------------------------------------------------------------------
+# ✅ Validation
+# -----------------------------------------------------------------------------
+SECTIONS = {
+    "environment": EnvironmentConfig,
+    "agents": AgentConfig,
+    "training": TrainingConfig,
+    "sweep": SweepConfig,
+}
+
+
+def _build_section(section, values):
+    """
+    Instantiate the dataclass of `section` from a raw mapping, rejecting
+    unknown and missing keys instead of failing inside the constructor.
+    """
+    cls = SECTIONS[section]
+    if not isinstance(values, dict):
+        raise ValueError(f"Config section '{section}' must be a mapping, got {type(values).__name__}")
+
+    known = {f.name: f for f in fields(cls)}
+    unknown = sorted(set(values) - set(known))
+    if unknown:
+        raise ValueError(f"Unknown key(s) in '{section}': {unknown}; valid keys are {sorted(known)}")
+    missing = [
+        name for name, f in known.items()
+        if name not in values and f.default is MISSING and f.default_factory is MISSING
+    ]
+    if missing:
+        raise ValueError(f"Missing required key(s) in '{section}': {missing}")
+
+    return cls(**{name: _check_type(f"{section}.{name}", known[name].type, value) for name, value in values.items()})
+
+
+def _check_type(key, annotation, value):
+    """
+    Validate `value` against a field annotation; returns the (coerced) value.
+    """
+    origin = get_origin(annotation) or annotation
+    if origin is Any:
+        return value
+    if origin is float and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if origin is int and isinstance(value, bool):
+        ok = False
+    else:
+        ok = isinstance(value, origin)
+    if not ok:
+        expected = getattr(origin, "__name__", str(origin))
+        raise ValueError(f"Config key '{key}' must be {expected}, got {type(value).__name__} ({value!r})")
+    return value
+
+
+# =============================================================================
+# 🔧 Apply Overrides
+# =============================================================================
+def with_overrides(config: AppConfig, overrides: Dict[str, Any]) -> AppConfig:
+    """
+    Return a copy of `config` with dotted-key overrides applied.
+
+    Parameters
+    ----------
+    config : AppConfig
+        Base configuration (left untouched).
+    overrides : dict
+        Mapping such as {"environment.noise_level": 0.1}.
+
+    Returns
+    -------
+    AppConfig
+        New configuration with the overridden values.
+    """
+    for key, value in overrides.items():
+        section, _, name = key.partition(".")
+        current = getattr(config, section, None)
+        known = {f.name: f for f in fields(current)} if section in SECTIONS and current is not None else {}
+        if name not in known:
+            raise KeyError(f"Unknown config key: {key}")
+        value = _check_type(key, known[name].type, value)
+        config = replace(config, **{section: replace(current, **{name: value})})
+    return config
+
+
+# =============================================================================
+# 🧬 Result-Determining Keys
+# =============================================================================
+# Keys that only pace, log or checkpoint a run (or give its default length);
+# they never change the simulated state or its metric series
+RUNTIME_KEYS = {
+    "environment": ("steps",),
+    "training": ("step_delay", "publish_rate", "log_frequency", "log_interval", "checkpoint_every"),
+}
+STATE_SECTIONS = ("environment", "agents", "training")
+
+
+def result_config(config) -> Dict[str, Any]:
+    """
+    The part of a configuration that determines a run's results.
+
+    Parameters
+    ----------
+    config : AppConfig or dict
+        A configuration, or its `asdict` form (e.g. from a checkpoint).
+
+    Returns
+    -------
+    dict
+        STATE_SECTIONS without RUNTIME_KEYS; the sweep section is dropped.
+    """
+    resolved = config if isinstance(config, dict) else asdict(config)
+    return {
+        section: {
+            key: value for key, value in resolved[section].items()
+            if key not in RUNTIME_KEYS.get(section, ())
+        }
+        for section in STATE_SECTIONS
+    }
@@ -22,6 +22,8 @@ class EntropyField:
         Dimensionality of the state vector.
     state : np.ndarray
         Current state of the entropy field.
+    last_noise : np.ndarray
+        Noise vector added by the most recent `step`.
     """
 
     # -------------------------------------------------------------------------
@@ -30,6 +32,7 @@ class EntropyField:
     def __init__(self, state_dim=10):
         self.state_dim = state_dim
         self.state = np.zeros(self.state_dim)
+        self.last_noise = np.zeros(self.state_dim)
 
     # -------------------------------------------------------------------------
     # ♻️ Reset Field
@@ -59,8 +62,8 @@ class EntropyField:
 
         Parameters
         ----------
-        actions : list
-            List of discrete actions taken by agents.
+        actions : list or np.ndarray
+            Discrete actions taken by agents.
         noise_model : object
             Must implement `sample(state_dim)` to produce noise vector.
 
@@ -71,15 +74,114 @@ class EntropyField:
         state : np.ndarray
             Updated state of the entropy field.
         """
-        # Map discrete actions to state indices
-        actions_array = np.zeros(self.state_dim)
-        for a in actions:
-            idx = int(a) % self.state_dim
-            actions_array[idx] += 1.0
+        # Map discrete actions to state indices (one bincount, no Python loop)
+        idx = np.asarray(actions).astype(np.int64) % self.state_dim
+        actions_array = np.bincount(idx, minlength=self.state_dim).astype(np.float64)
 
         # Sample noise and evolve state
         noise_vector = noise_model.sample(self.state_dim)
         self.state = self.state * 0.9 + (actions_array * 0.1) + noise_vector
+        self.last_noise = noise_vector
 
         reward = self.compute_reward()
-        return reward, self.state.copy()
\ No newline at end of file
+        return reward, self.state.copy()
+
+    # -------------------------------------------------------------------------
+    # 💾 Checkpoint State
+    # -------------------------------------------------------------------------
+    def state_dict(self):
+        return {"state": self.state.copy()}
+
+    def load_state_dict(self, state):
+        self.state = np.array(state["state"], dtype=np.float64)
+
+# =============================================================================
+# 🔎 BatchedEntropyField Class
+# =============================================================================
+class BatchedEntropyField:
+    """
+    Steps B independent entropy fields in a single vectorized call.
+
+    Each row of `state` evolves exactly like one `EntropyField`: given the
+    same noise stream (world 0 first, then world 1, ...), the per-world
+    rewards and states are bit-identical to stepping B scalar fields in turn.
+
+    Attributes
+    ----------
+    num_worlds : int
+        Number of independent worlds (B).
+    state_dim : int
+        Dimensionality of each world's state vector.
+    state : np.ndarray
+        Current field states. Shape: (num_worlds, state_dim)
+    """
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, num_worlds, state_dim=10):
+        self.num_worlds = num_worlds
+        self.state_dim = state_dim
+        self.state = np.zeros((self.num_worlds, self.state_dim))
+
+        # Row offsets turn per-world action indices into flat bincount bins
+        self._offsets = (np.arange(self.num_worlds) * self.state_dim)[:, None]
+
+    # -------------------------------------------------------------------------
+    # ♻️ Reset Fields
+    # -------------------------------------------------------------------------
+    def reset(self):
+        """
+        Reset every world to the zero state.
+        """
+        self.state = np.zeros((self.num_worlds, self.state_dim))
+        return self.state.copy()
+
+    # -------------------------------------------------------------------------
+    # 🔬 Compute Rewards
+    # -------------------------------------------------------------------------
+    def compute_reward(self):
+        """
+        Per-world reward: negative L1 norm of each world's state.
+        """
+        return -np.sum(np.abs(self.state), axis=1)
+
+    # -------------------------------------------------------------------------
+    # 🚀 Step Function — Update All Fields
+    # -------------------------------------------------------------------------
+    def step(self, actions, noise_model):
+        """
+        Update all worlds from a batch of agent actions and stochastic noise.
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            Discrete actions per world. Shape: (num_worlds, num_agents)
+        noise_model : object
+            Must implement `sample(dim)`; `sample_batch(B, dim)` is used
+            when available.
+
+        Returns
+        -------
+        reward : np.ndarray
+            Per-world rewards. Shape: (num_worlds,)
+        state : np.ndarray
+            Updated field states. Shape: (num_worlds, state_dim)
+        """
+        # Scatter-add actions into per-world count vectors (no Python loop)
+        idx = np.asarray(actions).astype(np.int64) % self.state_dim
+        flat = (idx + self._offsets).ravel()
+        counts = np.bincount(flat, minlength=self.num_worlds * self.state_dim)
+        actions_array = counts.reshape(self.num_worlds, self.state_dim).astype(np.float64)
+
+        # Draw one noise row per world, in world order
+        if hasattr(noise_model, "sample_batch"):
+            noise_matrix = noise_model.sample_batch(self.num_worlds, self.state_dim)
+        else:
+            noise_matrix = noise_model.sample(self.num_worlds * self.state_dim)
+            noise_matrix = noise_matrix.reshape(self.num_worlds, self.state_dim)
+
+        self.state = self.state * 0.9 + (actions_array * 0.1) + noise_matrix
+
+        reward = self.compute_reward()
+        return reward, self.state.copy()
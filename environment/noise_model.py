@@ -7,28 +7,72 @@
 
 import numpy as np
 
+NOISE_KINDS = ("gaussian", "student_t")
+
 
 # =============================================================================
 # 🔎 NoiseModel Class
 # =============================================================================
 class NoiseModel:
     """
-    Represents additive Gaussian noise for the entropy field.
+    Represents additive noise for the entropy field.
+
+    Noise is drawn from a model-owned `np.random.Generator` in large
+    pre-generated blocks; `sample` / `sample_batch` serve consecutive rows of
+    the block (as views for white noise), so the stream is identical however
+    it is chunked and unaffected by anything else touching `np.random`.
 
     Attributes
     ----------
     noise_level : float
-        Standard deviation of the Gaussian noise.
+        Standard deviation of the noise.
     state_dim : int
         Dimensionality of the state vector.
+    kind : str
+        Innovation distribution: "gaussian" or "student_t" (heavy-tailed,
+        rescaled to unit variance when df > 2).
+    ar_coeff : float
+        AR(1) coefficient in [0, 1) for temporally colored noise
+        (x_t = a x_{t-1} + sqrt(1 - a^2) e_t, so the variance is unchanged).
+    spatial_corr : float
+        Correlation in [0, 1) shared by every pair of state dimensions.
+    df : float
+        Degrees of freedom for "student_t".
+    rng : np.random.Generator
+        Random stream owned by the model.
     """
 
     # -------------------------------------------------------------------------
     # 🧰 Initialization
     # -------------------------------------------------------------------------
-    def __init__(self, noise_level=0.05, state_dim=5):
+    def __init__(self, noise_level=0.05, state_dim=5, seed=None, kind="gaussian",
+                 ar_coeff=0.0, spatial_corr=0.0, df=3.0, block_size=65536):
+        if kind not in NOISE_KINDS:
+            raise ValueError(f"Unknown noise kind: {kind!r}")
+        if not 0.0 <= ar_coeff < 1.0 or not 0.0 <= spatial_corr < 1.0:
+            raise ValueError("ar_coeff and spatial_corr must lie in [0, 1)")
+
         self.noise_level = noise_level
         self.state_dim = state_dim
+        self.kind = kind
+        self.ar_coeff = ar_coeff
+        self.spatial_corr = spatial_corr
+        self.df = df
+        self.block_size = block_size
+
+        # `seed` may be an int, a SeedSequence or an existing Generator
+        self.rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+        self._block = np.empty((0, state_dim))
+        self._block_rng = None
+        self._cursor = 0
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the AR(1) history (the random stream itself continues).
+        """
+        self._ar_state = {}
 
     # -------------------------------------------------------------------------
     # 🎲 Sample Noise
@@ -45,6 +89,126 @@ class NoiseModel:
         Returns
         -------
         np.ndarray
-            Gaussian noise vector scaled by `noise_level`.
+            Noise vector scaled by `noise_level` (a read-only view into the
+            current block for white noise).
+        """
+        if dim != self.state_dim:
+            # Off-layout request: draw directly, outside the block stream
+            return self._innovations((1, dim))[0] * self.noise_level
+        return self._color(self._take(1)[0], (dim,))
+
+    def sample_batch(self, batch, dim):
+        """
+        Generate one noise row per batched world.
+
+        Parameters
+        ----------
+        batch : int
+            Number of rows (worlds).
+        dim : int
+            Dimension of each row.
+
+        Returns
+        -------
+        np.ndarray
+            Noise matrix of shape (batch, dim); row b equals the b-th of
+            `batch` consecutive `sample(dim)` calls for white noise.
+        """
+        if dim != self.state_dim:
+            return self._innovations((batch, dim)) * self.noise_level
+        return self._color(self._take(batch), (batch, dim))
+
+    # -------------------------------------------------------------------------
+    # 💾 Checkpoint State
+    # -------------------------------------------------------------------------
+    def state_dict(self):
+        """
+        Stream position as generator states plus a block cursor; the
+        current block is regenerated on load instead of being stored.
+        """
+        return {
+            "rng": self.rng.bit_generator.state,
+            "block_rng": self._block_rng,
+            "cursor": self._cursor,
+            "ar_state": [
+                {"shape": list(shape), "value": value.copy()}
+                for shape, value in self._ar_state.items()
+            ],
+        }
+
+    def load_state_dict(self, state):
+        if state["block_rng"] is not None:
+            self.rng.bit_generator.state = state["block_rng"]
+            self._refill()
+            self._cursor = state["cursor"]
+        self.rng.bit_generator.state = state["rng"]
+        self._ar_state = {
+            tuple(entry["shape"]): np.array(entry["value"]) for entry in state["ar_state"]
+        }
+
+    # -------------------------------------------------------------------------
+    # 🔧 Block Management
+    # -------------------------------------------------------------------------
+    def _take(self, n):
+        """
+        Next `n` rows of the stream; a view unless the block boundary is crossed.
         """
-        return np.random.randn(dim) * self.noise_level
\ No newline at end of file
+        end = self._cursor + n
+        if end <= self._block.shape[0]:
+            rows = self._block[self._cursor:end]
+            self._cursor = end
+            return rows
+
+        # Stitch the tail of the old block to the head of fresh ones so the
+        # stream does not depend on how callers chunk their requests
+        parts = [self._block[self._cursor:]]
+        remaining = n - parts[0].shape[0]
+        while remaining > 0:
+            self._refill()
+            take = min(remaining, self.block_size)
+            parts.append(self._block[:take])
+            self._cursor = take
+            remaining -= take
+        return np.concatenate(parts)
+
+    def _refill(self):
+        # Remember where the block came from so checkpoints can regenerate it
+        self._block_rng = self.rng.bit_generator.state
+        block = self._innovations((self.block_size, self.state_dim))
+        block *= self.noise_level
+        block.flags.writeable = False
+        self._block = block
+        self._cursor = 0
+
+    def _innovations(self, shape):
+        """
+        Unit-variance white innovations with optional cross-dimension correlation.
+        """
+        if self.kind == "gaussian":
+            e = self.rng.standard_normal(shape)
+        else:
+            e = self.rng.standard_t(self.df, shape)
+            if self.df > 2:
+                e *= np.sqrt((self.df - 2.0) / self.df)
+
+        if self.spatial_corr > 0.0:
+            # Equicorrelation: mix each row with one shared factor
+            shared = self.rng.standard_normal((shape[0], 1))
+            e = np.sqrt(1.0 - self.spatial_corr) * e + np.sqrt(self.spatial_corr) * shared
+        return e
+
+    def _color(self, white, shape):
+        """
+        Apply the AR(1) filter, keeping separate state per output shape.
+        """
+        if self.ar_coeff == 0.0:
+            return white
+
+        a = self.ar_coeff
+        previous = self._ar_state.get(shape)
+        if previous is None:
+            x = np.array(white)
+        else:
+            x = a * previous + np.sqrt(1.0 - a * a) * white
+        self._ar_state[shape] = x
+        return x
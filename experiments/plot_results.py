@@ -7,107 +7,352 @@
 
 import os
 import json
-import pandas as pd
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import matplotlib.pyplot as plt
 import networkx as nx
 
+from metrics.aggregate import RunAggregate
+from metrics.decimate import lttb
+from metrics.recorder import load_columns, export_csv
+from utils.checkpoint import load_checkpoint
+from utils.network_layout import LAYOUT_CACHE_DIR, LayoutCache, similarity_edges
+
 # -----------------------------------------------------------------------------
 # 📂 Paths
 # -----------------------------------------------------------------------------
 FIGURE_DIR = "paper/figures"
-LOG_PATH = "results/metrics_log.csv"
+METRICS_DIR = "results/metrics"
+LOG_PATH = "results/metrics_log.csv"    # CSV export target (--export-csv)
 DASHBOARD_PATH = "results/live_dashboard.json"
+CHECKPOINT_DIR = "results/checkpoints"
+FIGURE_CACHE = "results/figure_cache.json"  # figure file → input/parameter hash
+
+# -----------------------------------------------------------------------------
+# 🎨 Rendering Parameters
+# -----------------------------------------------------------------------------
+# Bump RENDER_VERSION whenever the drawing code changes: it is part of every
+# cache key, so all figures are re-rendered once
+RENDER_VERSION = 3
+FIGURE_DPI = 300
+FIGURE_STYLE = 'ggplot'
+LINE_FIGSIZE = (8, 4)
+POINTS_PER_PIXEL = 2    # LTTB target: ~2 points per horizontal pixel
+NETWORK_TOP_K = 5       # Similarity partners kept per agent (no topology edges)
+NETWORK_THRESHOLD = None
+NETWORK_LABEL_MAX = 30  # Larger graphs are drawn without labels
+BAND_QUANTILES = (0.05, 0.95)   # Spread of individual runs (outer band)
+BAND_Z = 1.96                   # Confidence level of the mean (inner band)
+
+LINE_PLOTS = [
+    ("entropy", "Entropy Decay", "entropy_plot.png", "royalblue"),
+    ("kl_divergence", "Belief Convergence (KL)", "kl_plot.png", "crimson"),
+    ("mutual_information", "Information Growth (MI)", "mi_plot.png", "seagreen")
+]
+
+# Set at import, so every figure job (in any worker process) uses the style
+plt.style.use(FIGURE_STYLE)
+
+
+# =============================================================================
+# 🔑 Content Hashing
+# =============================================================================
+def _digest(params, *blobs):
+    """
+    Hash of the plot parameters plus raw input bytes (arrays or bytes).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([RENDER_VERSION, params], sort_keys=True, default=str).encode())
+    for blob in blobs:
+        if isinstance(blob, np.ndarray):
+            h.update(str(blob.dtype).encode())
+            blob = memoryview(np.ascontiguousarray(blob)).cast("B")
+        h.update(blob)
+    return h.hexdigest()
+
+
+def _load_cache():
+    try:
+        with open(FIGURE_CACHE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    os.makedirs(os.path.dirname(FIGURE_CACHE), exist_ok=True)
+    temp_path = FIGURE_CACHE + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(temp_path, FIGURE_CACHE)
+
+
+# =============================================================================
+# 🖼️ Figure Jobs (each runs in its own worker process)
+# =============================================================================
+def _line_figure(column, title, filename, color):
+    """
+    One metric over time, LTTB-decimated to the figure's pixel width.
+    """
+    log = load_columns(METRICS_DIR, ["timestep", column])
+    width_px = int(LINE_FIGSIZE[0] * FIGURE_DPI)
+    x, y = lttb(log["timestep"], log[column], POINTS_PER_PIXEL * width_px)
+
+    plt.figure(figsize=LINE_FIGSIZE)
+    plt.plot(x, y, color=color, linewidth=2)
+    plt.title(title)
+    plt.xlabel("Timestep")
+    plt.ylabel("Value")
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(os.path.join(FIGURE_DIR, filename), dpi=FIGURE_DPI)
+    plt.close()
+    return filename
+
+
+def _load_network(source):
+    """
+    (agent ids, beliefs, edges) of the network figure's source.
+
+    "dashboard" reads the display subset and its topology edges from the
+    live JSON snapshot; "checkpoint" reads the whole population from the
+    latest checkpoint (edges None: built from belief similarity).
+    """
+    if source == "checkpoint":
+        checkpoint = load_checkpoint(CHECKPOINT_DIR)
+        if checkpoint is None:
+            return None
+        beliefs = np.asarray(checkpoint[1]["population"]["beliefs"])
+        return np.arange(len(beliefs)), beliefs, None
+
+    with open(DASHBOARD_PATH, "r") as f:
+        data = json.load(f)
+    beliefs = data.get("beliefs", [])
+    if not beliefs:
+        return None
+    agents = np.array([b["agent"] for b in beliefs])
+    # Older snapshots without "edges" fall back to similarity edges
+    return agents, np.array([b["belief"] for b in beliefs]), data.get("edges")
+
+
+def _network_figure(filename, source="dashboard"):
+    """
+    Interaction graph of the agents, laid out with a cached layout.
+    """
+    network = _load_network(source)
+    if network is None:
+        return None
+    agents, beliefs, edges = network
+    N = len(agents)
+
+    # Sparse edge list (topology edges, else top-k belief-overlap partners)
+    if edges is None:
+        src, dst, weight = similarity_edges(beliefs, k=NETWORK_TOP_K, threshold=NETWORK_THRESHOLD)
+    else:
+        edges = np.asarray(edges, dtype=np.float64).reshape(-1, 3)
+        src, dst, weight = edges[:, 0].astype(np.int64), edges[:, 1].astype(np.int64), edges[:, 2]
+
+    pos = LayoutCache(LAYOUT_CACHE_DIR).layout(agents, src, dst, weight)
+
+    G = nx.Graph()
+    G.add_nodes_from(agents.tolist())
+    G.add_weighted_edges_from(zip(agents[src].tolist(), agents[dst].tolist(), weight.tolist()))
+    pos = dict(zip(agents.tolist(), pos))
+
+    # Draw network (labels and thick edges only while they stay legible)
+    small = N <= NETWORK_LABEL_MAX
+    plt.figure(figsize=(6, 6))
+    weights = [e[2]["weight"] * 5 for e in G.edges(data=True)] if small else 0.3
+    nx.draw_networkx_nodes(G, pos, node_color="#00f5d4", node_size=500 if small else max(2.0, 20000.0 / N))
+    if small:
+        nx.draw_networkx_labels(G, pos, font_color="white")
+    nx.draw_networkx_edges(G, pos, width=weights, alpha=0.6 if small else 0.15)
+
+    plt.title("Network Connectivity Field")
+    plt.axis('off')
+    plt.tight_layout()
+    plt.savefig(os.path.join(FIGURE_DIR, filename), dpi=FIGURE_DPI)
+    plt.close()
+    return filename
+
+
+def _band_figure(column, title, filename, color, aggregate_path):
+    """
+    Cross-seed mean of one metric with shaded bands straight from a
+    streaming aggregate: confidence interval of the mean (inner) and the
+    spread of individual runs between BAND_QUANTILES (outer).
+    """
+    aggregate = RunAggregate.load(aggregate_path)
+    stats = aggregate[column]
+
+    # Decimate on the mean; the bands are sampled at the same timesteps
+    width_px = int(LINE_FIGSIZE[0] * FIGURE_DPI)
+    x, mean = lttb(np.arange(len(stats)), stats.mean, POINTS_PER_PIXEL * width_px)
+    x = x.astype(np.int64)
+    low, high = (band[x] for band in stats.confidence_band(BAND_Z))
+    q_low, q_high = (stats.quantile(q)[x] for q in BAND_QUANTILES)
+
+    plt.figure(figsize=LINE_FIGSIZE)
+    plt.fill_between(x, q_low, q_high, color=color, alpha=0.15, linewidth=0,
+                     label=f"{BAND_QUANTILES[0]:.0%}–{BAND_QUANTILES[1]:.0%} of runs")
+    plt.fill_between(x, low, high, color=color, alpha=0.35, linewidth=0, label="95% CI of mean")
+    plt.plot(x, mean, color=color, linewidth=2, label="Mean")
+    plt.title(f"{title} — {aggregate.runs} seeds")
+    plt.xlabel("Timestep")
+    plt.ylabel("Value")
+    plt.legend(loc="best")
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(os.path.join(FIGURE_DIR, filename), dpi=FIGURE_DPI)
+    plt.close()
+    return filename
+
+
+def _figure_jobs(network_source, aggregate_path=None):
+    """
+    (filename, function, args, cache key) for every figure whose inputs exist.
+    Each input column is hashed once, however many figures read it.
+    """
+    jobs = []
+    if os.path.isdir(METRICS_DIR):
+        log = load_columns(METRICS_DIR)
+        timestep_digest = _digest(None, log["timestep"])
+        for column, title, filename, color in LINE_PLOTS:
+            params = {"column": column, "title": title, "color": color, "dpi": FIGURE_DPI,
+                      "figsize": LINE_FIGSIZE, "points_per_pixel": POINTS_PER_PIXEL}
+            key = _digest(params, timestep_digest.encode(), log[column])
+            jobs.append((filename, _line_figure, (column, title, filename, color), key))
+
+    if aggregate_path is not None:
+        with open(aggregate_path, "rb") as f:
+            aggregate_digest = _digest(None, f.read())
+        for column, title, filename, color in LINE_PLOTS:
+            filename = filename.replace("_plot.png", "_band.png")
+            params = {"column": column, "title": title, "color": color, "dpi": FIGURE_DPI,
+                      "figsize": LINE_FIGSIZE, "quantiles": BAND_QUANTILES, "z": BAND_Z}
+            key = _digest(params, aggregate_digest.encode())
+            jobs.append((filename, _band_figure, (column, title, filename, color, aggregate_path), key))
+
+    filename = "network_connectivity.png"
+    params = {"figure": filename, "source": network_source, "dpi": FIGURE_DPI,
+              "top_k": NETWORK_TOP_K, "threshold": NETWORK_THRESHOLD}
+    if network_source == "checkpoint":
+        checkpoint = load_checkpoint(CHECKPOINT_DIR)
+        if checkpoint is not None:
+            key = _digest(params, checkpoint[1]["population"]["beliefs"])
+            jobs.append((filename, _network_figure, (filename, network_source), key))
+    elif os.path.exists(DASHBOARD_PATH):
+        with open(DASHBOARD_PATH, "rb") as f:
+            snapshot = f.read()
+        key = _digest(params, snapshot)
+        jobs.append((filename, _network_figure, (filename, network_source), key))
+    return jobs
 
 
 # =============================================================================
 # 🔎 Generate Figures for Paper
 # =============================================================================
-def generate_paper_assets():
+def generate_paper_assets(workers=None, force=False, network_source="dashboard", aggregate=None):
     """
     Generates line plots for entropy, KL divergence, mutual information,
     and network connectivity graphs for use in publications.
+
+    Figures whose input data and plot parameters are unchanged since the
+    last render are skipped; the rest are rendered in parallel worker
+    processes.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Worker processes (defaults to one per figure, capped at the CPU count).
+    force : bool
+        Re-render every figure regardless of the cache.
+    network_source : str
+        "dashboard" (display subset of the live snapshot) or "checkpoint"
+        (whole population of the latest checkpoint).
+    aggregate : str, optional
+        Cross-seed aggregate (.npz from metrics.aggregate, e.g. a sweep's
+        aggregates/point_000.npz); adds confidence-band figures.
     """
 
     # -------------------------------------------------------------------------
     # Check simulation log
     # -------------------------------------------------------------------------
-    if not os.path.exists(LOG_PATH):
-        print(f"❌ Error: {LOG_PATH} not found. Run simulation first!")
+    if not os.path.isdir(METRICS_DIR) and aggregate is None:
+        print(f"❌ Error: {METRICS_DIR} not found. Run simulation first!")
         return
 
     os.makedirs(FIGURE_DIR, exist_ok=True)
-    df = pd.read_csv(LOG_PATH)
 
     # -------------------------------------------------------------------------
-    # --- Line Plots ---
+    # Skip figures whose content hash is unchanged
     # -------------------------------------------------------------------------
-    plt.style.use('ggplot')
-    plots = [
-        ("entropy", "Entropy Decay", "entropy_plot.png", "royalblue"),
-        ("kl_divergence", "Belief Convergence (KL)", "kl_plot.png", "crimson"),
-        ("mutual_information", "Information Growth (MI)", "mi_plot.png", "seagreen")
-    ]
-
-    for column, title, filename, color in plots:
-        plt.figure(figsize=(8, 4))
-        plt.plot(df["timestep"], df[column], color=color, linewidth=2)
-        plt.title(title)
-        plt.xlabel("Timestep")
-        plt.ylabel("Value")
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(os.path.join(FIGURE_DIR, filename), dpi=300)
-        plt.close()
-        print(f"✅ Saved {filename}")
+    cache = _load_cache()
+    todo = []
+    for filename, fn, args, key in _figure_jobs(network_source, aggregate):
+        fresh = cache.get(filename) == key and os.path.exists(os.path.join(FIGURE_DIR, filename))
+        if fresh and not force:
+            print(f"⏭️ Unchanged {filename}")
+        else:
+            todo.append((filename, fn, args, key))
+    if not todo:
+        return
 
     # -------------------------------------------------------------------------
-    # --- Network Connectivity Graph ---
+    # Render (in parallel when more than one figure and core is available)
     # -------------------------------------------------------------------------
-    if os.path.exists(DASHBOARD_PATH):
-        try:
-            with open(DASHBOARD_PATH, "r") as f:
-                data = json.load(f)
-            beliefs = data.get("beliefs", [])
-
-            if beliefs:
-                G = nx.Graph()
-                agents = [b["agent"] for b in beliefs]
-                N = len(agents)
-
-                # Add nodes
-                G.add_nodes_from(agents)
-
-                # Compute weighted edges from belief vectors
-                for i in range(N):
-                    for j in range(i + 1, N):
-                        b1, b2 = beliefs[i]["belief"], beliefs[j]["belief"]
-                        dist = sum((x - y) * 2 for x, y in zip(b1, b2)) * 0.5 / len(b1)
-                        weight = 1 - dist
-                        G.add_edge(agents[i], agents[j], weight=weight)
-
-                # Draw network
-                plt.figure(figsize=(6, 6))
-                pos = nx.spring_layout(G, seed=42)
-                edges = G.edges(data=True)
-                weights = [e[2]["weight"] * 5 for e in edges]
-
-                nx.draw_networkx_nodes(G, pos, node_color="#00f5d4", node_size=500)
-                nx.draw_networkx_labels(G, pos, font_color="white")
-                nx.draw_networkx_edges(G, pos, width=weights, alpha=0.6)
-
-                plt.title("Network Connectivity Field")
-                plt.axis('off')
-                plt.tight_layout()
-                plt.savefig(os.path.join(FIGURE_DIR, "network_connectivity.png"), dpi=300)
-                plt.close()
-                print("✅ Saved network_connectivity.png")
-
-        except Exception as e:
-            print(f"⚠️ Failed to generate network connectivity figure: {e}")
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+
+    def record(filename, key, result):
+        if result is None:
+            return
+        cache[filename] = key
+        _save_cache(cache)
+        print(f"✅ Saved {filename}")
+
+    if workers <= 1:
+        for filename, fn, args, key in todo:
+            try:
+                record(filename, key, fn(*args))
+            except Exception as e:
+                print(f"⚠️ Failed to generate {filename}: {e}")
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fn, *args): (filename, key) for filename, fn, args, key in todo}
+        for future in as_completed(futures):
+            filename, key = futures[future]
+            try:
+                record(filename, key, future.result())
+            except Exception as e:
+                print(f"⚠️ Failed to generate {filename}: {e}")
 
 
 # =============================================================================
 # 🏁 Entry Point
 # =============================================================================
 if __name__ == "__main__":
-    generate_paper_assets()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate paper figures from the metrics store")
+    parser.add_argument(
+        "--export-csv", action="store_true",
+        help=f"also export the metrics store to {LOG_PATH}",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="figure worker processes")
+    parser.add_argument(
+        "--network-source", choices=("dashboard", "checkpoint"), default="dashboard",
+        help="agents of the network figure: dashboard subset or whole checkpointed population",
+    )
+    parser.add_argument("--aggregate", default=None, help="cross-seed aggregate (.npz) for confidence-band figures")
+    parser.add_argument("--force", action="store_true", help="re-render figures even if unchanged")
+    args = parser.parse_args()
+
+    if args.export_csv and os.path.isdir(METRICS_DIR):
+        export_csv(METRICS_DIR, LOG_PATH)
+        print(f"✅ Exported {LOG_PATH}")
+
+    generate_paper_assets(
+        workers=args.workers, force=args.force, network_source=args.network_source,
+        aggregate=args.aggregate,
+    )
\ No newline at end of file
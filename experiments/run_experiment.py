@@ -5,19 +5,107 @@
 # Purpose     : Orchestrate multi-agent simulation training pipeline
 # =============================================================================
 
-from simulation.trainer import Trainer
+import signal
+import sys
+import time
+import argparse
+
+from config.loader import load_config
+from metrics.convergence import ConvergenceMonitor
+from metrics.recorder import MetricsRecorder
+from simulation.trainer import CHECKPOINT_DIR, CONFIG_PATH, Trainer
+from utils.logger import attach_queue, setup_logger
+from utils.result_cache import ResultCache, run_key
 
 
 # =============================================================================
 # 🔎 Run Simulation Experiment
 # =============================================================================
-def run():
+def run(resume=False, log_queue=None):
     """
     Initialize the Trainer and execute the simulation training loop.
 
     Responsibilities:
     - Stepwise simulation of entropy, KL, connectivity, beliefs
     - Generate live dashboard updates for visualization
+    - Periodic checkpoints (continued from the latest one when `resume`)
+    - Log through the parent's queue (`log_queue`) when run as a child
+    """
+    attach_queue(log_queue)
+
+    # run.py stops the daemon with SIGTERM; exit through `finally` so the
+    # trainer writes a final checkpoint and flushes its metrics
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    trainer = Trainer(checkpoint_dir=CHECKPOINT_DIR, resume=resume)
+    trainer.train()
+
+
+# =============================================================================
+# 🏎️ Headless Maximum-Throughput Run
+# =============================================================================
+def run_headless(steps, config=None, metrics_dir=None, cache=True):
     """
-    trainer = Trainer()
-    trainer.train()
\ No newline at end of file
+    Run `steps` steps with no pacing and no dashboard output, and report
+    the achieved throughput (the simulation's real ceiling).
+
+    A run whose resolved config, length and code were simulated before is
+    returned from the result cache (and written to `metrics_dir`) instead.
+
+    Returns
+    -------
+    dict
+        Metric time series from `Trainer.run`.
+    """
+    config = config or load_config(CONFIG_PATH)
+    logger = setup_logger()
+    if cache is True:
+        cache = ResultCache()
+
+    key = run_key(config, steps)
+    series = cache.get(key) if cache else None
+    if series is not None:
+        if metrics_dir is not None:
+            recorder = MetricsRecorder(metrics_dir, flush_every=steps)
+            recorder.append(**series)
+            recorder.close()
+        convergence = ConvergenceMonitor.replay(config.training, series).summary()
+        logger.info(
+            f"🗃️ {len(series['timestep'])} steps taken from the result cache ({key[:12]})",
+            extra={"fields": {"steps": len(series["timestep"]), "convergence": convergence}},
+        )
+        return series
+
+    trainer = Trainer(config, headless=True, metrics_dir=metrics_dir)
+    start = time.perf_counter()
+    series = trainer.run(steps)
+    elapsed = time.perf_counter() - start
+    done = len(series["timestep"])
+    logger.info(
+        f"🏎️ {done} steps in {elapsed:.2f}s → {done / elapsed:.1f} steps/s",
+        extra={"fields": {"steps": done, "convergence": trainer.convergence.summary()}},
+    )
+    if cache:
+        cache.put(key, series)
+    return series
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one EmergenceLab simulation")
+    parser.add_argument("--config", default=CONFIG_PATH)
+    parser.add_argument("--resume", action="store_true", help="continue from the latest checkpoint")
+    parser.add_argument("--headless", action="store_true", help="unthrottled batch run without dashboard output")
+    parser.add_argument("--steps", type=int, default=None, help="headless run length (default: environment.steps)")
+    parser.add_argument("--metrics-dir", default=None, help="record headless metrics to this column store")
+    parser.add_argument("--no-cache", action="store_true", help="simulate even if the result cache has this run")
+    args = parser.parse_args()
+    setup_logger()
+
+    if args.headless:
+        config = load_config(args.config)
+        run_headless(
+            args.steps or config.environment.steps, config,
+            metrics_dir=args.metrics_dir, cache=not args.no_cache,
+        )
+    else:
+        run(resume=args.resume)
@@ -0,0 +1,329 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Parallel Parameter Sweep
+# File        : sweep.py
+# Author      : AHMED ZARAI
+# Purpose     : Run headless seed/parameter sweeps across all cores
+# =============================================================================
+
+import os
+import json
+import time
+import shutil
+import logging
+import argparse
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from config.loader import load_config, with_overrides
+from metrics.aggregate import RunAggregate
+from metrics.convergence import ConvergenceMonitor
+from metrics.recorder import METRIC_COLUMNS, MetricsRecorder, load_columns
+from simulation.trainer import CONFIG_PATH, Trainer
+from utils.logger import LOGGER_NAME, attach_queue, log_queue, setup_logger
+from utils.result_cache import ResultCache, run_key
+
+# -----------------------------------------------------------------------------
+# 📂 Sweep Store Layout
+# -----------------------------------------------------------------------------
+# <output>/plan.json       → expanded run list (checked on --resume)
+# <output>/manifest.jsonl  → one line per finished run, with its row range
+# <output>/metrics/        → consolidated column store (run_id + metrics)
+# <output>/checkpoints/    → per-run snapshots of unfinished runs
+# <output>/sweep.log.jsonl → structured log of every worker (one JSON per line)
+# <output>/aggregates/     → cross-seed statistics per sweep point (point_000.npz, ...)
+SWEEP_COLUMNS = {"run_id": np.int64, **METRIC_COLUMNS}
+LOG_FILE = "sweep.log.jsonl"
+# Seconds between a worker's aggregated step lines
+WORKER_LOG_INTERVAL = 10.0
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+# =============================================================================
+# 🔎 Expand Sweep Plan
+# =============================================================================
+def expand_runs(config):
+    """
+    Expand the sweep section into an ordered list of runs.
+
+    Returns
+    -------
+    list of dict
+        Each run has `run_id`, `overrides` (dotted config keys) and
+        `seed_index`; the run_id also indexes the spawned seed stream.
+    """
+    sweep = config.sweep
+    if sweep.runs:
+        points = [dict(run) for run in sweep.runs]
+    elif sweep.grid:
+        keys = sorted(sweep.grid)
+        points = [
+            dict(zip(keys, values))
+            for values in itertools.product(*(sweep.grid[k] for k in keys))
+        ]
+    else:
+        points = [{}]
+
+    return [
+        {"run_id": i, "overrides": overrides, "seed_index": seed_index}
+        for i, (overrides, seed_index) in enumerate(
+            itertools.product(points, range(sweep.seeds))
+        )
+    ]
+
+
+# =============================================================================
+# 🧵 Worker
+# =============================================================================
+def _run_task(config, overrides, steps, seed, checkpoint_dir=None, resume=False, run_id=None):
+    """
+    Execute one headless fixed-length run inside a worker process,
+    continuing from its own checkpoint when resuming.
+
+    Logs one structured line per WORKER_LOG_INTERVAL seconds of stepping
+    plus one when the run finishes, whatever the step rate. Returns the
+    metric series and the run's convergence summary.
+    """
+    trainer = Trainer(
+        with_overrides(config, overrides), headless=True, seed=seed, metrics_dir=None,
+        checkpoint_dir=checkpoint_dir, resume=resume,
+    )
+    context = {"run_id": run_id}
+    trainer.step_log.interval = WORKER_LOG_INTERVAL
+    trainer.step_log.label = f"Run {run_id}: steps"
+    trainer.step_log.context = context
+
+    start_step, start = trainer.step_count, time.perf_counter()
+    series = trainer.run(steps)
+    elapsed = time.perf_counter() - start
+
+    simulated = trainer.step_count - start_step
+    convergence = trainer.convergence.summary()
+    logger.info(
+        f"Run {run_id}: {simulated} steps in {elapsed:.2f}s",
+        extra={"fields": {
+            **context, "event": "run_done", "overrides": overrides, "steps": simulated,
+            "resumed_at": start_step, "elapsed_s": round(elapsed, 3),
+            "steps_per_s": round(simulated / max(elapsed, 1e-9), 2),
+            "final": {name: float(values[-1]) for name, values in series.items() if name != "timestep"},
+            "convergence": convergence,
+        }},
+    )
+    return series, convergence
+
+
+# =============================================================================
+# 🚀 Run Sweep
+# =============================================================================
+def run_sweep(config, output=None, workers=None, resume=False, cache=True):
+    """
+    Run every configuration of the sweep in a process pool and stream the
+    results into one consolidated store.
+
+    Parameters
+    ----------
+    config : AppConfig
+        Base configuration with a `sweep` section.
+    output : str, optional
+        Store directory (defaults to sweep.output).
+    workers : int, optional
+        Pool size (defaults to sweep.workers, 0 meaning all cores).
+    resume : bool
+        Skip runs already recorded in the manifest and continue interrupted
+        runs from their checkpoints instead of starting over.
+    cache : bool or ResultCache
+        Take runs whose (resolved config, steps, seed, code) key was
+        computed before from the result cache instead of simulating them,
+        and store newly finished runs in it.
+
+    Returns
+    -------
+    str
+        Path of the sweep store.
+    """
+    sweep = config.sweep
+    if sweep is None:
+        raise ValueError("Configuration has no 'sweep' section")
+
+    output = output or sweep.output
+    os.makedirs(output, exist_ok=True)
+    plan_path = os.path.join(output, "plan.json")
+    manifest_path = os.path.join(output, "manifest.jsonl")
+    checkpoint_root = os.path.join(output, "checkpoints")
+
+    plan = expand_runs(config)
+    plan_record = {"seed": config.environment.seed, "steps": sweep.steps, "runs": plan}
+
+    # One independent, reproducible stream per run (stable across resumes)
+    seeds = np.random.SeedSequence(config.environment.seed).spawn(len(plan))
+
+    # -------------------------------------------------------------------------
+    # Resume bookkeeping
+    # -------------------------------------------------------------------------
+    completed = {}
+    if resume and os.path.exists(plan_path):
+        with open(plan_path, "r") as f:
+            if json.load(f) != json.loads(json.dumps(plan_record)):
+                raise ValueError(f"Sweep plan in {output} differs from the config; start a fresh sweep")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        completed[entry["run_id"]] = entry
+    else:
+        with open(plan_path, "w") as f:
+            json.dump(plan_record, f)
+        open(manifest_path, "w").close()
+        shutil.rmtree(checkpoint_root, ignore_errors=True)
+        shutil.rmtree(os.path.join(output, "aggregates"), ignore_errors=True)
+        resume = False
+
+    # Cross-seed aggregate per sweep point (runs are ordered point-major);
+    # runs recorded before a resume are folded back in from the store. A
+    # point is saved and dropped as soon as all of its seeds are folded in.
+    aggregate_dir = os.path.join(output, "aggregates")
+    os.makedirs(aggregate_dir, exist_ok=True)
+    aggregates = {}
+    saved_points = 0
+
+    def save_aggregate(point):
+        nonlocal saved_points
+        aggregates.pop(point).save(os.path.join(aggregate_dir, f"point_{point:03d}.npz"))
+        saved_points += 1
+
+    def fold(run, series):
+        point = run["run_id"] // sweep.seeds
+        if point not in aggregates:
+            aggregates[point] = RunAggregate(
+                {"overrides": run["overrides"], "steps": sweep.steps}, length=sweep.steps,
+            )
+        # Early-stopped runs hold their final value to the full sweep length
+        aggregates[point].add_run(series, length=sweep.steps)
+        if aggregates[point].runs == sweep.seeds:
+            save_aggregate(point)
+
+    if completed:
+        stored = load_columns(os.path.join(output, "metrics"))
+        for entry in sorted(completed.values(), key=lambda e: e["run_id"]):
+            rows = slice(entry["rows_start"], entry["rows_end"])
+            fold(entry, {name: stored[name][rows] for name in METRIC_COLUMNS})
+        del stored
+
+    rows_end = max((e["rows_end"] for e in completed.values()), default=0)
+    recorder = MetricsRecorder(
+        os.path.join(output, "metrics"), columns=SWEEP_COLUMNS,
+        flush_every=sweep.steps, resume_rows=rows_end,
+    )
+
+    pending = [run for run in plan if run["run_id"] not in completed]
+    workers = workers or sweep.workers or os.cpu_count()
+
+    # Workers only enqueue log records; this process' listener writes them
+    # (an existing listener, e.g. of an earlier sweep, switches to this file)
+    setup_logger(os.path.join(output, LOG_FILE), structured=True)
+    logger.info(f"🧪 Sweep: {len(plan)} runs ({len(completed)} done) on {workers} workers → {output}")
+
+    # -------------------------------------------------------------------------
+    # Record one finished run (the manifest line is the commit point for resume)
+    # -------------------------------------------------------------------------
+    def record(run, series, manifest, source, convergence=None):
+        rows_start = recorder.rows
+        recorder.append(run_id=np.full(len(series["timestep"]), run["run_id"]), **series)
+
+        # Convergence step and λ: from the worker, or replayed for cached runs
+        if convergence is None:
+            training = with_overrides(config, run["overrides"]).training
+            convergence = ConvergenceMonitor.replay(training, series).summary()
+        entry = dict(run, rows_start=rows_start, rows_end=recorder.rows, **convergence)
+        manifest.write(json.dumps(entry) + "\n")
+        manifest.flush()
+        os.fsync(manifest.fileno())
+
+        completed[run["run_id"]] = entry
+        fold(run, series)
+        shutil.rmtree(os.path.join(checkpoint_root, f"run_{run['run_id']:05d}"), ignore_errors=True)
+        logger.info(
+            f"✅ Run {run['run_id']} ({len(completed)}/{len(plan)}) {run['overrides']} seed={run['seed_index']}"
+            + (" [cached]" if source == "cache" else ""),
+            extra={"fields": {
+                "run_id": run["run_id"], "event": "run_recorded", "source": source, "completed": len(completed),
+            }},
+        )
+
+    # -------------------------------------------------------------------------
+    # Cached runs are recorded immediately, the rest fan out
+    # -------------------------------------------------------------------------
+    if cache is True:
+        cache = ResultCache()
+    keys = {}
+    if cache:
+        with open(manifest_path, "a") as manifest:
+            for run in list(pending):
+                key = run_key(with_overrides(config, run["overrides"]), sweep.steps, seeds[run["run_id"]])
+                series = cache.get(key)
+                if series is None:
+                    keys[run["run_id"]] = key
+                else:
+                    record(run, series, manifest, "cache")
+                    pending.remove(run)
+        logger.info(
+            f"🗃️ Result cache: {cache.hits} hits, {cache.misses} misses",
+            extra={"fields": {"event": "cache_lookup", "hits": cache.hits, "misses": cache.misses}},
+        )
+
+    failed = 0
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=attach_queue, initargs=(log_queue(),))
+    with pool, open(manifest_path, "a") as manifest:
+        futures = {
+            pool.submit(
+                _run_task, config, run["overrides"], sweep.steps, seeds[run["run_id"]],
+                os.path.join(checkpoint_root, f"run_{run['run_id']:05d}"), resume, run["run_id"],
+            ): run
+            for run in pending
+        }
+        for future in as_completed(futures):
+            run = futures[future]
+            try:
+                series, convergence = future.result()
+            except Exception as e:
+                failed += 1
+                logger.error(
+                    f"⚠️ Run {run['run_id']} failed: {e}",
+                    extra={"fields": {"run_id": run["run_id"], "event": "run_failed", "error": str(e)}},
+                )
+                continue
+
+            record(run, series, manifest, "simulated", convergence)
+            if cache:
+                cache.put(keys[run["run_id"]], series)
+
+    recorder.close()
+
+    # Points with failed runs still get their partial aggregate
+    for point in sorted(aggregates):
+        save_aggregate(point)
+    logger.info(f"📊 {saved_points} cross-seed aggregates → {aggregate_dir}")
+
+    if failed:
+        logger.warning(f"⚠️ {failed} runs failed; re-run with --resume to retry them")
+    return output
+
+
+# =============================================================================
+# 🏁 Entry Point
+# =============================================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a parallel EmergenceLab parameter sweep")
+    parser.add_argument("--config", default=CONFIG_PATH, help="YAML config with a 'sweep' section")
+    parser.add_argument("--output", default=None, help="sweep store directory")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted sweep")
+    parser.add_argument("--no-cache", action="store_true", help="simulate every run, ignoring the result cache")
+    args = parser.parse_args()
+
+    run_sweep(
+        load_config(args.config), output=args.output, workers=args.workers,
+        resume=args.resume, cache=not args.no_cache,
+    )
@@ -0,0 +1,411 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Streaming Cross-Seed Aggregation
+# File         : aggregate.py
+# Author       : AHMED ZARAI
+# Purpose      : Per-timestep mean / variance / min / max / quantiles of many
+#                runs in O(T) memory, mergeable across workers
+# =============================================================================
+
+import json
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# 📐 Quantile Sketch Parameters
+# -----------------------------------------------------------------------------
+# Log-spaced buckets with relative accuracy SKETCH_ALPHA (DDSketch): bucket i
+# holds magnitudes in (gamma^(i-1), gamma^i]. Magnitudes below SKETCH_MIN are
+# counted as zero, above SKETCH_MAX in the last bucket (~185 buckets).
+# Sketches are kept every `sketch_every` timesteps only, chosen so a run of
+# known length holds at most SKETCH_POINTS of them; quantiles in between are
+# interpolated (they only feed the plotted spread band).
+SKETCH_ALPHA = 0.05
+SKETCH_MIN = 1e-4
+SKETCH_MAX = 1e4
+SKETCH_POINTS = 2048
+AGGREGATE_VERSION = 2
+
+_GAMMA = (1.0 + SKETCH_ALPHA) / (1.0 - SKETCH_ALPHA)
+_LOG_GAMMA = np.log(_GAMMA)
+_OFFSET = int(np.ceil(np.log(SKETCH_MIN) / _LOG_GAMMA))
+_NUM_BUCKETS = int(np.ceil(np.log(SKETCH_MAX) / _LOG_GAMMA)) - _OFFSET + 1
+
+
+def _bucket(magnitude):
+    index = np.ceil(np.log(magnitude) / _LOG_GAMMA).astype(np.int64) - _OFFSET
+    return np.clip(index, 0, _NUM_BUCKETS - 1)
+
+
+def _bucket_value(index):
+    # Value whose relative error to every magnitude of the bucket is <= alpha
+    return 2.0 * _GAMMA ** (index + _OFFSET) / (_GAMMA + 1.0)
+
+
+def sketch_stride(length):
+    """Sketch spacing that keeps a `length`-step run to SKETCH_POINTS sketches."""
+    return max(1, -(-int(length or 0) // SKETCH_POINTS))
+
+
+def _grow(array, size, fill=0):
+    """`array` with its first axis extended to `size` entries of `fill`."""
+    grown = np.full((size,) + array.shape[1:], fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+# =============================================================================
+# 🔎 StreamingStats Class
+# =============================================================================
+class StreamingStats:
+    """
+    Running statistics of many series, element-wise per timestep.
+
+    Each timestep keeps a count, Welford mean and M2 (sum of squared
+    deviations), min and max; every `sketch_every`-th timestep also keeps
+    a small log-bucket quantile sketch. Runs (or chunks of runs) are
+    folded in with the parallel form of Welford's update (Chan et al.),
+    so folding, and merging two partial aggregates, are exact and
+    associative for every moment; the sketch counts simply add. Storage
+    grows geometrically with the longest series, so streaming chunks cost
+    amortized O(1) copies per timestep.
+
+    Attributes
+    ----------
+    count : np.ndarray
+        Series that reached each timestep. Shape: (T,)
+    mean, m2, min, max : np.ndarray
+        Per-timestep moments and extremes. Shape: (T,)
+    sketch_every : int
+        Spacing of the sketched timesteps (0, k, 2k, ...).
+    """
+
+    _MOMENTS = (("count", np.int64, 0), ("mean", np.float64, 0.0), ("m2", np.float64, 0.0),
+                ("min", np.float64, np.inf), ("max", np.float64, -np.inf))
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, length=0, sketch_every=1):
+        self.sketch_every = int(sketch_every)
+        self._length = 0
+        self._buffers = {name: np.full(0, fill, dtype=dtype) for name, dtype, fill in self._MOMENTS}
+        self._buffers["zeros"] = np.zeros(0, dtype=np.int32)
+        self._buffers["positive"] = np.zeros((0, _NUM_BUCKETS), dtype=np.int32)
+        self._sketches = 0
+        self.negative = None    # allocated on the first negative value
+        self._reserve(length)
+
+    def __len__(self):
+        return self._length
+
+    def _reserve(self, length):
+        """Extend every per-timestep array to at least `length` entries."""
+        length = int(length)
+        if length <= self._length:
+            return
+        sketches = -(-length // self.sketch_every)
+        for name, dtype, fill in self._MOMENTS:
+            buffer = self._buffers[name]
+            if length > len(buffer):
+                self._buffers[name] = _grow(buffer, max(length, 2 * len(buffer)), fill)
+        for name in ("zeros", "positive", "negative"):
+            buffer = self._buffers.get(name)
+            if buffer is not None and sketches > len(buffer):
+                self._buffers[name] = _grow(buffer, max(sketches, 2 * len(buffer)))
+        self._length, self._sketches = length, sketches
+        self._views()
+
+    def _views(self):
+        """Point the public arrays at the used part of the buffers."""
+        for name, _, _ in self._MOMENTS:
+            setattr(self, name, self._buffers[name][:self._length])
+        self.zeros = self._buffers["zeros"][:self._sketches]
+        self.positive = self._buffers["positive"][:self._sketches]
+        if "negative" in self._buffers:
+            self.negative = self._buffers["negative"][:self._sketches]
+
+    def _allocate_negative(self):
+        self._buffers["negative"] = np.zeros_like(self._buffers["positive"])
+        self._views()
+
+    @property
+    def sketch_steps(self):
+        """Timesteps that carry a quantile sketch."""
+        return np.arange(self._sketches) * self.sketch_every
+
+    # -------------------------------------------------------------------------
+    # ➕ Fold Runs / Chunks
+    # -------------------------------------------------------------------------
+    def add(self, values, start=0):
+        """
+        Fold series values into the aggregate.
+
+        Parameters
+        ----------
+        values : array-like
+            One run, shape (L,), or a batch of runs, shape (R, L); entry
+            [r, i] belongs to timestep `start + i`. NaNs are skipped.
+        start : int
+            Timestep of the first column (chunks of a streaming run).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[None, :]
+        length = values.shape[1]
+        if length == 0:
+            return
+        stop = start + length
+        self._reserve(stop)
+
+        valid = ~np.isnan(values)
+        n = valid.sum(axis=0)
+        filled = np.where(valid, values, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, filled.sum(axis=0) / np.maximum(n, 1), 0.0)
+        m2 = np.where(valid, (values - mean) ** 2, 0.0).sum(axis=0)
+        self._combine(slice(start, stop), n, mean, m2,
+                      np.where(valid, values, np.inf).min(axis=0),
+                      np.where(valid, values, -np.inf).max(axis=0))
+
+        # Sketch: the sketched columns only, one bincount over (timestep, bucket) cells per sign
+        first = -start % self.sketch_every
+        if first >= length:
+            return
+        columns = slice(first, length, self.sketch_every)
+        values, valid, filled = values[:, columns], valid[:, columns], filled[:, columns]
+        lo = (start + first) // self.sketch_every
+        hi = lo + values.shape[1]
+
+        steps = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+        magnitude = np.abs(filled)
+        small = valid & (magnitude < SKETCH_MIN)
+        self.zeros[lo:hi] += small.sum(axis=0, dtype=np.int32)
+        for sign, mask in ((1, valid & ~small & (values > 0)), (-1, valid & ~small & (values < 0))):
+            if not mask.any():
+                continue
+            if sign < 0 and self.negative is None:
+                self._allocate_negative()
+            store = (self.positive if sign > 0 else self.negative)[lo:hi]
+            cells = steps[mask] * _NUM_BUCKETS + _bucket(magnitude[mask])
+            store += np.bincount(cells, minlength=store.size).reshape(store.shape).astype(np.int32)
+
+    def _combine(self, where, n_b, mean_b, m2_b, min_b, max_b):
+        """Chan et al. pairwise update of timesteps `where` with a batch."""
+        n_a = self.count[where]
+        n = n_a + n_b
+        safe = np.maximum(n, 1)
+        delta = mean_b - self.mean[where]
+        self.mean[where] += delta * n_b / safe
+        self.m2[where] += m2_b + delta ** 2 * n_a * n_b / safe
+        self.count[where] = n
+        np.minimum(self.min[where], min_b, out=self.min[where])
+        np.maximum(self.max[where], max_b, out=self.max[where])
+
+    # -------------------------------------------------------------------------
+    # 🔗 Merge Partial Aggregates
+    # -------------------------------------------------------------------------
+    def merge(self, other):
+        """
+        Fold another aggregate (e.g. from a parallel worker) into this one;
+        both must sketch the same timesteps.
+        """
+        if other.sketch_every != self.sketch_every:
+            if len(self) or len(other):
+                raise ValueError(
+                    f"Cannot merge aggregates sketched every {other.sketch_every} "
+                    f"and {self.sketch_every} timesteps"
+                )
+            self.sketch_every = other.sketch_every
+        length = len(other)
+        self._reserve(length)
+        where = slice(0, length)
+        self._combine(where, other.count, other.mean, other.m2, other.min, other.max)
+        sketched = slice(0, len(other.zeros))
+        self.zeros[sketched] += other.zeros
+        self.positive[sketched] += other.positive
+        if other.negative is not None:
+            if self.negative is None:
+                self._allocate_negative()
+            self.negative[sketched] += other.negative
+        return self
+
+    # -------------------------------------------------------------------------
+    # 📤 Queries
+    # -------------------------------------------------------------------------
+    @property
+    def variance(self):
+        """Unbiased per-timestep sample variance (NaN below two series)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def confidence_band(self, z=1.96):
+        """
+        (low, high) normal-approximation confidence interval of the mean.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            half = z * self.std / np.sqrt(self.count)
+        return self.mean - half, self.mean + half
+
+    def quantile(self, q):
+        """
+        Approximate per-timestep q-quantile (relative error <= SKETCH_ALPHA
+        within [SKETCH_MIN, SKETCH_MAX] at sketched timesteps, linearly
+        interpolated in between), clamped to the exact min / max.
+        """
+        q = float(q)
+        # Buckets in value order: negatives (large → small magnitude), zero, positives
+        parts = []
+        if self.negative is not None:
+            parts.append(self.negative[:, ::-1])
+        parts += [self.zeros[:, None], self.positive]
+        counts = np.concatenate(parts, axis=1)
+        values = np.concatenate(
+            ([-_bucket_value(np.arange(_NUM_BUCKETS))[::-1]] if self.negative is not None else [])
+            + [[0.0], _bucket_value(np.arange(_NUM_BUCKETS))]
+        )
+
+        total = counts.sum(axis=1)
+        rank = q * np.maximum(total - 1, 0)
+        cumulative = np.cumsum(counts, axis=1)
+        index = np.argmax(cumulative > rank[:, None], axis=1)
+        sketched = values[index]
+
+        steps = self.sketch_steps
+        if self.sketch_every > 1:
+            known = total > 0
+            if not known.any():
+                return np.full(len(self), np.nan)
+            sketched = np.interp(np.arange(len(self)), steps[known], sketched[known])
+        result = np.clip(sketched, self.min, self.max)
+        return np.where(self.count > 0, result, np.nan)
+
+    # -------------------------------------------------------------------------
+    # 💾 Persistence
+    # -------------------------------------------------------------------------
+    def arrays(self, prefix=""):
+        arrays = {
+            f"{prefix}count": self.count, f"{prefix}mean": self.mean, f"{prefix}m2": self.m2,
+            f"{prefix}min": self.min, f"{prefix}max": self.max, f"{prefix}zeros": self.zeros,
+            f"{prefix}positive": self.positive, f"{prefix}sketch_every": np.array(self.sketch_every),
+        }
+        if self.negative is not None:
+            arrays[f"{prefix}negative"] = self.negative
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix=""):
+        stats = cls(sketch_every=int(arrays[f"{prefix}sketch_every"]))
+        names = ["count", "mean", "m2", "min", "max", "zeros", "positive"]
+        if f"{prefix}negative" in arrays:
+            names.append("negative")
+        for name in names:
+            stats._buffers[name] = np.array(arrays[f"{prefix}{name}"])
+        stats._length = len(stats._buffers["count"])
+        stats._sketches = len(stats._buffers["zeros"])
+        stats._views()
+        return stats
+
+
+def _carry_forward(values, length):
+    """`values` padded to `length` entries by repeating its last value."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0 or len(values) >= length:
+        return values
+    return np.concatenate([values, np.full(length - len(values), values[-1])])
+
+
+# =============================================================================
+# 🔎 RunAggregate Class (one StreamingStats per metric column)
+# =============================================================================
+class RunAggregate:
+    """
+    Cross-seed aggregate of whole metric series (see METRIC_COLUMNS).
+
+    Attributes
+    ----------
+    columns : dict
+        Column name → StreamingStats (the timestep column is not aggregated).
+    runs : int
+        Runs folded in (partial chunks count once, via `add_run`).
+    meta : dict
+        Free-form JSON description (e.g. the sweep point's overrides).
+    """
+
+    def __init__(self, meta=None, length=None):
+        """
+        `length` is the expected run length, if known: it bounds every
+        column to SKETCH_POINTS quantile sketches.
+        """
+        self.columns = {}
+        self.runs = 0
+        self.meta = dict(meta or {})
+        self.sketch_every = sketch_stride(length)
+
+    def add_chunk(self, series, start=0):
+        """
+        Fold a chunk of one or more runs that begins at timestep `start`.
+        """
+        for name, values in series.items():
+            if name == "timestep":
+                continue
+            stats = self.columns.get(name)
+            if stats is None:
+                stats = self.columns[name] = StreamingStats(sketch_every=self.sketch_every)
+            stats.add(values, start)
+
+    def add_run(self, series, length=None):
+        """
+        Fold one complete run (column → array of length T).
+
+        A run shorter than `length` (stopped early once converged) is
+        extended with its last value, so later timesteps still average
+        over every run instead of only the slow survivors.
+        """
+        if length is not None:
+            series = {
+                name: _carry_forward(values, length)
+                for name, values in series.items() if name != "timestep"
+            }
+        self.add_chunk(series)
+        self.runs += 1
+
+    def merge(self, other):
+        for name, stats in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(stats)
+            else:
+                self.columns[name] = StreamingStats(sketch_every=stats.sketch_every).merge(stats)
+        self.runs += other.runs
+        return self
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    # -------------------------------------------------------------------------
+    # 💾 Persistence (.npz)
+    # -------------------------------------------------------------------------
+    def save(self, path):
+        arrays = {}
+        for name, stats in self.columns.items():
+            arrays.update(stats.arrays(prefix=f"{name}/"))
+        header = {"version": AGGREGATE_VERSION, "alpha": SKETCH_ALPHA, "runs": self.runs,
+                  "sketch_every": self.sketch_every, "columns": list(self.columns), "meta": self.meta}
+        arrays["header"] = np.frombuffer(json.dumps(header).encode(), dtype=np.uint8)
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            header = json.loads(data["header"].tobytes().decode())
+            if header["version"] != AGGREGATE_VERSION or header["alpha"] != SKETCH_ALPHA:
+                raise ValueError(f"{path}: aggregate written with an incompatible sketch")
+            aggregate = cls(header["meta"])
+            aggregate.runs = header["runs"]
+            aggregate.sketch_every = header["sketch_every"]
+            for name in header["columns"]:
+                aggregate.columns[name] = StreamingStats.from_arrays(data, prefix=f"{name}/")
+        return aggregate
@@ -0,0 +1,239 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Online Convergence Tracking
+# File         : convergence.py
+# Author       : AHMED ZARAI
+# Purpose      : Incremental decay-constant (λ) fit & consensus plateau detection
+# =============================================================================
+
+import math
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# ⚙️ Estimator Constants
+# -----------------------------------------------------------------------------
+RLS_FORGETTING = 0.999    # Memory of ~1 / (1 - 0.999) = 1000 steps
+RLS_PRIOR = 1e6           # Initial covariance scale (uninformative prior)
+ENTROPY_FLOOR = 1e-9      # log H is undefined once the entropy collapses to 0
+
+
+# =============================================================================
+# 📉 Recursive-Least-Squares Decay Fit
+# =============================================================================
+class DecayEstimator:
+    """
+    Incremental fit of log H_t = log H0 - λ t (README: E[H_t] ≈ H0 e^{-λt}).
+
+    Recursive least squares with exponential forgetting: each sample costs
+    a fixed handful of float operations on a 2x2 covariance, so λ can be
+    updated every step. Forgetting lets the fit follow the current decay
+    regime instead of the warm-up transient. Samples with H <= ENTROPY_FLOOR
+    are skipped.
+
+    Attributes
+    ----------
+    samples : int
+        Samples folded into the fit.
+    """
+
+    def __init__(self, forgetting=RLS_FORGETTING):
+        self.forgetting = forgetting
+        self.reset()
+
+    def reset(self):
+        self.samples = 0
+        self._t0 = None
+        self._a, self._b = 0.0, 0.0                        # log H = a + b (t - t0)
+        self._p00, self._p01, self._p11 = RLS_PRIOR, 0.0, RLS_PRIOR
+
+    def update(self, t, h):
+        if not h > ENTROPY_FLOOR:
+            return
+        if self._t0 is None:
+            self._t0 = t
+        x = float(t - self._t0)
+        y = math.log(h)
+
+        # Gain K = P φ / (μ + φᵀ P φ), φ = (1, x)
+        p00, p01, p11, mu = self._p00, self._p01, self._p11, self.forgetting
+        g0 = p00 + p01 * x
+        g1 = p01 + p11 * x
+        denom = mu + g0 + g1 * x
+        k0, k1 = g0 / denom, g1 / denom
+
+        error = y - (self._a + self._b * x)
+        self._a += k0 * error
+        self._b += k1 * error
+
+        # P = (P - K φᵀ P) / μ  (φᵀ P = (g0, g1))
+        self._p00 = (p00 - k0 * g0) / mu
+        self._p01 = (p01 - k0 * g1) / mu
+        self._p11 = (p11 - k1 * g1) / mu
+        self.samples += 1
+
+    @property
+    def lam(self):
+        """Decay constant λ (per step); NaN before two samples."""
+        return -self._b if self.samples >= 2 else float("nan")
+
+    @property
+    def h0(self):
+        """Fitted entropy at the first sample."""
+        return math.exp(self._a) if self.samples >= 2 else float("nan")
+
+    def state_dict(self):
+        return {
+            "samples": self.samples, "t0": self._t0, "a": self._a, "b": self._b,
+            "p": [self._p00, self._p01, self._p11],
+        }
+
+    def load_state_dict(self, state):
+        self.samples = state["samples"]
+        self._t0 = state["t0"]
+        self._a, self._b = state["a"], state["b"]
+        self._p00, self._p01, self._p11 = state["p"]
+
+
+# =============================================================================
+# 🧊 Plateau Detector
+# =============================================================================
+class PlateauDetector:
+    """
+    Stationarity test on a scalar stream (the KL consensus loss).
+
+    Keeps running sums over the last two windows of `window` samples
+    (O(1) per sample, O(window) memory) and reports a plateau once both
+    windows are full and either the recent mean is at most `threshold`
+    (consensus reached) or it differs from the previous window's mean by
+    at most `tolerance` relative to it (no further progress).
+    """
+
+    def __init__(self, window, tolerance, threshold=0.0):
+        self.window = max(1, int(window))
+        self.tolerance = tolerance
+        self.threshold = threshold
+        self._ring = np.zeros(2 * self.window)
+        self._pos = 0
+        self._size = 0
+        self._recent = 0.0      # sum of the newest `window` samples
+        self._previous = 0.0    # sum of the `window` samples before them
+
+    def update(self, value):
+        """
+        Push one sample; returns True while the stream is on a plateau.
+        """
+        ring, pos, w = self._ring, self._pos, self.window
+        crossing = ring[(pos - w) % (2 * w)]    # recent → previous window
+        self._previous += crossing - ring[pos]
+        self._recent += value - crossing
+        ring[pos] = value
+        self._pos = (pos + 1) % (2 * w)
+        self._size = min(self._size + 1, 2 * w)
+
+        # Re-sum once per lap so float drift never accumulates
+        if self._pos == 0 and self._size == 2 * w:
+            self._previous = math.fsum(ring[:w])
+            self._recent = math.fsum(ring[w:])
+        return self.on_plateau
+
+    @property
+    def on_plateau(self):
+        if self._size < 2 * self.window:
+            return False
+        recent = self._recent / self.window
+        previous = self._previous / self.window
+        if recent <= self.threshold:
+            return True
+        return abs(recent - previous) <= self.tolerance * max(abs(previous), 1e-12)
+
+    def state_dict(self):
+        return {
+            "ring": self._ring.copy(), "pos": self._pos, "size": self._size,
+            "recent": self._recent, "previous": self._previous,
+        }
+
+    def load_state_dict(self, state):
+        self._ring = np.array(state["ring"], dtype=np.float64)
+        self._pos = state["pos"]
+        self._size = state["size"]
+        self._recent = state["recent"]
+        self._previous = state["previous"]
+
+
+# =============================================================================
+# 🏁 ConvergenceMonitor Class
+# =============================================================================
+class ConvergenceMonitor:
+    """
+    Per-step λ estimate plus the first step at which the consensus loss
+    settled (see PlateauDetector), driven by the `training` config.
+
+    Attributes
+    ----------
+    converged_step : int or None
+        Step at which the convergence criteria were first met.
+    decay : DecayEstimator
+    plateau : PlateauDetector
+    """
+
+    def __init__(self, window, tolerance, kl_threshold=0.0):
+        self.decay = DecayEstimator()
+        self.plateau = PlateauDetector(window, tolerance, kl_threshold)
+        self.converged_step = None
+        self.converged_lambda = None
+
+    @classmethod
+    def from_config(cls, training):
+        return cls(training.converge_window, training.converge_tol, training.converge_kl)
+
+    @classmethod
+    def replay(cls, training, series):
+        """
+        Monitor state after feeding a recorded series (same result as online).
+        """
+        monitor = cls.from_config(training)
+        for t, h, kl in zip(series["timestep"].tolist(), series["entropy"].tolist(),
+                            series["kl_divergence"].tolist()):
+            monitor.update(t, h, kl)
+        return monitor
+
+    def update(self, step, entropy, kl):
+        """
+        Fold one step's metrics; returns True once converged.
+        """
+        self.decay.update(step, entropy)
+        if self.plateau.update(kl) and self.converged_step is None:
+            self.converged_step = int(step)
+            self.converged_lambda = self.decay.lam
+        return self.converged_step is not None
+
+    @property
+    def converged(self):
+        return self.converged_step is not None
+
+    def summary(self):
+        """
+        JSON-friendly record: convergence step, λ at that step, current λ, H0.
+        """
+        def number(value):
+            return None if value is None or math.isnan(value) else round(value, 8)
+
+        return {
+            "converged_step": self.converged_step,
+            "converged_lambda": number(self.converged_lambda),
+            "lambda": number(self.decay.lam),
+            "h0": number(self.decay.h0),
+        }
+
+    def state_dict(self):
+        return {
+            "decay": self.decay.state_dict(),
+            "plateau": self.plateau.state_dict(),
+            "converged_step": self.converged_step,
+            "converged_lambda": self.converged_lambda,
+        }
+
+    def load_state_dict(self, state):
+        self.decay.load_state_dict(state["decay"])
+        self.plateau.load_state_dict(state["plateau"])
+        self.converged_step = state["converged_step"]
+        self.converged_lambda = state["converged_lambda"]
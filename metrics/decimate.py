@@ -0,0 +1,78 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Shape-Preserving Downsampling
+# File         : decimate.py
+# Author       : AHMED ZARAI
+# Purpose      : Largest-Triangle-Three-Buckets decimation of long series
+# =============================================================================
+
+import numpy as np
+
+# Rows converted to float64 at a time when the input is a memmap
+LTTB_CHUNK = 1 << 20
+
+
+# =============================================================================
+# 🔺 Largest-Triangle-Three-Buckets
+# =============================================================================
+def lttb(x, y, threshold):
+    """
+    Downsample (x, y) to `threshold` points with LTTB (Steinarsson, 2013).
+
+    The first and last points are kept; every bucket in between keeps the
+    point forming the largest triangle with the previously selected point
+    and the mean of the next bucket, which preserves peaks, troughs and
+    the overall shape far better than striding or averaging.
+
+    Parameters
+    ----------
+    x, y : array-like
+        Series of equal length (x increasing). Memory-mapped inputs are
+        read bucket by bucket.
+    threshold : int
+        Number of output points (>= 3).
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (x, y) of the selected points, or the inputs unchanged when they
+        are already short enough.
+    """
+    n = len(x)
+    threshold = int(threshold)
+    if threshold >= n or threshold < 3:
+        return np.asarray(x), np.asarray(y)
+
+    # Bucket edges over the interior points 1 .. n-2
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    # Mean of every bucket (the "third point" of each triangle), streamed
+    # so a memmap is never materialized as a whole
+    sums_x = np.zeros(threshold - 2)
+    sums_y = np.zeros(threshold - 2)
+    for start in range(1, n - 1, LTTB_CHUNK):
+        stop = min(start + LTTB_CHUNK, n - 1)
+        bucket = np.searchsorted(edges, np.arange(start, stop), side="right") - 1
+        sums_x += np.bincount(bucket, weights=np.asarray(x[start:stop], dtype=np.float64), minlength=threshold - 2)
+        sums_y += np.bincount(bucket, weights=np.asarray(y[start:stop], dtype=np.float64), minlength=threshold - 2)
+    counts = np.diff(edges).astype(np.float64)
+    means_x = np.append(sums_x / counts, float(x[n - 1]))
+    means_y = np.append(sums_y / counts, float(y[n - 1]))
+
+    # Sequential selection (each choice depends on the previous one)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    ax, ay = float(x[0]), float(y[0])
+    for b in range(threshold - 2):
+        lo, hi = edges[b], edges[b + 1]
+        bx = np.asarray(x[lo:hi], dtype=np.float64)
+        by = np.asarray(y[lo:hi], dtype=np.float64)
+        cx, cy = means_x[b + 1], means_y[b + 1]
+
+        # Twice the triangle area; the constant factor does not change argmax
+        area = np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+        best = int(np.argmax(area))
+        selected[b + 1] = lo + best
+        ax, ay = bx[best], by[best]
+
+    return np.asarray(x[selected]), np.asarray(y[selected])
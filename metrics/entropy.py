@@ -49,4 +49,287 @@ def shannon_entropy(data):
     # -------------------------------------------------------------------------
     # Shannon formula: H = -sum(p * log2(p))
     # -------------------------------------------------------------------------
-    return -np.sum(p * np.log2(p + 1e-9))
\ No newline at end of file
+    return -np.sum(p * np.log2(p + 1e-9))
+
+# =============================================================================
+# 🔎 Sliding-Window Streaming Entropy
+# =============================================================================
+class StreamingEntropy:
+    """
+    Shannon entropy (bits) of the last `window` symbols of a discrete stream.
+
+    Keeps a count table over the vocabulary and a running sum of n log n, so
+    each sample entering or leaving the window and each entropy query is O(1):
+    H = log n - (1 / n) * sum_k c_k log c_k.
+
+    Attributes
+    ----------
+    vocabulary_size : int
+        Number of distinct symbols; symbols must lie in [0, vocabulary_size).
+    window : int
+        Number of most recent samples the estimate covers.
+    counts : np.ndarray
+        Per-symbol counts inside the current window.
+    """
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, vocabulary_size, window):
+        self.vocabulary_size = vocabulary_size
+        self.window = window
+        self.reset()
+
+        # c log c for every count a window can hold; avoids log calls per sample
+        c = np.arange(window + 1, dtype=np.float64)
+        self._nlogn = c * np.log(np.maximum(c, 1.0))
+
+    # -------------------------------------------------------------------------
+    # ♻️ Reset Estimator
+    # -------------------------------------------------------------------------
+    def reset(self):
+        """
+        Empty the window.
+        """
+        self.counts = np.zeros(self.vocabulary_size, dtype=np.int64)
+        self._ring = np.zeros(self.window, dtype=np.int64)
+        self._pos = 0
+        self._size = 0
+        self._sum_nlogn = 0.0
+        self._since_resync = 0
+
+    # -------------------------------------------------------------------------
+    # ➕ Single-Sample Update
+    # -------------------------------------------------------------------------
+    def update(self, symbol):
+        """
+        Push one symbol into the window, evicting the oldest if full.
+        """
+        symbol = int(symbol)
+        counts, table = self.counts, self._nlogn
+
+        if self._size == self.window:
+            old = self._ring[self._pos]
+            c = counts[old]
+            self._sum_nlogn += table[c - 1] - table[c]
+            counts[old] = c - 1
+        else:
+            self._size += 1
+
+        c = counts[symbol]
+        self._sum_nlogn += table[c + 1] - table[c]
+        counts[symbol] = c + 1
+
+        self._ring[self._pos] = symbol
+        self._pos = (self._pos + 1) % self.window
+        self._tick(1)
+
+    # -------------------------------------------------------------------------
+    # ➕ Batch Update
+    # -------------------------------------------------------------------------
+    def update_many(self, symbols):
+        """
+        Push an array of symbols (in order) into the window.
+
+        Cost is O(len(symbols) + vocabulary_size) regardless of window size.
+        """
+        symbols = np.asarray(symbols, dtype=np.int64).ravel()
+        k = symbols.size
+        if k == 0:
+            return
+
+        # Only the newest `window` samples can survive
+        if k >= self.window:
+            self._ring[:] = symbols[-self.window:]
+            self._pos = 0
+            self._size = self.window
+            self.counts = np.bincount(self._ring, minlength=self.vocabulary_size)
+            self._resync()
+            return
+
+        # Oldest samples pushed out by this batch
+        evict = max(0, self._size + k - self.window)
+        old_idx = (self._pos - self._size + np.arange(evict)) % self.window
+        evicted = self._ring[old_idx]
+
+        delta = np.bincount(symbols, minlength=self.vocabulary_size)
+        delta -= np.bincount(evicted, minlength=self.vocabulary_size)
+        touched = np.flatnonzero(delta)
+
+        before = self.counts[touched]
+        after = before + delta[touched]
+        self._sum_nlogn += float(np.sum(self._nlogn[after] - self._nlogn[before]))
+        self.counts[touched] = after
+
+        self._ring[(self._pos + np.arange(k)) % self.window] = symbols
+        self._pos = (self._pos + k) % self.window
+        self._size += k - evict
+        self._tick(k)
+
+    # -------------------------------------------------------------------------
+    # 🔬 Query Entropy
+    # -------------------------------------------------------------------------
+    def entropy(self):
+        """
+        Current window entropy in bits (O(1)).
+        """
+        n = self._size
+        if n == 0:
+            return 0.0
+        h = (np.log(n) - self._sum_nlogn / n) / np.log(2)
+        return max(0.0, float(h))
+
+    # -------------------------------------------------------------------------
+    # 💾 Checkpoint State
+    # -------------------------------------------------------------------------
+    def state_dict(self):
+        return {
+            "counts": self.counts.copy(),
+            "ring": self._ring.copy(),
+            "pos": self._pos,
+            "size": self._size,
+            "sum_nlogn": self._sum_nlogn,
+            "since_resync": self._since_resync,
+        }
+
+    def load_state_dict(self, state):
+        self.counts = np.array(state["counts"], dtype=np.int64)
+        self._ring = np.array(state["ring"], dtype=np.int64)
+        self._pos = state["pos"]
+        self._size = state["size"]
+        self._sum_nlogn = state["sum_nlogn"]
+        self._since_resync = state["since_resync"]
+
+    # -------------------------------------------------------------------------
+    # 🔧 Drift Control
+    # -------------------------------------------------------------------------
+    def _tick(self, k):
+        # Re-derive the running sum once per window to cancel round-off drift
+        self._since_resync += k
+        if self._since_resync >= self.window:
+            self._resync()
+
+    def _resync(self):
+        self._sum_nlogn = float(self._nlogn[self.counts].sum())
+        self._since_resync = 0
+
+
+# =============================================================================
+# 🔎 Exponentially-Decayed Streaming Entropy
+# =============================================================================
+class DecayedEntropy:
+    """
+    Shannon entropy (bits) of a discrete stream where each older sample's
+    weight is multiplied by `decay` per new sample.
+
+    Rather than decaying every count, new samples are added with a growing
+    weight 1 / decay^t; entropy is scale-invariant, so H = log W - A / W
+    with W = sum w_k and A = sum w_k log w_k holds on the stored weights.
+    Weights are renormalized before they grow large.
+
+    Attributes
+    ----------
+    vocabulary_size : int
+        Number of distinct symbols; symbols must lie in [0, vocabulary_size).
+    decay : float
+        Per-sample decay factor in (0, 1].
+    """
+
+    # Renormalize stored weights once the next sample weight exceeds this
+    RESCALE_LIMIT = 1e8
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, vocabulary_size, decay=0.99):
+        if not 0.0 < decay <= 1.0:
+            raise ValueError("decay must lie in (0, 1]")
+        self.vocabulary_size = vocabulary_size
+        self.decay = decay
+        self.reset()
+
+    # -------------------------------------------------------------------------
+    # ♻️ Reset Estimator
+    # -------------------------------------------------------------------------
+    def reset(self):
+        """
+        Forget all samples.
+        """
+        self.weights = np.zeros(self.vocabulary_size, dtype=np.float64)
+        self._gain = 1.0
+        self._total = 0.0
+        self._sum_wlogw = 0.0
+
+    # -------------------------------------------------------------------------
+    # ➕ Single-Sample Update
+    # -------------------------------------------------------------------------
+    def update(self, symbol):
+        """
+        Add one symbol with the current (largest) weight.
+        """
+        symbol = int(symbol)
+        self._gain /= self.decay
+
+        w = self.weights[symbol]
+        w_new = w + self._gain
+        self._sum_wlogw += w_new * np.log(w_new) - (w * np.log(w) if w > 0 else 0.0)
+        self._total += self._gain
+        self.weights[symbol] = w_new
+
+        if self._gain > self.RESCALE_LIMIT:
+            self._rescale()
+
+    # -------------------------------------------------------------------------
+    # ➕ Batch Update
+    # -------------------------------------------------------------------------
+    def update_many(self, symbols):
+        """
+        Add an array of symbols (in order), equivalent to repeated `update`.
+        """
+        symbols = np.asarray(symbols, dtype=np.int64).ravel()
+
+        # Largest chunk whose weights stay below the rescale limit
+        if self.decay < 1.0:
+            chunk = max(1, int(np.log(self.RESCALE_LIMIT) / -np.log(self.decay)))
+        else:
+            chunk = max(1, symbols.size)
+
+        for start in range(0, symbols.size, chunk):
+            block = symbols[start:start + chunk]
+            gains = self._gain * self.decay ** -np.arange(1, block.size + 1, dtype=np.float64)
+            self._gain = float(gains[-1])
+
+            delta = np.bincount(block, weights=gains, minlength=self.vocabulary_size)
+            touched = np.flatnonzero(delta)
+            before = self.weights[touched]
+            after = before + delta[touched]
+
+            self._sum_wlogw += float(np.sum(after * np.log(after)))
+            self._sum_wlogw -= float(np.sum(before[before > 0] * np.log(before[before > 0])))
+            self._total += float(delta.sum())
+            self.weights[touched] = after
+
+            if self._gain > self.RESCALE_LIMIT:
+                self._rescale()
+
+    # -------------------------------------------------------------------------
+    # 🔬 Query Entropy
+    # -------------------------------------------------------------------------
+    def entropy(self):
+        """
+        Current decayed entropy in bits (O(1)).
+        """
+        if self._total <= 0.0:
+            return 0.0
+        h = (np.log(self._total) - self._sum_wlogw / self._total) / np.log(2)
+        return max(0.0, float(h))
+
+    # -------------------------------------------------------------------------
+    # 🔧 Renormalization
+    # -------------------------------------------------------------------------
+    def _rescale(self):
+        self.weights /= self._gain
+        self._gain = 1.0
+        w = self.weights[self.weights > 0]
+        self._total = float(w.sum())
+        self._sum_wlogw = float(np.sum(w * np.log(w)))
@@ -41,4 +41,257 @@ def kl_divergence(p: np.ndarray, q: np.ndarray) -> float:
     # -------------------------------------------------------------------------
     # KL Divergence Formula
     # -------------------------------------------------------------------------
-    return float(np.sum(p * np.log(p / q)))
\ No newline at end of file
+    return float(np.sum(p * np.log(p / q)))
+
+# =============================================================================
+# 🔎 All-Pairs KL Divergence Matrix
+# =============================================================================
+# Target number of float64 elements held by one Jensen-Shannon chunk (~32 MB)
+JS_CHUNK_ELEMENTS = 1 << 22
+
+
+def kl_matrix(beliefs, chunk_size=None, method="kl", out=None):
+    """
+    Compute the full N x N matrix of pairwise divergences between agent beliefs.
+
+    Parameters
+    ----------
+    beliefs : array-like
+        Agent belief distributions. Shape: (num_agents, num_states)
+    chunk_size : int, optional
+        Number of rows computed per pass. Bounds the temporary memory to
+        O(chunk_size * N) for "kl"/"symmetric" and O(chunk_size * N * S)
+        for "js". Defaults to all rows at once ("js" picks its own size).
+    method : str
+        "kl" for D_KL(B_i || B_j), "symmetric" for the averaged
+        0.5 * (D_KL(B_i || B_j) + D_KL(B_j || B_i)), or "js" for the
+        Jensen-Shannon divergence.
+    out : np.ndarray, optional
+        Preallocated (N, N) output array (e.g. float32 or np.memmap).
+
+    Returns
+    -------
+    np.ndarray
+        Divergence matrix with entry [i, j] comparing agent i to agent j.
+
+    Notes
+    -----
+    - Uses D_KL(p || q) = sum p log p - p . log q, so the cross term for a
+      block of rows is a single matrix multiply against log(beliefs)^T.
+    - Inputs are clipped exactly as in `kl_divergence`.
+    - The diagonal is exactly zero and round-off negatives are clamped to 0.
+    """
+    if method not in ("kl", "symmetric", "js"):
+        raise ValueError(f"Unknown divergence method: {method!r}")
+
+    # -------------------------------------------------------------------------
+    # Clip once and cache log-probabilities and negative entropies
+    # -------------------------------------------------------------------------
+    P = np.clip(np.asarray(beliefs, dtype=np.float64), 1e-12, 1)
+    L = np.log(P)
+    neg_entropy = np.einsum("ij,ij->i", P, L)
+    N, S = P.shape
+
+    if out is None:
+        out = np.empty((N, N), dtype=np.float64)
+
+    if chunk_size is None:
+        chunk_size = N if method != "js" else max(1, JS_CHUNK_ELEMENTS // max(1, N * S))
+
+    # -------------------------------------------------------------------------
+    # Row-chunked evaluation
+    # -------------------------------------------------------------------------
+    for start in range(0, N, chunk_size):
+        stop = min(start + chunk_size, N)
+
+        if method == "js":
+            M = 0.5 * (P[start:stop, None, :] + P[None, :, :])
+            block = 0.5 * (neg_entropy[start:stop, None] + neg_entropy[None, :])
+            block -= np.einsum("ijk,ijk->ij", M, np.log(M))
+        else:
+            block = neg_entropy[start:stop, None] - P[start:stop] @ L.T
+
+        out[start:stop] = block
+
+    # Average each tile with its mirror tile, so no N x N temporary is formed
+    if method == "symmetric":
+        for i0 in range(0, N, chunk_size):
+            i1 = min(i0 + chunk_size, N)
+            for j0 in range(i0, N, chunk_size):
+                j1 = min(j0 + chunk_size, N)
+                tile = 0.5 * (out[i0:i1, j0:j1] + out[j0:j1, i0:i1].T)
+                out[i0:i1, j0:j1] = tile
+                out[j0:j1, i0:i1] = tile.T
+
+    np.fill_diagonal(out, 0.0)
+    np.maximum(out, 0.0, out=out)
+    return out
+
+
+# =============================================================================
+# 🔎 Consensus Loss
+# =============================================================================
+def consensus_loss(beliefs, topology=None) -> float:
+    """
+    Compute the consensus loss (1 / N^2) * sum_{i,j} D_KL(B_i || B_j), or its
+    mean over the directed edges of an interaction graph.
+
+    Parameters
+    ----------
+    beliefs : array-like
+        Agent belief distributions. Shape: (num_agents, num_states)
+    topology : Topology, optional
+        Interaction graph (simulation/topology.py). A complete topology
+        keeps the 1 / N^2 normalization above; any other graph sums only
+        linked pairs (i, j) and divides by its directed edge count.
+
+    Returns
+    -------
+    float
+        Mean pairwise KL divergence (per-edge mean on sparse graphs).
+
+    Notes
+    -----
+    - The double sum factorizes into mean(sum p log p) - mean(p) . mean(log p),
+      so the loss costs O(N * S) without materializing the N x N matrix.
+    - Along edges, sum_{(i,j)} D_KL = sum_i deg_i * (sum p_i log p_i)
+      - sum_{(i,j)} p_i . log p_j, one O(E * S) segment reduction.
+    """
+    P = np.clip(np.asarray(beliefs, dtype=np.float64), 1e-12, 1)
+    L = np.log(P)
+    neg_entropy = np.einsum("ij,ij->i", P, L)
+    if topology is None or topology.complete:
+        return float(neg_entropy.mean() - P.mean(axis=0) @ L.mean(axis=0))
+
+    edges = topology.num_edges
+    if edges == 0:
+        return 0.0
+    total = topology.degree @ neg_entropy - topology.edge_dot(P, L)
+    return max(0.0, float(total) / edges)
+
+
+# =============================================================================
+# 🔎 Incremental KL Matrix Tracker
+# =============================================================================
+class KLMatrixTracker:
+    """
+    Maintains the pairwise D_KL(B_i || B_j) matrix across simulation steps,
+    recomputing only the rows and columns of agents whose beliefs moved.
+
+    Attributes
+    ----------
+    tol : float
+        An agent is refreshed when any belief entry moved by more than `tol`
+        since its cached value was last refreshed.
+    matrix : np.ndarray or None
+        Current (N, N) divergence matrix, updated in place.
+    refreshed : int
+        Number of matrix entries recomputed by the last `update`.
+    total_refreshed : int
+        Number of matrix entries recomputed since creation.
+    """
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, tol=1e-6):
+        self.tol = tol
+        self.matrix = None
+        self.refreshed = 0
+        self.total_refreshed = 0
+
+        self._beliefs = None
+        self._P = None
+        self._L = None
+        self._neg_entropy = None
+
+    # -------------------------------------------------------------------------
+    # ♻️ Reset Tracker
+    # -------------------------------------------------------------------------
+    def reset(self):
+        """
+        Drop all cached beliefs; the next `update` recomputes everything.
+        """
+        self.__init__(tol=self.tol)
+
+    # -------------------------------------------------------------------------
+    # 🚀 Update Matrix
+    # -------------------------------------------------------------------------
+    def update(self, beliefs):
+        """
+        Bring the divergence matrix up to date with the current beliefs.
+
+        Parameters
+        ----------
+        beliefs : array-like
+            Agent belief distributions. Shape: (num_agents, num_states)
+
+        Returns
+        -------
+        np.ndarray
+            The tracked (N, N) matrix (a live reference, not a copy).
+        """
+        beliefs = np.asarray(beliefs, dtype=np.float64)
+
+        if self._beliefs is None or self._beliefs.shape != beliefs.shape:
+            return self._full_refresh(beliefs)
+
+        # ---------------------------------------------------------------------
+        # Detect agents whose belief drifted past the tolerance
+        # ---------------------------------------------------------------------
+        moved = np.flatnonzero(np.abs(beliefs - self._beliefs).max(axis=1) > self.tol)
+        N = beliefs.shape[0]
+        m = moved.size
+
+        if m == 0:
+            self.refreshed = 0
+            return self.matrix
+
+        # Refreshing rows + columns costs ~2mN dot products; past N/2 a full
+        # recompute is cheaper
+        if 2 * m > N:
+            return self._full_refresh(beliefs)
+
+        # ---------------------------------------------------------------------
+        # Update cached per-agent terms for moved agents only
+        # ---------------------------------------------------------------------
+        self._beliefs[moved] = beliefs[moved]
+        P_m = np.clip(beliefs[moved], 1e-12, 1)
+        L_m = np.log(P_m)
+        self._P[moved] = P_m
+        self._L[moved] = L_m
+        self._neg_entropy[moved] = np.einsum("ij,ij->i", P_m, L_m)
+
+        # ---------------------------------------------------------------------
+        # Recompute moved rows and columns
+        # ---------------------------------------------------------------------
+        K = self.matrix
+        rows = self._neg_entropy[moved, None] - P_m @ self._L.T
+        cols = self._neg_entropy[:, None] - self._P @ L_m.T
+        K[moved, :] = np.maximum(rows, 0.0)
+        K[:, moved] = np.maximum(cols, 0.0)
+        K[moved, moved] = 0.0
+
+        self.refreshed = 2 * m * N - m * m
+        self.total_refreshed += self.refreshed
+        return K
+
+    # -------------------------------------------------------------------------
+    # 🔧 Full Recompute
+    # -------------------------------------------------------------------------
+    def _full_refresh(self, beliefs):
+        self._beliefs = beliefs.copy()
+        self._P = np.clip(beliefs, 1e-12, 1)
+        self._L = np.log(self._P)
+        self._neg_entropy = np.einsum("ij,ij->i", self._P, self._L)
+
+        if self.matrix is None or self.matrix.shape[0] != beliefs.shape[0]:
+            self.matrix = np.empty((beliefs.shape[0], beliefs.shape[0]))
+
+        self.matrix[...] = self._neg_entropy[:, None] - self._P @ self._L.T
+        np.fill_diagonal(self.matrix, 0.0)
+        np.maximum(self.matrix, 0.0, out=self.matrix)
+
+        self.refreshed = self.matrix.size
+        self.total_refreshed += self.refreshed
+        return self.matrix
@@ -7,11 +7,14 @@
 
 import numpy as np
 
+# Target number of belief entries loaded per time chunk (~32 MB in float64)
+MI_CHUNK_ELEMENTS = 1 << 22
+
 
 # =============================================================================
 # 🔎 Mutual Information Function
 # =============================================================================
-def compute_mutual_information(beliefs):
+def compute_mutual_information(beliefs, chunk_size=None, dtype=np.float64):
     """
     Compute mutual information I(A;S) between agents and states.
 
@@ -19,11 +22,18 @@ def compute_mutual_information(beliefs):
     ----------
     beliefs : array-like
         Agent belief distributions over states. Shape: (num_agents, num_states)
+        for a single snapshot, or (num_steps, num_agents, num_states) for a
+        recorded run (a np.memmap is read chunk by chunk, never in full).
+    chunk_size : int, optional
+        Timesteps processed per pass for 3-D input. Defaults to a size that
+        keeps each chunk around MI_CHUNK_ELEMENTS entries.
+    dtype : np.dtype
+        Working precision; np.float32 halves memory traffic for long runs.
 
     Returns
     -------
-    float
-        Mutual information value.
+    float or np.ndarray
+        Mutual information value, or the (num_steps,) MI time series.
 
     Notes
     -----
@@ -32,23 +42,48 @@ def compute_mutual_information(beliefs):
     - H_cond: average conditional entropy per agent
     - Mutual information: I(A;S) = H_s - H_cond
     """
-    beliefs = np.array(beliefs)
-    mean_belief = beliefs.mean(axis=0)
+    if not isinstance(beliefs, np.ndarray):
+        beliefs = np.array(beliefs)
+
+    if beliefs.ndim == 2:
+        return float(_mutual_information_block(beliefs.astype(dtype, copy=False)))
+
+    # -------------------------------------------------------------------------
+    # Time-batched path: stream the time axis in bounded chunks
+    # -------------------------------------------------------------------------
+    T, N, S = beliefs.shape
+    if chunk_size is None:
+        chunk_size = max(1, MI_CHUNK_ELEMENTS // max(1, N * S))
+
+    mi = np.empty(T, dtype=np.float64)
+    for start in range(0, T, chunk_size):
+        stop = min(start + chunk_size, T)
+        block = np.asarray(beliefs[start:stop], dtype=dtype)
+        mi[start:stop] = _mutual_information_block(block)
+
+    return mi
+
+
+# =============================================================================
+# 🔧 Vectorized Kernel
+# =============================================================================
+def _mutual_information_block(beliefs):
+    """
+    I(A;S) over the last two axes of `beliefs` (..., num_agents, num_states).
+    """
+    mean_belief = beliefs.mean(axis=-2)
 
     # -------------------------------------------------------------------------
     # Entropy of mean state distribution
     # -------------------------------------------------------------------------
-    H_s = -np.sum(mean_belief * np.log(mean_belief + 1e-12))
+    H_s = -np.sum(mean_belief * np.log(mean_belief + 1e-12), axis=-1)
 
     # -------------------------------------------------------------------------
     # Average conditional entropy across agents
     # -------------------------------------------------------------------------
-    H_cond = 0.0
-    for b in beliefs:
-        H_cond += -np.sum(b * np.log(b + 1e-12))
-    H_cond /= beliefs.shape[0]
+    H_cond = -np.sum(beliefs * np.log(beliefs + 1e-12), axis=-1).mean(axis=-1)
 
     # -------------------------------------------------------------------------
     # Mutual Information: I(A;S) = H(S) - H(S|A)
     # -------------------------------------------------------------------------
-    return float(H_s - H_cond)
\ No newline at end of file
+    return H_s - H_cond
@@ -0,0 +1,209 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Columnar Metrics Recorder
+# File        : recorder.py
+# Author      : AHMED ZARAI
+# Purpose     : Buffered, append-only per-column metric logs with mmap readback
+# =============================================================================
+
+import os
+import ast
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# 📐 Store Layout
+# -----------------------------------------------------------------------------
+# One `<column>.npy` file per metric. Each file carries a fixed-size .npy
+# header whose shape is rewritten in place after every flush, so rows are
+# appended without rewriting data and np.load(mmap_mode="r") always works.
+METRIC_COLUMNS = {
+    "timestep": np.int64,
+    "entropy": np.float64,
+    "kl_divergence": np.float64,
+    "mutual_information": np.float64,
+    "connectivity": np.float64,
+}
+HEADER_BYTES = 128
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+def _npy_header(dtype, length):
+    """Fixed-width .npy v1.0 header for a 1-D array of `length` rows."""
+    text = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (
+        np.dtype(dtype).str, length,
+    )
+    body_len = HEADER_BYTES - len(NPY_MAGIC) - 2
+    body = text.ljust(body_len - 1) + "\n"
+    return NPY_MAGIC + body_len.to_bytes(2, "little") + body.encode("latin1")
+
+
+def _npy_length(path):
+    """Row count recorded in a column file's header."""
+    with open(path, "rb") as f:
+        raw = f.read(HEADER_BYTES)
+    return ast.literal_eval(raw[len(NPY_MAGIC) + 2:].decode("latin1"))["shape"][0]
+
+
+# =============================================================================
+# 🔎 MetricsRecorder Class
+# =============================================================================
+class MetricsRecorder:
+    """
+    Buffers metric rows in preallocated arrays and appends them to the
+    column store every `flush_every` rows.
+
+    Attributes
+    ----------
+    directory : str
+        Folder holding one `<column>.npy` file per metric.
+    columns : dict
+        Column name → dtype.
+    flush_every : int
+        Rows buffered before a flush (training.log_frequency).
+    rows : int
+        Rows persisted to disk so far.
+    """
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, directory, columns=None, flush_every=10, resume_rows=None):
+        """
+        Parameters
+        ----------
+        resume_rows : int, optional
+            Keep the first `resume_rows` rows of an existing store and append
+            after them. By default the store is truncated (new run).
+        """
+        self.directory = directory
+        self.columns = dict(columns or METRIC_COLUMNS)
+        self.flush_every = max(1, int(flush_every))
+        os.makedirs(directory, exist_ok=True)
+
+        self._buffers = {
+            name: np.empty(self.flush_every, dtype=dtype)
+            for name, dtype in self.columns.items()
+        }
+        self._pending = 0
+        self._files = {}
+
+        self.rows = 0
+        if resume_rows is not None:
+            paths = [os.path.join(directory, f"{name}.npy") for name in self.columns]
+            lengths = [_npy_length(p) if os.path.exists(p) else 0 for p in paths]
+            self.rows = min([int(resume_rows)] + lengths)
+        for name, dtype in self.columns.items():
+            self._files[name] = self._open_column(name, dtype)
+
+    def _open_column(self, name, dtype):
+        path = os.path.join(self.directory, f"{name}.npy")
+        mode = "r+b" if os.path.exists(path) and self.rows else "w+b"
+        f = open(path, mode)
+        f.truncate(HEADER_BYTES + self.rows * np.dtype(dtype).itemsize)
+        f.seek(0)
+        f.write(_npy_header(dtype, self.rows))
+        f.flush()
+        return f
+
+    # -------------------------------------------------------------------------
+    # 📝 Record Row
+    # -------------------------------------------------------------------------
+    def record(self, **values):
+        """
+        Buffer one row; columns not given are recorded as NaN / 0.
+        """
+        i = self._pending
+        for name, buf in self._buffers.items():
+            buf[i] = values.get(name, 0 if buf.dtype.kind in "iu" else np.nan)
+        self._pending = i + 1
+
+        if self._pending == self.flush_every:
+            self.flush()
+
+    # -------------------------------------------------------------------------
+    # 📝 Append Block
+    # -------------------------------------------------------------------------
+    def append(self, **columns):
+        """
+        Append whole column arrays (equal length) straight to disk, after
+        any buffered rows; missing columns are filled with NaN / 0.
+        """
+        self.flush()
+        n = len(next(iter(columns.values())))
+        arrays = {}
+        for name, dtype in self.columns.items():
+            if name in columns:
+                arrays[name] = np.asarray(columns[name], dtype=dtype)
+            else:
+                fill = 0 if np.dtype(dtype).kind in "iu" else np.nan
+                arrays[name] = np.full(n, fill, dtype=dtype)
+        self._write(arrays, n)
+
+    # -------------------------------------------------------------------------
+    # 💾 Flush Chunk
+    # -------------------------------------------------------------------------
+    def flush(self):
+        """
+        Append buffered rows, then publish the new length in each header.
+        """
+        n = self._pending
+        if n == 0:
+            return
+        self._write({name: buf[:n] for name, buf in self._buffers.items()}, n)
+        self._pending = 0
+
+    def _write(self, arrays, n):
+        for name, f in self._files.items():
+            f.seek(0, os.SEEK_END)
+            f.write(arrays[name].tobytes())
+        self.rows += n
+        for name, f in self._files.items():
+            f.seek(0)
+            f.write(_npy_header(self.columns[name], self.rows))
+            f.flush()
+
+    def close(self):
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+
+# =============================================================================
+# 📖 Readback
+# =============================================================================
+def load_columns(directory, columns=None):
+    """
+    Memory-map every column of a store (no data is read until accessed).
+
+    Returns
+    -------
+    dict
+        Column name → read-only np.memmap (or empty array for 0 rows).
+    """
+    names = columns or [f[:-4] for f in sorted(os.listdir(directory)) if f.endswith(".npy")]
+    data = {}
+    for name in names:
+        path = os.path.join(directory, f"{name}.npy")
+        length = _npy_length(path)
+        if length == 0:
+            data[name] = np.load(path)
+        else:
+            data[name] = np.load(path, mmap_mode="r")
+    return data
+
+
+def export_csv(directory, path, columns=None, chunk_rows=1 << 16):
+    """
+    Write the store as CSV (header + rows), streaming in chunks.
+    """
+    data = load_columns(directory, columns or list(METRIC_COLUMNS))
+    names = list(data)
+    length = min(len(col) for col in data.values()) if data else 0
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        f.write(",".join(names) + "\n")
+        for start in range(0, length, chunk_rows):
+            block = np.column_stack([data[n][start:start + chunk_rows] for n in names])
+            fmt = ["%d" if data[n].dtype.kind in "iu" else "%.10g" for n in names]
+            np.savetxt(f, block, delimiter=",", fmt=fmt)
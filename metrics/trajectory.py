@@ -0,0 +1,356 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Trajectory Store
+# File         : trajectory.py
+# Author       : AHMED ZARAI
+# Purpose      : Memory-mapped step history with incremental min/max/mean pyramids
+# =============================================================================
+
+import os
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# 📐 File Layout
+# -----------------------------------------------------------------------------
+# [header | raw ring of `capacity` step records | pyramid levels 1..LEVELS]
+#
+# Step t lives in raw slot t % capacity. Pyramid level L holds BUCKETS
+# buckets of FACTOR^L steps each (bucket b in slot b % BUCKETS), with the
+# running min / max / sum / count of every channel, so coarse levels keep
+# summaries of far more history than the raw ring.
+TRAJECTORY_MAGIC = 0x4A54524C  # "LRTJ"
+TRAJECTORY_VERSION = 1
+HEADER_FIELDS = (
+    "magic", "version", "capacity", "state_dim", "vocabulary_size",
+    "levels", "buckets", "head",
+)
+HEADER_BYTES = 64
+DEFAULT_CAPACITY = 1 << 17
+FACTOR = 4
+LEVELS = 8
+BUCKETS = 4096
+HISTORY_CHANNELS = ("entropy", "kl_divergence", "mutual_information", "connectivity", "reward")
+
+
+def record_dtype(state_dim, vocabulary_size):
+    """
+    One step: channels, field state, noise and the emitted-symbol histogram.
+    """
+    return np.dtype([
+        ("step", "<i8"),
+        ("channels", "<f8", (len(HISTORY_CHANNELS),)),
+        ("state", "<f4", (state_dim,)),
+        ("noise", "<f4", (state_dim,)),
+        ("actions", "<i4", (vocabulary_size,)),
+    ])
+
+
+def _layout(capacity, state_dim, vocabulary_size):
+    """Byte offsets of every region, in file order."""
+    rec = record_dtype(state_dim, vocabulary_size)
+    n, c = LEVELS * BUCKETS, len(HISTORY_CHANNELS)
+    regions = [
+        ("records", rec, (capacity,)),
+        ("bucket_id", np.dtype("<i8"), (n,)),
+        ("count", np.dtype("<i8"), (n,)),
+        ("min", np.dtype("<f8"), (n, c)),
+        ("max", np.dtype("<f8"), (n, c)),
+        ("sum", np.dtype("<f8"), (n, c)),
+    ]
+    offset, layout = HEADER_BYTES, []
+    for name, dtype, shape in regions:
+        layout.append((name, dtype, shape, offset))
+        offset += dtype.itemsize * int(np.prod(shape))
+    return layout, offset
+
+
+# =============================================================================
+# 🔎 TrajectoryStore Class
+# =============================================================================
+class TrajectoryStore:
+    """
+    Preallocated, memory-mapped step history shared by the trainer (writer)
+    and the dashboard server (reader).
+
+    Every `append` writes one raw record and updates one bucket per pyramid
+    level in a few whole-array operations, so a history query over any range
+    reads at most `resolution` precomputed buckets.
+
+    Attributes
+    ----------
+    path : str
+        Backing file.
+    capacity : int
+        Raw steps retained.
+    head : int
+        One past the last step written.
+    """
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, path, mode):
+        self.path = path
+        self.writable = mode == "r+"
+        self._inode = os.stat(path).st_ino
+
+        header = np.memmap(path, dtype="<u8", mode=mode, shape=(len(HEADER_FIELDS),))
+        fields = dict(zip(HEADER_FIELDS, header.tolist()))
+        if fields["magic"] != TRAJECTORY_MAGIC or fields["version"] != TRAJECTORY_VERSION:
+            raise ValueError(f"{path} is not a trajectory store")
+        if fields["levels"] != LEVELS or fields["buckets"] != BUCKETS:
+            raise ValueError(f"{path} uses a different pyramid layout")
+
+        self._header = header
+        self.capacity = fields["capacity"]
+        self.state_dim = fields["state_dim"]
+        self.vocabulary_size = fields["vocabulary_size"]
+
+        layout, _ = _layout(self.capacity, self.state_dim, self.vocabulary_size)
+        for name, dtype, shape, offset in layout:
+            setattr(self, f"_{name}", np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape))
+
+        self._sizes = FACTOR ** np.arange(1, LEVELS + 1, dtype=np.int64)
+        self._offsets = np.arange(LEVELS, dtype=np.int64) * BUCKETS
+
+    @classmethod
+    def create(cls, path, state_dim, vocabulary_size, capacity=DEFAULT_CAPACITY, resume_step=None):
+        """
+        Open the writer side.
+
+        A compatible existing store is reused when `resume_step` is given
+        (history past that step is discarded); otherwise a fresh file is
+        built beside `path` and atomically renamed over it, so readers that
+        still map the old file never see it truncated.
+        """
+        if resume_step is not None and os.path.exists(path):
+            try:
+                store = cls(path, "r+")
+                if (store.capacity, store.state_dim, store.vocabulary_size) == (capacity, state_dim, vocabulary_size):
+                    store.rewind(resume_step)
+                    return store
+                store.close()
+            except ValueError:
+                pass
+
+        _, size = _layout(capacity, state_dim, vocabulary_size)
+        temp_path = path + ".tmp"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(temp_path, "wb") as f:
+            f.truncate(size)
+
+        header = np.memmap(temp_path, dtype="<u8", mode="r+", shape=(len(HEADER_FIELDS),))
+        header[:] = [
+            TRAJECTORY_MAGIC, TRAJECTORY_VERSION, capacity, state_dim, vocabulary_size,
+            LEVELS, BUCKETS, 0,
+        ]
+        header.flush()
+        del header
+
+        store = cls(temp_path, "r+")
+        store._records["step"] = -1
+        store._bucket_id[:] = -1
+        os.replace(temp_path, path)
+        store.path = path
+        return store
+
+    @classmethod
+    def open(cls, path):
+        """
+        Open the read-only side (dashboard server).
+        """
+        return cls(path, "r")
+
+    @classmethod
+    def try_open(cls, path):
+        try:
+            return cls.open(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+    @property
+    def head(self):
+        return int(self._header[HEADER_FIELDS.index("head")])
+
+    def replaced(self):
+        """
+        True once the writer has swapped in a new file (reader should reopen).
+        """
+        try:
+            return os.stat(self.path).st_ino != self._inode
+        except FileNotFoundError:
+            return True
+
+    def close(self):
+        if self.writable:
+            self._header.flush()
+        for name in ("_header", "_records", "_bucket_id", "_count", "_min", "_max", "_sum"):
+            setattr(self, name, None)
+
+    # -------------------------------------------------------------------------
+    # 📝 Append Step
+    # -------------------------------------------------------------------------
+    def append(self, step, channels, state, noise, actions):
+        """
+        Record one step.
+
+        Parameters
+        ----------
+        step : int
+            Step index (consecutive across calls).
+        channels : sequence of float
+            Values in HISTORY_CHANNELS order.
+        state, noise : np.ndarray
+            Field state after the step and the noise added to it. Shape: (state_dim,)
+        actions : np.ndarray
+            Emitted-symbol histogram. Shape: (vocabulary_size,)
+        """
+        x = np.asarray(channels, dtype=np.float64)
+
+        rec = self._records[step % self.capacity]
+        rec["step"] = step
+        rec["channels"] = x
+        rec["state"] = state
+        rec["noise"] = noise
+        rec["actions"] = actions
+
+        # One bucket per level; buckets entering a recycled slot start empty
+        ids = step // self._sizes
+        slots = self._offsets + ids % BUCKETS
+        fresh = self._bucket_id[slots] != ids
+        if fresh.any():
+            self._reset(slots[fresh], ids[fresh])
+
+        self._count[slots] += 1
+        self._min[slots] = np.fmin(self._min[slots], x)
+        self._max[slots] = np.fmax(self._max[slots], x)
+        self._sum[slots] += np.nan_to_num(x)
+
+        # Publish last, after the data it covers
+        self._header[HEADER_FIELDS.index("head")] = step + 1
+
+    def _reset(self, slots, ids):
+        self._bucket_id[slots] = ids
+        self._count[slots] = 0
+        self._min[slots] = np.inf
+        self._max[slots] = -np.inf
+        self._sum[slots] = 0.0
+
+    def rewind(self, step):
+        """
+        Drop history at or after `step` (used when resuming a checkpoint).
+
+        Later buckets are emptied; the bucket straddling `step` on each
+        level is rebuilt from the raw rows (first level) or from the
+        already-rewound buckets of the level below, so the pyramid ends up
+        exactly as if the dropped steps had never been appended.
+        """
+        self._header[HEADER_FIELDS.index("head")] = step
+        for level, size in enumerate(self._sizes.tolist()):
+            base = level * BUCKETS
+            b = step // size
+            level_ids = self._bucket_id[base:base + BUCKETS]
+            self._reset(np.flatnonzero(level_ids >= b) + base, -1)
+
+            if level == 0:
+                steps = np.arange(b * size, step)
+                rows = self._records[steps % self.capacity]
+                x = rows["channels"][rows["step"] == steps]
+                count, parts = x.shape[0], (x, x, np.nan_to_num(x))
+            else:
+                child_ids = b * FACTOR + np.arange(FACTOR)
+                slots = base - BUCKETS + child_ids % BUCKETS
+                slots = slots[(self._bucket_id[slots] == child_ids) & (self._count[slots] > 0)]
+                count = int(self._count[slots].sum())
+                parts = (self._min[slots], self._max[slots], self._sum[slots])
+
+            if count:
+                slot = base + b % BUCKETS
+                self._bucket_id[slot] = b
+                self._count[slot] = count
+                self._min[slot] = np.nanmin(parts[0], axis=0)
+                self._max[slot] = np.nanmax(parts[1], axis=0)
+                self._sum[slot] = parts[2].sum(axis=0)
+
+    # -------------------------------------------------------------------------
+    # 📖 History Queries
+    # -------------------------------------------------------------------------
+    def history(self, start=None, stop=None, resolution=1000):
+        """
+        Downsampled [start, stop) history with at most `resolution` points.
+
+        Picks the finest level (raw rows first) that both fits the point
+        budget and still retains `start`; when no level reaches back that
+        far the range is clipped to what the coarsest level holds.
+
+        Returns
+        -------
+        dict
+            `level`, `bucket_steps`, `from`, `to`, `step` (first step of
+            each point) and per-channel `min` / `max` / `mean` lists.
+        """
+        head = self.head
+        stop = head if stop is None else min(int(stop), head)
+        start = 0 if start is None else max(int(start), 0)
+        resolution = max(1, int(resolution))
+
+        level, size = 0, 1
+        if stop - start > resolution or start < head - self.capacity:
+            for level, size in enumerate(self._sizes.tolist(), start=1):
+                oldest = (head - 1) // size - BUCKETS + 1
+                points = (stop - 1) // size - start // size + 1
+                if points <= resolution and start // size >= oldest:
+                    break
+            start = max(start, ((head - 1) // size - BUCKETS + 1) * size)
+
+        if stop <= start:
+            return self._payload(level, size, start, stop, np.empty(0, np.int64), *(np.empty((0, len(HISTORY_CHANNELS))),) * 3)
+
+        if level == 0:
+            steps = np.arange(start, stop)
+            rows = self._records[steps % self.capacity]
+            keep = rows["step"] == steps
+            x = rows["channels"][keep]
+            return self._payload(0, 1, start, stop, steps[keep], x, x, x)
+
+        ids = np.arange(start // size, (stop - 1) // size + 1)
+        slots = (level - 1) * BUCKETS + ids % BUCKETS
+        keep = (self._bucket_id[slots] == ids) & (self._count[slots] > 0)
+        slots = slots[keep]
+        mean = self._sum[slots] / self._count[slots][:, None]
+        return self._payload(level, size, start, stop, ids[keep] * size, self._min[slots], self._max[slots], mean)
+
+    @staticmethod
+    def _payload(level, size, start, stop, steps, lo, hi, mean):
+        def column(values, c):
+            # JSON has no NaN/inf: report them as null
+            return [None if not np.isfinite(v) else float(v) for v in values[:, c]]
+
+        return {
+            "level": level,
+            "bucket_steps": size,
+            "from": start,
+            "to": stop,
+            "step": steps.tolist(),
+            "channels": {
+                name: {"min": column(lo, c), "max": column(hi, c), "mean": column(mean, c)}
+                for c, name in enumerate(HISTORY_CHANNELS)
+            },
+        }
+
+    def record(self, step):
+        """
+        Full raw record of one step, or None if it is no longer retained.
+        """
+        step = int(step)
+        if not 0 <= step < self.head:
+            return None
+        rec = self._records[step % self.capacity]
+        if int(rec["step"]) != step:
+            return None
+        return {
+            "step": step,
+            **{name: float(v) for name, v in zip(HISTORY_CHANNELS, rec["channels"])},
+            "state": rec["state"].tolist(),
+            "noise": rec["noise"].tolist(),
+            "actions": rec["actions"].tolist(),
+        }
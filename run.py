@@ -13,6 +13,7 @@
 # -----------------------------------------------------------------------------
 # 📦 Standard Library
 # -----------------------------------------------------------------------------
+import argparse
 import multiprocessing
 import os
 
@@ -29,7 +30,7 @@ from visualization.websocket import socketio, app
 # -----------------------------------------------------------------------------
 # 📊 Observability Layer (Structured Research Logger)
 # -----------------------------------------------------------------------------
-from utils.logger import setup_logger
+from utils.logger import log_queue, setup_logger
 
 # =============================================================================
 # 🔎 Initialize Research-Grade Logger
@@ -39,7 +40,7 @@ logger = setup_logger()
 # =============================================================================
 # 🚀 Main System Orchestration
 # =============================================================================
-def main():
+def main(resume=False):
     """
     EmergenceLab v5 — Production Execution Pipeline
 
@@ -47,6 +48,8 @@ def main():
     1. Launch background multi-agent entropy simulation (Isolated Process)
     2. Start real-time WebSocket dashboard server (Main Process)
     3. Ensure graceful shutdown & crash logging across both layers
+
+    With `resume`, the simulation continues from its latest checkpoint.
     """
 
     logger.info("CORE: Initializing EmergenceLab v5 Research Pipeline")
@@ -60,6 +63,7 @@ def main():
         # ---------------------------------------------------------------------
         sim_process = multiprocessing.Process(
             target=run,
+            kwargs={"resume": resume, "log_queue": log_queue()},
             daemon=True
         )
         sim_process.start()
@@ -103,4 +107,12 @@ def main():
 # 🏁 Entry Guard
 # =============================================================================
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="EmergenceLab v5 research pipeline")
+    parser.add_argument(
+        "--resume", action="store_true",
+        default=os.environ.get("EMERGENCELAB_RESUME") == "1",
+        help="continue the simulation from its latest checkpoint",
+    )
+    args = parser.parse_args()
+
+    main(resume=args.resume)
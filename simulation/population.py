@@ -0,0 +1,161 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Vectorized Agent Population
+# File         : population.py
+# Author       : AHMED ZARAI
+# Purpose      : Belief update engine for N agents as whole-array operations
+# =============================================================================
+
+import numpy as np
+
+from simulation.topology import Topology
+
+# -----------------------------------------------------------------------------
+# ⚙️ Belief Dynamics Constants
+# -----------------------------------------------------------------------------
+LEARNING_RATE = 0.5      # Inverse temperature applied to observed utilities
+EMISSION_GAIN = 0.1      # Field increment per emitted symbol (EntropyField.step)
+LISTENING_GAIN = 0.3     # Utility of a symbol per unit share of this step's emissions
+
+
+# =============================================================================
+# 🔎 AgentPopulation Class
+# =============================================================================
+class AgentPopulation:
+    """
+    All agent beliefs stored as one (N, S) array over the symbol vocabulary.
+
+    Each step every agent emits one symbol sampled from its belief; symbols
+    act on the entropy field at index `symbol % state_dim`. Agents then
+    observe, with private noise, how much one more emission of each symbol
+    would change the field's L1 uncertainty plus how often their neighbours
+    just emitted it, take a multiplicative-weights step towards useful
+    symbols, and are pulled towards their neighbours' mean belief with
+    strength `coupling_alpha`. All social terms run along the edges of
+    `topology`, so a step costs O(N * S + E).
+
+    Attributes
+    ----------
+    num_agents : int
+        Population size N.
+    vocabulary_size : int
+        Number of symbols S.
+    coupling_alpha : float
+        Weight of the social (neighbour-mean) term in [0, 1].
+    topology : Topology
+        Interaction graph (complete by default).
+    beliefs : np.ndarray
+        Current beliefs, rows sum to 1. Shape: (N, S)
+    rng : np.random.Generator
+        Stream used for symbol sampling and observation noise.
+    """
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, num_agents, vocabulary_size, coupling_alpha, topology=None,
+                 seed=None, learning_rate=LEARNING_RATE):
+        self.num_agents = num_agents
+        self.vocabulary_size = vocabulary_size
+        self.coupling_alpha = coupling_alpha
+        self.topology = topology or Topology(num_agents, kind="complete")
+        self.learning_rate = learning_rate
+        self.rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self):
+        """
+        Draw fresh, diffuse beliefs (Dirichlet(1) per agent).
+        """
+        self.beliefs = self.rng.dirichlet(np.ones(self.vocabulary_size), self.num_agents)
+        return self.beliefs
+
+    # -------------------------------------------------------------------------
+    # 🗣️ Emit Symbols
+    # -------------------------------------------------------------------------
+    def act(self):
+        """
+        Sample one symbol per agent from its belief (inverse-CDF, vectorized).
+
+        Returns
+        -------
+        np.ndarray
+            Symbol indices in [0, vocabulary_size). Shape: (N,)
+        """
+        cdf = np.cumsum(self.beliefs, axis=1)
+        u = self.rng.random((self.num_agents, 1)) * cdf[:, -1:]
+        symbols = (cdf < u).sum(axis=1)
+        return np.minimum(symbols, self.vocabulary_size - 1)
+
+    # -------------------------------------------------------------------------
+    # 🧠 Coupled Belief Update
+    # -------------------------------------------------------------------------
+    def update(self, field_state, noise_level, symbols):
+        """
+        Update every belief from a noisy reading of the field, then couple.
+
+        Parameters
+        ----------
+        field_state : np.ndarray
+            Entropy field state after this step's emissions. Shape: (state_dim,)
+        noise_level : float
+            Standard deviation of each agent's private observation noise.
+        symbols : np.ndarray
+            Symbols emitted this step (from `act`). Shape: (N,)
+        """
+        # Marginal reward of one more emission of each symbol
+        cells = field_state[np.arange(self.vocabulary_size) % field_state.shape[0]]
+        utility = np.abs(cells) - np.abs(cells + EMISSION_GAIN)
+
+        # Convention pressure: symbols heard often from neighbours are worth more
+        heard = self.topology.neighbor_counts(symbols, self.vocabulary_size)
+        heard /= np.maximum(self.topology.degree, 1)[:, None]
+        utility = utility + LISTENING_GAIN * heard
+
+        observed = utility + noise_level * self.rng.standard_normal(
+            (self.num_agents, self.vocabulary_size)
+        )
+
+        # Multiplicative-weights step in log space (numerically stable softmax)
+        logits = np.log(np.clip(self.beliefs, 1e-12, 1.0)) + self.learning_rate * observed
+        logits -= logits.max(axis=1, keepdims=True)
+        beliefs = np.exp(logits)
+        beliefs /= beliefs.sum(axis=1, keepdims=True)
+
+        # Social coupling towards the neighbourhood mean
+        self.beliefs = self._couple(beliefs)
+        return self.beliefs
+
+    def _couple(self, beliefs):
+        a = self.coupling_alpha
+        return (1.0 - a) * beliefs + a * self.topology.neighbor_mean(beliefs)
+
+    # -------------------------------------------------------------------------
+    # 🔬 Population Metrics
+    # -------------------------------------------------------------------------
+    def agreement(self):
+        """
+        Connectivity: mean Bhattacharyya overlap sum_k sqrt(p_ik p_jk) across
+        the edges of the topology (1 when every linked pair agrees).
+        """
+        edges = self.topology.num_edges
+        if edges == 0:
+            return 0.0
+        root = np.sqrt(self.beliefs)
+        return self.topology.edge_dot(root, root) / edges
+
+    def edge_overlap(self, nodes, edges):
+        """
+        Bhattacharyya overlap of each listed (i, j) pair of `nodes` positions.
+        """
+        root = np.sqrt(self.beliefs[nodes])
+        return [float(root[i] @ root[j]) for i, j in edges]
+
+    # -------------------------------------------------------------------------
+    # 💾 Checkpoint State
+    # -------------------------------------------------------------------------
+    def state_dict(self):
+        return {"beliefs": self.beliefs.copy(), "rng": self.rng.bit_generator.state}
+
+    def load_state_dict(self, state):
+        self.beliefs = np.array(state["beliefs"], dtype=np.float64)
+        self.rng.bit_generator.state = state["rng"]
@@ -0,0 +1,116 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Step Scheduler
+# File         : scheduler.py
+# Author       : AHMED ZARAI
+# Purpose      : Drift-free fixed-rate pacing for the step and publish loops
+# =============================================================================
+
+import time
+
+
+# =============================================================================
+# 🔎 StepScheduler Class
+# =============================================================================
+class StepScheduler:
+    """
+    Fixed-rate ticker driven by absolute deadlines.
+
+    Deadlines advance by exactly one `period` per tick, so the time a step
+    takes is absorbed by a shorter sleep instead of accumulating as drift.
+    A tick that finishes after its deadline is an overrun; the schedule is
+    then re-anchored at the current time rather than bursting to catch up.
+
+    A period of 0 never sleeps and is always ready (maximum throughput).
+
+    Attributes
+    ----------
+    period : float
+        Target seconds per tick.
+    ticks : int
+        Ticks completed.
+    overruns : int
+        Ticks that missed their deadline.
+    max_lag : float
+        Worst lateness observed, in seconds.
+    """
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, period, clock=time.perf_counter, sleep=time.sleep):
+        self.period = max(0.0, float(period))
+        self._clock = clock
+        self._sleep = sleep
+        self.reset()
+
+    @classmethod
+    def from_rate(cls, rate_hz, **kwargs):
+        """Scheduler ticking `rate_hz` times per second (0 = unthrottled)."""
+        return cls(1.0 / rate_hz if rate_hz > 0 else 0.0, **kwargs)
+
+    def reset(self):
+        self._deadline = self._clock()
+        self.ticks = 0
+        self.overruns = 0
+        self.max_lag = 0.0
+
+    @property
+    def rate(self):
+        return 1.0 / self.period if self.period > 0 else float("inf")
+
+    # -------------------------------------------------------------------------
+    # ⏳ Blocking Tick (step loop)
+    # -------------------------------------------------------------------------
+    def wait(self):
+        """
+        Sleep until the end of the current period.
+
+        Returns
+        -------
+        float
+            Lateness in seconds if this tick overran its deadline, else 0.0.
+        """
+        self.ticks += 1
+        if self.period <= 0.0:
+            return 0.0
+
+        self._deadline += self.period
+        remaining = self._deadline - self._clock()
+        if remaining > 0.0:
+            self._sleep(remaining)
+            return 0.0
+        return self._overrun(-remaining)
+
+    # -------------------------------------------------------------------------
+    # 🚦 Non-Blocking Tick (publish gate)
+    # -------------------------------------------------------------------------
+    def ready(self):
+        """
+        True at most once per period (first call included); never sleeps.
+        """
+        if self.period <= 0.0:
+            self.ticks += 1
+            return True
+
+        now = self._clock()
+        if now < self._deadline:
+            return False
+        self.ticks += 1
+        self._deadline += self.period
+        if self._deadline <= now:
+            self._deadline = now + self.period
+        return True
+
+    def _overrun(self, lag):
+        self.overruns += 1
+        self.max_lag = max(self.max_lag, lag)
+        self._deadline = self._clock()
+        return lag
+
+    def summary(self):
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "max_lag_ms": round(self.max_lag * 1000.0, 3),
+            "target_hz": self.rate,
+        }
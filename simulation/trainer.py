@@ -8,7 +8,27 @@
 import os
 import json
 import time
+import logging
 import numpy as np
+from dataclasses import asdict
+
+from config.loader import load_config, result_config
+from environment.entropy_field import EntropyField
+from environment.noise_model import NoiseModel
+from metrics.convergence import ConvergenceMonitor
+from metrics.entropy import StreamingEntropy
+from metrics.kl_divergence import consensus_loss, kl_matrix as compute_kl_matrix
+from metrics.mutual_information import compute_mutual_information
+from metrics.recorder import METRIC_COLUMNS, MetricsRecorder
+from metrics.trajectory import HISTORY_CHANNELS, TrajectoryStore
+from simulation.population import AgentPopulation
+from simulation.scheduler import StepScheduler
+from simulation.topology import Topology
+from utils.checkpoint import CheckpointWriter, load_checkpoint
+from utils.dashboard_writer import DashboardWriter
+from utils.frame_ring import FrameRing
+from utils.logger import LOGGER_NAME, StepSummary
+from utils.telemetry import NULL_TELEMETRY, get_telemetry
 
 # -----------------------------------------------------------------------------
 # 📂 Results Path Configuration
@@ -16,6 +36,27 @@ import numpy as np
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 RESULTS_DIR = os.path.join(BASE_DIR, "results")
 LIVE_JSON = os.path.join(RESULTS_DIR, "live_dashboard.json")
+METRICS_DIR = os.path.join(RESULTS_DIR, "metrics")
+CHECKPOINT_DIR = os.path.join(RESULTS_DIR, "checkpoints")
+TRAJECTORY_PATH = os.path.join(RESULTS_DIR, "trajectory.bin")
+CONFIG_PATH = os.path.join(BASE_DIR, "config", "config.yaml")
+
+# -----------------------------------------------------------------------------
+# 📡 Dashboard Transport
+# -----------------------------------------------------------------------------
+# "shm"  → frames go to the shared-memory ring; JSON is only refreshed as a
+#          periodic snapshot for offline tools
+# "json" → every published frame goes to LIVE_JSON (legacy fallback), through
+#          the latest-wins background writer
+TRANSPORT = os.environ.get("EMERGENCELAB_TRANSPORT", "shm")
+JSON_SNAPSHOT_EVERY = 100
+
+# Agents shown on the dashboard (the full population can be far larger)
+DISPLAY_AGENTS = 8
+# Action-entropy window, in steps of the whole population's emissions
+ENTROPY_WINDOW_STEPS = 10
+
+logger = logging.getLogger(LOGGER_NAME)
 
 # =============================================================================
 # 🔎 Trainer Class
@@ -23,36 +64,365 @@ LIVE_JSON = os.path.join(RESULTS_DIR, "live_dashboard.json")
 class Trainer:
     """
     Simulates multi-agent dynamics and generates live dashboard updates.
+
+    In headless mode (sweeps) nothing is published, printed or slept on:
+    `run(steps)` executes a fixed number of steps and returns the series.
+    Otherwise `train` paces steps at `training.step_delay` with a
+    deadline scheduler and publishes dashboard frames at the separate,
+    lower `training.publish_rate`.
+
+    With a `checkpoint_dir`, the full simulation state is snapshotted every
+    `training.checkpoint_every` steps by a background writer; `resume=True`
+    restores the latest snapshot so the run continues bit-for-bit.
     """
 
-    def __init__(self):
-        os.makedirs(RESULTS_DIR, exist_ok=True)
+    def __init__(self, config=None, transport=TRANSPORT, headless=False, seed=None,
+                 metrics_dir=METRICS_DIR, checkpoint_dir=None, resume=False):
+        self.config = config or load_config(CONFIG_PATH)
+        self.headless = headless
+
+        # Run-local random streams: `seed` may be an int or a SeedSequence
+        # spawned by the sweep runner; defaults to environment.seed
+        if seed is None:
+            seed = self.config.environment.seed
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        noise_seed, agent_seed, graph_seed = seed.spawn(3)
+        self.step_count = 0
+
+        # Simulation core: field, noise, interaction graph and the vectorized
+        # agent population
+        env, agents = self.config.environment, self.config.agents
+        self.field = EntropyField(state_dim=env.state_dim)
+        self.noise = NoiseModel(
+            noise_level=env.noise_level, state_dim=env.state_dim, seed=noise_seed,
+            kind=env.noise_kind, ar_coeff=env.noise_ar, spatial_corr=env.noise_corr,
+            df=env.noise_df,
+        )
+        self.topology = Topology.build(
+            agents.topology, agents.num_agents, degree=agents.degree,
+            rewire=agents.rewire, seed=graph_seed,
+        )
+        self.population = AgentPopulation(
+            agents.num_agents, agents.vocabulary_size, agents.coupling_alpha,
+            topology=self.topology, seed=agent_seed,
+        )
+        self.action_entropy = StreamingEntropy(
+            agents.vocabulary_size, window=agents.num_agents * ENTROPY_WINDOW_STEPS,
+        )
+
+        # Dashboard subset: a connected neighbourhood of agent 0 and its edges
+        self.display_ids = self.topology.neighborhood(0, DISPLAY_AGENTS)
+        self.display_agents = len(self.display_ids)
+        self.display_edges = self.topology.subgraph_edges(self.display_ids)
+        self.reward = 0.0
+        self._series = None
+
+        # Online λ fit and KL plateau test (O(1) per step); with
+        # training.early_stop, `train` and `run` end at convergence
+        self.convergence = ConvergenceMonitor.from_config(self.config.training)
+
+        # Per-stage timers and counters for /metrics (sweeps are never served)
+        self.telemetry = NULL_TELEMETRY if headless else get_telemetry()
+
+        # Dashboard frames are published at their own rate, whatever the step rate
+        self.publisher = StepScheduler.from_rate(self.config.training.publish_rate)
+        self._last_snapshot = None
+
+        # One aggregated min/mean/max log line per `log_interval` seconds
+        self.step_log = StepSummary(logger, interval=self.config.training.log_interval, label="RESEARCH: Steps")
+
+        # Restore the latest snapshot before anything is written
+        resumed = False
+        if resume and checkpoint_dir is not None:
+            checkpoint = load_checkpoint(checkpoint_dir)
+            if checkpoint is not None:
+                self.load_state_dict(checkpoint[1])
+                resumed = True
+                logger.info(f"♻️ Resumed from checkpoint at step {self.step_count}")
+
+        self.checkpoints = None
+        if checkpoint_dir is not None and self.config.training.checkpoint_every > 0:
+            self.checkpoints = CheckpointWriter(checkpoint_dir, resume=resume)
+
+        # Columnar metric log, flushed every `log_frequency` steps; on resume
+        # rows past the checkpoint are discarded and re-simulated
+        self.recorder = None
+        if metrics_dir is not None:
+            self.recorder = MetricsRecorder(
+                metrics_dir, flush_every=self.config.training.log_frequency,
+                resume_rows=self.step_count if resumed else None,
+            )
+
+        # Scrubbable step history for the dashboard (/api/history)
+        self.trajectory = None
+        if not headless:
+            self.trajectory = TrajectoryStore.create(
+                TRAJECTORY_PATH, env.state_dim, agents.vocabulary_size,
+                resume_step=self.step_count if resumed else None,
+            )
+
+        # JSON frames are serialized and stored on a background thread
+        self.dashboard = None
+        if not headless:
+            self.dashboard = DashboardWriter(self._render_dashboard, self.telemetry)
+
+        self.ring = None
+        if not headless:
+            os.makedirs(RESULTS_DIR, exist_ok=True)
+            if transport == "shm":
+                try:
+                    self.ring = FrameRing.create(
+                        num_agents=self.display_agents, belief_dim=agents.vocabulary_size,
+                    )
+                except OSError as e:
+                    logger.warning(f"⚠️ Shared-memory transport unavailable ({e}); using JSON file")
 
     def train(self):
-        step = 0
-        print("🚀 Evolution Engine Started... (Infinite Loop Active)")
-        
-        while True:
-            # Simulated research metrics
-            entropy = float(np.random.rand())
-            kl = float(np.random.rand())
-            connectivity = float(np.random.rand())
-            beliefs = [
-                {"agent": f"A{i+1}", "belief": np.random.rand(8).tolist()} 
-                for i in range(5)
-            ]
-            kl_matrix = np.random.rand(5, 5).tolist()
-
-            # Log to Render console
-            print(f"RESEARCH: Step {step} | H={entropy:.4f} | KL={kl:.4f} | C={connectivity:.4f}")
-
-            # Update live dashboard JSON via Atomic Swap
-            self._write_dashboard(step, entropy, kl, connectivity, beliefs, kl_matrix)
-
-            step += 1
-            time.sleep(1.0) # Safety delay for CPU stability
-
-    def _write_dashboard(self, step, entropy, kl, connectivity, beliefs, kl_matrix):
+        """
+        Step forever at `training.step_delay` seconds per step (headless
+        trainers never sleep), publishing at `training.publish_rate`, or
+        until convergence when `training.early_stop` is set.
+        """
+        scheduler = StepScheduler(0.0 if self.headless else self.config.training.step_delay)
+        logger.info(f"🚀 Evolution Engine Started... (target {scheduler.rate:g} steps/s)")
+
+        try:
+            while not self.finished:
+                metrics = self.step()
+                self._log_step(metrics)
+                if not self.headless and self.publisher.ready():
+                    self._publish(metrics)
+
+                # Deadline-based pacing: step time is absorbed, not added
+                lag = scheduler.wait()
+                if lag:
+                    self.telemetry.count("step_overruns_total")
+                    self.telemetry.set("step_lag_seconds", lag)
+        finally:
+            if scheduler.overruns:
+                logger.info(f"⏱️ Scheduler: {scheduler.summary()}", extra={"fields": scheduler.summary()})
+            self.close()
+
+    def run(self, steps):
+        """
+        Execute `steps` steps and return the metric time series.
+
+        A resumed trainer only simulates the remaining steps; the series
+        restored from the checkpoint fills the beginning. With
+        `training.early_stop` the run ends at the convergence step.
+
+        Returns
+        -------
+        dict
+            Column name (see METRIC_COLUMNS) → np.ndarray of length `steps`
+            (convergence step + 1 when stopped early).
+        """
+        series = {
+            name: np.empty(steps, dtype=dtype) for name, dtype in METRIC_COLUMNS.items()
+        }
+        done = min(self.step_count, steps)
+        if self._series is not None:
+            for name, values in series.items():
+                values[:done] = self._series[name][:done]
+        self._series = series
+
+        try:
+            while self.step_count < steps and not self.finished:
+                metrics = self.step()
+                self._log_step(metrics)
+                if not self.headless and self.publisher.ready():
+                    self._publish(metrics)
+        finally:
+            self.close()
+        if self.step_count < steps:
+            series = {name: values[:self.step_count] for name, values in series.items()}
+        return series
+
+    @property
+    def finished(self):
+        """True once `training.early_stop` is set and the run has converged."""
+        return self.config.training.early_stop and self.convergence.converged
+
+    def step(self):
+        """
+        Advance the simulation by one step and return its scalar metrics.
+        """
+        step = self.step_count
+        telemetry = self.telemetry
+        t = telemetry.clock()
+
+        # Agents emit → field evolves → agents update (all whole-array ops)
+        symbols = self.population.act()
+        self.reward, state = self.field.step(symbols, self.noise)
+        beliefs = self.population.update(state, self.noise.noise_level, symbols)
+        self.action_entropy.update_many(symbols)
+        t = telemetry.lap("sim_step", t)
+
+        # Population metrics, all O(N * S + E)
+        metrics = {
+            "timestep": step,
+            "entropy": self.action_entropy.entropy(),
+            "kl_divergence": consensus_loss(beliefs, self.topology),
+            "mutual_information": compute_mutual_information(beliefs),
+            "connectivity": self.population.agreement(),
+        }
+        converged = self.convergence.converged
+        if self.convergence.update(step, metrics["entropy"], metrics["kl_divergence"]) and not converged:
+            summary = self.convergence.summary()
+            logger.info(
+                f"🏁 Converged at step {step} (λ = {summary['converged_lambda']})",
+                extra={"fields": {"event": "converged", **summary}},
+            )
+        t = telemetry.lap("metrics", t)
+
+        if self.recorder is not None:
+            self.recorder.record(**metrics)
+        if self.trajectory is not None:
+            self.trajectory.append(
+                step, [self.reward if c == "reward" else metrics[c] for c in HISTORY_CHANNELS],
+                state, self.field.last_noise,
+                np.bincount(symbols, minlength=self.population.vocabulary_size),
+            )
+        if self._series is not None and step < len(self._series["timestep"]):
+            for name, values in self._series.items():
+                values[step] = metrics[name]
+        telemetry.lap("record", t)
+
+        self.step_count += 1
+        telemetry.count("steps_total")
+        if self.checkpoints is not None and self.step_count % self.config.training.checkpoint_every == 0:
+            self.checkpoint()
+        return metrics
+
+    def _log_step(self, metrics):
+        # Aggregated, rate-limited console / log line (Render console included)
+        self.step_log.update(
+            metrics["timestep"], H=metrics["entropy"], KL=metrics["kl_divergence"],
+            C=metrics["connectivity"],
+        )
+
+    # -------------------------------------------------------------------------
+    # 💾 Checkpoints
+    # -------------------------------------------------------------------------
+    def checkpoint(self):
+        """
+        Snapshot the state (copied on this thread) and hand it to the writer.
+        """
+        if self.checkpoints is None or self.checkpoints.last_submitted == self.step_count:
+            return
+        # Persisted metric rows must cover everything the snapshot has seen
+        if self.recorder is not None:
+            self.recorder.flush()
+        self.checkpoints.submit(self.step_count, self.state_dict())
+
+    def state_dict(self):
+        """
+        Complete simulation state as nested arrays / JSON values.
+        """
+        state = {
+            "step": self.step_count,
+            "reward": self.reward,
+            "config": asdict(self.config),
+            "field": self.field.state_dict(),
+            "noise": self.noise.state_dict(),
+            "population": self.population.state_dict(),
+            "action_entropy": self.action_entropy.state_dict(),
+            "convergence": self.convergence.state_dict(),
+        }
+        if self._series is not None:
+            done = min(self.step_count, len(self._series["timestep"]))
+            state["series"] = {name: values[:done].copy() for name, values in self._series.items()}
+        return state
+
+    def load_state_dict(self, state):
+        # Pacing, logging and sweep settings may change between runs
+        current = json.loads(json.dumps(result_config(self.config)))
+        saved = result_config(state["config"])
+        if current != saved:
+            changed = sorted(
+                f"{section}.{key}" for section in current
+                for key in set(current[section]) | set(saved[section])
+                if current[section].get(key) != saved[section].get(key)
+            )
+            raise ValueError(f"Checkpoint was written with a different configuration ({', '.join(changed)})")
+
+        self.step_count = int(state["step"])
+        self.reward = state["reward"]
+        self.field.load_state_dict(state["field"])
+        self.noise.load_state_dict(state["noise"])
+        self.population.load_state_dict(state["population"])
+        self.action_entropy.load_state_dict(state["action_entropy"])
+        if "convergence" in state:
+            self.convergence.load_state_dict(state["convergence"])
+        if "series" in state:
+            self._series = {name: np.array(values) for name, values in state["series"].items()}
+
+    def close(self):
+        self.step_log.flush()
+        if self.checkpoints is not None:
+            self.checkpoint()
+            self.checkpoints.close()
+            self.checkpoints = None
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.trajectory is not None:
+            self.trajectory.close()
+            self.trajectory = None
+        if self.dashboard is not None:
+            self.dashboard.close()
+            self.dashboard = None
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+        self.telemetry.set("steps_per_second", 0.0)
+
+    def _publish(self, metrics):
+        """
+        Hand the frame to the shared-memory ring, falling back to (or
+        periodically snapshotting into) the atomic JSON file.
+        """
+        step = metrics["timestep"]
+        entropy = metrics["entropy"]
+        kl = metrics["kl_divergence"]
+        connectivity = metrics["connectivity"]
+
+        # Dashboard shows a fixed subset; its KL matrix is tiny
+        belief_array = self.population.beliefs[self.display_ids]
+        kl_values = compute_kl_matrix(belief_array)
+
+        self.telemetry.count("frames_published_total")
+        if self.ring is not None:
+            t = self.telemetry.clock()
+            self.ring.write(step, entropy, kl, connectivity, belief_array, kl_values)
+            self.telemetry.lap("ring_write", t)
+            # Published steps are rate-gated, so compare against the last snapshot
+            if self._last_snapshot is not None and step - self._last_snapshot < JSON_SNAPSHOT_EVERY:
+                return
+        self._last_snapshot = step
+
+        # Topology edges among the shown agents, weighted by belief overlap
+        weights = self.population.edge_overlap(self.display_ids, self.display_edges)
+
+        # Hand fresh arrays to the writer thread (nothing here is mutated later);
+        # list conversion, JSON encoding and the atomic swap all happen there
+        self.dashboard.submit(step, (step, entropy, kl, connectivity, belief_array, kl_values, weights))
+
+    def _render_dashboard(self, step, entropy, kl, connectivity, belief_array, kl_values, weights):
+        """
+        Writer-thread side of `_publish`: build the JSON frame and store it.
+        """
+        beliefs = [
+            {"agent": f"A{i+1}", "belief": b.tolist()}
+            for i, b in enumerate(belief_array)
+        ]
+        edges = [[i, j, w] for (i, j), w in zip(self.display_edges, weights)]
+
+        # Update live dashboard JSON via Atomic Swap
+        self._write_dashboard(step, entropy, kl, connectivity, beliefs, kl_values.tolist(), edges)
+
+    def _write_dashboard(self, step, entropy, kl, connectivity, beliefs, kl_matrix, edges=None):
         """
         ATOMIC WRITE: Writes to a temporary file then renames it instantly.
         Prevents the dashboard from ever reading an empty/corrupted file.
@@ -67,17 +437,25 @@ class Trainer:
             "connectivity": connectivity,
             "beliefs": beliefs,
             "kl_matrix": kl_matrix,
+            "edges": edges or [],
             "last_update": time.ctime() 
         }
 
+        telemetry = self.telemetry
+        t = telemetry.clock()
+        payload = json.dumps(data)
+        t = telemetry.lap("json_encode", t)
+
         try:
             # 1. Write data to the temporary file first
             with open(temp_path, "w") as f:
-                json.dump(data, f)
+                f.write(payload)
             
             # 2. Atomic Rename: This swap is instantaneous at the OS level
             # The dashboard either sees the old version or the new version.
             os.replace(temp_path, final_path)
+            telemetry.lap("file_replace", t)
+            telemetry.count("bytes_written_total", len(payload))
 
         except (PermissionError, OSError):
             # If the file is locked by the OS, we skip this frame
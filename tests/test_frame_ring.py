@@ -0,0 +1,66 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Frame Ring Tests
+# File         : test_frame_ring.py
+# Author       : AHMED ZARAI
+# Purpose      : A live writer's ring survives a refused second writer
+# =============================================================================
+
+import os
+import sys
+import time
+import uuid
+import subprocess
+import unittest
+
+from simulation.trainer import BASE_DIR
+from utils.frame_ring import FrameRing
+
+WRITER = """
+import sys
+from utils.frame_ring import FrameRing
+ring = FrameRing.create(num_agents=4, belief_dim=3, capacity=8, name=sys.argv[1])
+print("ready", flush=True)
+sys.stdin.read()
+ring.close()
+"""
+
+SECOND_WRITER = """
+import sys
+from utils.frame_ring import FrameRing
+try:
+    FrameRing.create(num_agents=4, belief_dim=3, capacity=8, name=sys.argv[1])
+except FileExistsError:
+    sys.exit(0)
+sys.exit(1)
+"""
+
+
+class RefusedCreateTest(unittest.TestCase):
+
+    def _python(self, source, name, **kwargs):
+        return [sys.executable, "-c", source, name], dict(cwd=BASE_DIR, text=True, **kwargs)
+
+    def test_refused_create_leaves_live_ring(self):
+        name = f"emergencelab_test_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        args, kwargs = self._python(WRITER, name, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        writer = subprocess.Popen(args, **kwargs)
+        try:
+            self.assertEqual(writer.stdout.readline().strip(), "ready")
+
+            args, kwargs = self._python(SECOND_WRITER, name, capture_output=True, timeout=60)
+            refused = subprocess.run(args, **kwargs)
+            self.assertEqual(refused.returncode, 0, refused.stderr)
+            self.assertNotIn("leaked shared_memory", refused.stderr)
+
+            # Give the second writer's resource tracker time to clean up
+            time.sleep(0.5)
+            ring = FrameRing.attach(name)
+            ring.close()
+        finally:
+            writer.communicate("", timeout=60)
+
+        self.assertIsNone(FrameRing.try_attach(name))
+
+
+if __name__ == "__main__":
+    unittest.main()
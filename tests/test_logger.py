@@ -0,0 +1,56 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Logger Tests
+# File         : test_logger.py
+# Author       : AHMED ZARAI
+# Purpose      : A second setup_logger call writes to its own file
+# =============================================================================
+
+import os
+import json
+import shutil
+import logging
+import tempfile
+import unittest
+
+import utils.logger as logger_module
+
+
+class SetupLoggerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="emergencelab_logs_")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.addCleanup(self._reset)
+
+    def _reset(self):
+        logger_module.shutdown_logger()
+        logger_module._queue = None
+        logger = logging.getLogger(logger_module.LOGGER_NAME)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+    def _lines(self, name):
+        with open(os.path.join(self.directory, name)) as f:
+            return [json.loads(line)["msg"] for line in f if line.strip()]
+
+    def test_second_setup_switches_file(self):
+        first = os.path.join(self.directory, "first.jsonl")
+        second = os.path.join(self.directory, "second.jsonl")
+
+        logger = logger_module.setup_logger(first, structured=True)
+        logger.info("one")
+        self.assertIs(logger_module.setup_logger(second, structured=True), logger)
+        logger.info("two")
+        logger_module.shutdown_logger()
+
+        self.assertEqual(self._lines("first.jsonl"), ["one"])
+        self.assertEqual(self._lines("second.jsonl"), ["two"])
+
+    def test_setup_in_forwarding_process_fails(self):
+        logger_module.attach_queue(logger_module.multiprocessing.Queue())
+        with self.assertRaises(RuntimeError):
+            logger_module.setup_logger(os.path.join(self.directory, "child.log"))
+
+
+if __name__ == "__main__":
+    unittest.main()
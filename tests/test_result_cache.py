@@ -0,0 +1,110 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Result Cache Tests
+# File         : test_result_cache.py
+# Author       : AHMED ZARAI
+# Purpose      : Cache keys, source-edit invalidation, storage and eviction
+# =============================================================================
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import utils.result_cache as result_cache
+from config.loader import load_config, with_overrides
+from simulation.trainer import CONFIG_PATH
+
+
+class CodeSaltTest(unittest.TestCase):
+
+    def setUp(self):
+        # Private copy of the salted packages, so edits never touch the tree
+        self.base = tempfile.mkdtemp(prefix="emergencelab_salt_")
+        self.addCleanup(shutil.rmtree, self.base, ignore_errors=True)
+        for package in result_cache.SALT_PACKAGES:
+            shutil.copytree(
+                os.path.join(result_cache.BASE_DIR, package), os.path.join(self.base, package),
+                ignore=shutil.ignore_patterns("__pycache__"),
+            )
+
+    def _edit(self, relative_path):
+        with open(os.path.join(self.base, relative_path), "a") as f:
+            f.write("\n# edited\n")
+
+    def test_source_edit_changes_salt(self):
+        for path in ("environment/noise_model.py", "simulation/population.py", "metrics/entropy.py"):
+            before = result_cache.source_hash(self.base)
+            self._edit(path)
+            self.assertNotEqual(before, result_cache.source_hash(self.base), path)
+
+    def test_source_edit_invalidates_run_key(self):
+        config = load_config(CONFIG_PATH)
+        with mock.patch.object(result_cache, "_salt", result_cache.source_hash(self.base)):
+            before = result_cache.run_key(config, steps=100, seed=7)
+        self._edit("environment/entropy_field.py")
+        with mock.patch.object(result_cache, "_salt", result_cache.source_hash(self.base)):
+            after = result_cache.run_key(config, steps=100, seed=7)
+        self.assertNotEqual(before, after)
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="emergencelab_cache_")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.series = {"timestep": np.arange(500), "entropy": np.linspace(2.0, 0.5, 500)}
+
+    def test_round_trip(self):
+        cache = result_cache.ResultCache(self.directory)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", self.series)
+        cached = cache.get("a")
+        for name, values in self.series.items():
+            np.testing.assert_array_equal(cached[name], values)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_corrupt_entry_is_a_miss_and_removed(self):
+        cache = result_cache.ResultCache(self.directory)
+        cache.put("a", self.series)
+        path = os.path.join(self.directory, "a.npz")
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) // 2)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.misses, 1)
+        self.assertFalse(os.path.exists(path))
+
+    def test_evicts_least_recently_used(self):
+        cache = result_cache.ResultCache(self.directory)
+        cache.put("old", self.series)
+        cache.put("used", self.series)
+        entry_bytes = os.path.getsize(os.path.join(self.directory, "old.npz"))
+        # Distinct mtimes, then a hit makes "used" the most recent entry
+        os.utime(os.path.join(self.directory, "old.npz"), (1, 1))
+        os.utime(os.path.join(self.directory, "used.npz"), (2, 2))
+        cache.get("used")
+
+        cache.max_bytes = 2 * entry_bytes
+        cache.put("new", self.series)
+        self.assertEqual(sorted(os.listdir(self.directory)), ["new.npz", "used.npz"])
+
+
+class ConfigHashTest(unittest.TestCase):
+
+    def test_runtime_keys_keep_the_hash(self):
+        config = load_config(CONFIG_PATH)
+        cosmetic = with_overrides(config, {
+            "training.publish_rate": 1.0, "training.log_interval": 5.0,
+            "training.checkpoint_every": 10, "sweep.workers": 2,
+        })
+        self.assertEqual(result_cache.config_hash(config), result_cache.config_hash(cosmetic))
+
+        changed = with_overrides(config, {"agents.coupling_alpha": 0.3})
+        self.assertNotEqual(result_cache.config_hash(config), result_cache.config_hash(changed))
+
+
+if __name__ == "__main__":
+    unittest.main()
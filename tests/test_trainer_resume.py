@@ -0,0 +1,44 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Trainer Resume Tests
+# File         : test_trainer_resume.py
+# Author       : AHMED ZARAI
+# Purpose      : Checkpoints resume across runtime-only config edits
+# =============================================================================
+
+import shutil
+import tempfile
+import unittest
+
+from config.loader import load_config, with_overrides
+from simulation.trainer import CONFIG_PATH, Trainer
+
+
+class ResumeConfigTest(unittest.TestCase):
+
+    def setUp(self):
+        self.config = load_config(CONFIG_PATH)
+        self.directory = tempfile.mkdtemp(prefix="emergencelab_resume_")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        trainer = self._trainer(self.config, resume=False)
+        trainer.run(20)
+        trainer.close()
+
+    def _trainer(self, config, resume=True):
+        return Trainer(config, headless=True, metrics_dir=None, checkpoint_dir=self.directory, resume=resume)
+
+    def test_runtime_keys_do_not_block_resume(self):
+        config = with_overrides(self.config, {
+            "training.publish_rate": 3.0, "training.checkpoint_every": 7, "sweep.workers": 3,
+        })
+        trainer = self._trainer(config)
+        self.assertEqual(trainer.step_count, 20)
+        trainer.close()
+
+    def test_dynamics_change_is_rejected(self):
+        config = with_overrides(self.config, {"environment.noise_level": 0.3})
+        with self.assertRaisesRegex(ValueError, "environment.noise_level"):
+            self._trainer(config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Simulation Checkpoints
+# File         : checkpoint.py
+# Author       : AHMED ZARAI
+# Purpose      : Atomic, memory-mappable snapshots written off the step thread
+# =============================================================================
+
+import os
+import json
+import shutil
+import numpy as np
+
+from utils.latest_writer import LatestWinsWriter
+
+# -----------------------------------------------------------------------------
+# 📐 Checkpoint Layout
+# -----------------------------------------------------------------------------
+# <directory>/step_00002500/<path>.npy  → one raw .npy per array (mmap-able)
+# <directory>/step_00002500/meta.json   → nested state with arrays replaced
+#                                         by {"__npy__": "<path>.npy"}
+# <directory>/latest.json               → pointer to the newest complete step
+LATEST_FILE = "latest.json"
+META_FILE = "meta.json"
+KEEP_CHECKPOINTS = 2
+
+
+def _step_dir(directory, step):
+    return os.path.join(directory, f"step_{step:08d}")
+
+
+def _split_arrays(value, path, arrays):
+    """
+    Replace every ndarray in a nested dict/list by a file reference.
+    """
+    if isinstance(value, np.ndarray):
+        name = f"{path or 'value'}.npy"
+        arrays[name] = value
+        return {"__npy__": name}
+    if isinstance(value, dict):
+        return {k: _split_arrays(v, f"{path}.{k}" if path else str(k), arrays) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_split_arrays(v, f"{path}.{i}", arrays) for i, v in enumerate(value)]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _join_arrays(value, folder, mmap):
+    if isinstance(value, dict):
+        if set(value) == {"__npy__"}:
+            return np.load(os.path.join(folder, value["__npy__"]), mmap_mode="r" if mmap else None)
+        return {k: _join_arrays(v, folder, mmap) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_join_arrays(v, folder, mmap) for v in value]
+    return value
+
+
+def _write_json(path, data):
+    """Temp-then-rename, as in Trainer._write_dashboard."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+# =============================================================================
+# 💾 Save / Load
+# =============================================================================
+def save_checkpoint(directory, step, state, keep=KEEP_CHECKPOINTS):
+    """
+    Write one checkpoint and atomically point `latest.json` at it.
+
+    Parameters
+    ----------
+    directory : str
+        Checkpoint root.
+    step : int
+        Step counter the state corresponds to.
+    state : dict
+        Nested dict of arrays and JSON-serializable values.
+    keep : int
+        Number of most recent checkpoints kept on disk.
+
+    Returns
+    -------
+    str
+        Folder of the new checkpoint.
+    """
+    os.makedirs(directory, exist_ok=True)
+    final_dir = _step_dir(directory, step)
+    temp_dir = final_dir + ".tmp"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+
+    # Arrays go out uncompressed so they can be memory-mapped back
+    arrays = {}
+    meta = {"step": int(step), "state": _split_arrays(state, "", arrays)}
+    for name, array in arrays.items():
+        np.save(os.path.join(temp_dir, name), np.ascontiguousarray(array))
+    _write_json(os.path.join(temp_dir, META_FILE), meta)
+
+    # The folder only appears under its final name once complete
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(temp_dir, final_dir)
+    _write_json(os.path.join(directory, LATEST_FILE), {"step": int(step), "path": os.path.basename(final_dir)})
+
+    _prune(directory, keep)
+    return final_dir
+
+
+def load_checkpoint(directory, mmap=True):
+    """
+    Load the checkpoint `latest.json` points to.
+
+    Returns
+    -------
+    tuple or None
+        (step, state) with arrays memory-mapped read-only (copies if
+        `mmap` is False), or None if the directory holds no checkpoint.
+    """
+    pointer = os.path.join(directory, LATEST_FILE)
+    if not os.path.exists(pointer):
+        return None
+    with open(pointer, "r") as f:
+        latest = json.load(f)
+
+    folder = os.path.join(directory, latest["path"])
+    with open(os.path.join(folder, META_FILE), "r") as f:
+        meta = json.load(f)
+    return meta["step"], _join_arrays(meta["state"], folder, mmap)
+
+
+def clear_checkpoints(directory):
+    """
+    Remove every checkpoint (and the pointer) from `directory`.
+    """
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name.startswith("step_"):
+            shutil.rmtree(path, ignore_errors=True)
+        elif name.startswith(LATEST_FILE):
+            os.remove(path)
+
+
+def _prune(directory, keep):
+    steps = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith("step_") and not name.endswith(".tmp")
+    )
+    for name in steps[:-keep]:
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+# =============================================================================
+# 🔎 CheckpointWriter Class
+# =============================================================================
+class CheckpointWriter(LatestWinsWriter):
+    """
+    Background checkpoint writer with a single latest-wins slot (see
+    LatestWinsWriter).
+
+    `submit` hands over an already-copied state dict and returns at once;
+    if the previous checkpoint is still being written the pending one is
+    replaced (counted in `dropped`) rather than queued.
+
+    Attributes
+    ----------
+    directory : str
+        Checkpoint root.
+    """
+
+    label = "Checkpoint"
+    thread_name = "checkpoint-writer"
+    errors = (OSError,)
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, directory, keep=KEEP_CHECKPOINTS, resume=False):
+        """
+        Parameters
+        ----------
+        resume : bool
+            Keep existing checkpoints; otherwise they are removed (new run).
+        """
+        self.directory = directory
+        self.keep = keep
+
+        if not resume:
+            clear_checkpoints(directory)
+        os.makedirs(directory, exist_ok=True)
+        super().__init__()
+
+    def _write(self, step, state):
+        save_checkpoint(self.directory, step, state, keep=self.keep)
@@ -0,0 +1,42 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Asynchronous Dashboard Writer
+# File         : dashboard_writer.py
+# Author       : AHMED ZARAI
+# Purpose      : Serialize and store dashboard frames off the step thread
+# =============================================================================
+
+from utils.latest_writer import LatestWinsWriter
+from utils.telemetry import NULL_TELEMETRY
+
+
+# =============================================================================
+# 🔎 DashboardWriter Class
+# =============================================================================
+class DashboardWriter(LatestWinsWriter):
+    """
+    Background frame writer (see LatestWinsWriter): the writer thread
+    always serializes the most recent frame only, and superseded frames
+    also bump the `dashboard_frames_dropped_total` telemetry counter.
+    """
+
+    label = "Dashboard frame"
+    thread_name = "dashboard-writer"
+    drop_metric = "dashboard_frames_dropped_total"
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, write, telemetry=NULL_TELEMETRY):
+        """
+        Parameters
+        ----------
+        write : callable
+            Called on the writer thread as `write(*frame)`.
+        telemetry : Telemetry or NullTelemetry
+            Receives the drop counter.
+        """
+        self.write = write
+        super().__init__(telemetry)
+
+    def _write(self, step, frame):
+        self.write(*frame)
@@ -0,0 +1,336 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Shared-Memory Frame Ring
+# File        : frame_ring.py
+# Author      : AHMED ZARAI
+# Purpose     : Zero-copy dashboard frame transport between simulation & server
+# =============================================================================
+
+import os
+import time
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+
+# -----------------------------------------------------------------------------
+# 📐 Ring Layout
+# -----------------------------------------------------------------------------
+DEFAULT_RING_NAME = os.environ.get("EMERGENCELAB_RING", "emergencelab_frames")
+RING_MAGIC = 0x424C4C45  # "ELLB"
+RING_VERSION = 2
+HEADER_BYTES = 64
+HEADER_FIELDS = (
+    "magic", "version", "capacity", "num_agents", "belief_dim", "nonce", "write_count",
+    "writer_pid",
+)
+SCALAR_FIELDS = ("entropy", "kl", "connectivity", "timestamp")
+
+# Reader re-checks the segment after this long without a new frame
+STALE_AFTER = 2.0
+
+
+def frame_dtype(num_agents, belief_dim):
+    """
+    Fixed-layout record for one dashboard frame.
+
+    `seq` is a per-slot seqlock: odd while the writer is filling the slot,
+    2 * (frame_index + 1) once the frame is complete.
+    """
+    return np.dtype([
+        ("seq", "<u8"),
+        ("step", "<i8"),
+        ("scalars", "<f8", (len(SCALAR_FIELDS),)),
+        ("beliefs", "<f4", (num_agents, belief_dim)),
+        ("kl_matrix", "<f4", (num_agents, num_agents)),
+    ], align=True)
+
+
+# =============================================================================
+# 🔎 FrameView Class
+# =============================================================================
+class FrameView:
+    """
+    Zero-copy view of one frame inside the ring.
+
+    The arrays alias shared memory; call `valid()` after consuming them to
+    confirm the writer did not overwrite the slot in the meantime.
+    """
+
+    def __init__(self, ring, index):
+        self._ring = ring
+        self.index = index
+        slot = index % ring.capacity
+        self.step = int(ring._step[slot])
+        self.scalars = ring._scalars[slot]
+        self.beliefs = ring._beliefs[slot]
+        self.kl_matrix = ring._kl[slot]
+
+    def valid(self):
+        """True while the slot still holds this frame."""
+        return int(self._ring._seq[self.index % self._ring.capacity]) == 2 * (self.index + 1)
+
+    @property
+    def agents(self):
+        """Agent labels, matching the trainer's JSON payload."""
+        return [f"A{i+1}" for i in range(self.beliefs.shape[0])]
+
+    def scalar_dict(self):
+        """
+        Scalar fields of the dashboard payload.
+        """
+        entropy, kl, connectivity, timestamp = self.scalars.tolist()
+        return {
+            "entropy": entropy,
+            "kl": kl,
+            "connectivity": connectivity,
+            "last_update": time.ctime(timestamp),
+        }
+
+    def to_dict(self):
+        """
+        Build the dashboard payload (same schema as `live_dashboard.json`).
+        """
+        return {
+            "step": self.step,
+            **self.scalar_dict(),
+            "beliefs": [
+                {"agent": agent, "belief": b}
+                for agent, b in zip(self.agents, self.beliefs.tolist())
+            ],
+            "kl_matrix": self.kl_matrix.tolist(),
+        }
+
+
+# =============================================================================
+# 🔎 FrameRing Class
+# =============================================================================
+class FrameRing:
+    """
+    Single-writer, multi-reader ring of fixed-layout frames in shared memory.
+
+    The simulation process owns the segment (`create`); dashboard processes
+    `attach` by name and pull new frames without touching the filesystem.
+
+    Attributes
+    ----------
+    capacity : int
+        Number of frame slots; readers lagging further behind drop frames.
+    num_agents : int
+        Agents per frame (rows of the belief block).
+    belief_dim : int
+        Belief vector length per agent.
+    dropped : int
+        Reader-side count of frames overwritten before they were read.
+    """
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, shm, owner):
+        self._shm = shm
+        self._owner = owner
+
+        self._header = np.ndarray((len(HEADER_FIELDS),), dtype="<u8", buffer=shm.buf)
+        if self._header[0] != RING_MAGIC or self._header[1] != RING_VERSION:
+            raise ValueError(f"Shared memory segment {shm.name!r} is not a frame ring")
+
+        self.capacity = int(self._header[2])
+        self.num_agents = int(self._header[3])
+        self.belief_dim = int(self._header[4])
+        self.nonce = int(self._header[5])
+
+        slots = np.ndarray(
+            (self.capacity,), dtype=frame_dtype(self.num_agents, self.belief_dim),
+            buffer=shm.buf, offset=HEADER_BYTES,
+        )
+        self._seq = slots["seq"]
+        self._step = slots["step"]
+        self._scalars = slots["scalars"]
+        self._beliefs = slots["beliefs"]
+        self._kl = slots["kl_matrix"]
+
+        self.dropped = 0
+        self._next = int(self._header[6])
+        self._last_frame_time = time.monotonic()
+        self._last_stale_check = 0.0
+
+    # -------------------------------------------------------------------------
+    # 🏗️ Writer Side
+    # -------------------------------------------------------------------------
+    @classmethod
+    def create(cls, num_agents, belief_dim, capacity=256, name=DEFAULT_RING_NAME):
+        """
+        Create (or replace a stale) ring segment and return the writer.
+
+        An existing segment is only replaced when it is a frame ring whose
+        writer process has exited.
+
+        Raises
+        ------
+        FileExistsError
+            The name belongs to a live writer or to a foreign segment.
+        """
+        size = HEADER_BYTES + capacity * frame_dtype(num_agents, belief_dim).itemsize
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Probe untracked: a refused create must not unlink the segment at exit
+            existing = _open_untracked(name)
+            reason = _replace_blocker(existing)
+            existing.close()
+            if reason:
+                raise FileExistsError(f"Shared memory segment {name!r} {reason}; not replacing it")
+            if getattr(existing, "_track", True):
+                # Python < 3.13: unlink() unregisters, so register first
+                resource_tracker.register(existing._name, "shared_memory")
+            existing.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        header = np.ndarray((len(HEADER_FIELDS),), dtype="<u8", buffer=shm.buf)
+        header[:] = (
+            RING_MAGIC, RING_VERSION, capacity, num_agents, belief_dim,
+            int.from_bytes(os.urandom(8), "little"), 0, os.getpid(),
+        )
+        del header
+        return cls(shm, owner=True)
+
+    def write(self, step, entropy, kl, connectivity, beliefs, kl_matrix):
+        """
+        Publish one frame. Never blocks; slow readers simply drop frames.
+        """
+        n = int(self._header[6])
+        slot = n % self.capacity
+
+        self._seq[slot] = 2 * n + 1
+        self._step[slot] = step
+        self._scalars[slot] = (entropy, kl, connectivity, time.time())
+        self._beliefs[slot] = beliefs
+        self._kl[slot] = kl_matrix
+        self._seq[slot] = 2 * n + 2
+
+        self._header[6] = n + 1
+
+    # -------------------------------------------------------------------------
+    # 📡 Reader Side
+    # -------------------------------------------------------------------------
+    @classmethod
+    def attach(cls, name=DEFAULT_RING_NAME):
+        """
+        Attach to an existing ring as a reader.
+        """
+        shm = _open_untracked(name)
+        try:
+            return cls(shm, owner=False)
+        except ValueError:
+            shm.close()
+            raise
+
+    @classmethod
+    def try_attach(cls, name=DEFAULT_RING_NAME):
+        """
+        Attach if the writer has created the ring, else return None.
+        """
+        try:
+            return cls.attach(name)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def read_new(self):
+        """
+        Return views of all complete frames published since the last call.
+        """
+        write_count = int(self._header[6])
+        if write_count - self._next > self.capacity:
+            self.dropped += write_count - self.capacity - self._next
+            self._next = write_count - self.capacity
+
+        frames = []
+        for index in range(self._next, write_count):
+            if int(self._seq[index % self.capacity]) == 2 * (index + 1):
+                frames.append(FrameView(self, index))
+            else:
+                self.dropped += 1
+        self._next = write_count
+
+        if frames:
+            self._last_frame_time = time.monotonic()
+        return frames
+
+    def is_stale(self):
+        """
+        True when the writer has gone away or a new ring replaced this one.
+        Only probes the segment after STALE_AFTER seconds without frames.
+        """
+        now = time.monotonic()
+        if now - self._last_frame_time < STALE_AFTER or now - self._last_stale_check < STALE_AFTER:
+            return False
+        self._last_stale_check = now
+
+        current = FrameRing.try_attach(self._shm.name.lstrip("/"))
+        if current is None:
+            return True
+        stale = current.nonce != self.nonce
+        current.close()
+        return stale
+
+    # -------------------------------------------------------------------------
+    # ♻️ Teardown
+    # -------------------------------------------------------------------------
+    def close(self):
+        """
+        Release the mapping; the owning writer also unlinks the segment.
+        """
+        self._header = self._seq = self._step = None
+        self._scalars = self._beliefs = self._kl = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # Outstanding FrameViews still alias the mapping; it is released
+            # once they are garbage collected
+            pass
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _open_untracked(name):
+    """
+    Open an existing segment without resource-tracker registration, so
+    this process never unlinks a segment it does not own when it exits.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: register, then immediately forget it
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _replace_blocker(shm):
+    """
+    Why an existing segment must not be replaced (None if it is stale).
+    """
+    if shm.size < HEADER_BYTES:
+        return "is not a frame ring"
+    header = np.ndarray((len(HEADER_FIELDS),), dtype="<u8", buffer=shm.buf).tolist()
+    if header[0] != RING_MAGIC:
+        return "is not a frame ring"
+    if header[1] != RING_VERSION:
+        return None     # left behind by an older build
+    pid = header[HEADER_FIELDS.index("writer_pid")]
+    if _pid_alive(pid):
+        return f"is owned by live writer pid {pid}"
+    return None
+
+
+def _pid_alive(pid):
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
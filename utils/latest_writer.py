@@ -0,0 +1,110 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Latest-Wins Background Writer
+# File         : latest_writer.py
+# Author       : AHMED ZARAI
+# Purpose      : Single-slot writer thread shared by checkpoints and
+#                dashboard frames
+# =============================================================================
+
+import logging
+import threading
+from abc import ABC, abstractmethod
+
+from utils.logger import LOGGER_NAME
+from utils.telemetry import NULL_TELEMETRY
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+# =============================================================================
+# 🔎 LatestWinsWriter Class
+# =============================================================================
+class LatestWinsWriter(ABC):
+    """
+    Background writer with a single latest-wins mailbox slot.
+
+    `submit` stores a reference to the newest item and returns at once;
+    the writer thread only ever writes the most recent item, so a slow
+    disk costs skipped items (counted in `dropped`) instead of step time.
+    Items must not be mutated after submission. Subclasses implement
+    `_write(step, item)`; failures listed in `errors` are logged and the
+    thread keeps running.
+
+    Attributes
+    ----------
+    written : int
+        Items written successfully.
+    dropped : int
+        Items superseded in the slot before the writer reached them.
+    last_step : int or None
+        Step of the most recently written item.
+    last_submitted : int or None
+        Step of the most recently submitted item.
+    """
+
+    label = "Write"
+    thread_name = "latest-wins-writer"
+    drop_metric = None          # telemetry counter bumped on every drop
+    errors = (Exception,)
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, telemetry=NULL_TELEMETRY):
+        self.telemetry = telemetry
+        self.written = 0
+        self.dropped = 0
+        self.last_step = None
+        self.last_submitted = None
+
+        self._pending = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    @abstractmethod
+    def _write(self, step, item):
+        """Store one item (runs on the writer thread)."""
+
+    # -------------------------------------------------------------------------
+    # 📥 Submit (latest-wins)
+    # -------------------------------------------------------------------------
+    def submit(self, step, item):
+        with self._cond:
+            self.last_submitted = step
+            if self._pending is not None:
+                self.dropped += 1
+                if self.drop_metric:
+                    self.telemetry.count(self.drop_metric)
+            self._pending = (step, item)
+            self._cond.notify()
+
+    # -------------------------------------------------------------------------
+    # 📤 Writer Loop
+    # -------------------------------------------------------------------------
+    def _loop(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                step, item = self._pending
+                self._pending = None
+
+            try:
+                self._write(step, item)
+                self.written += 1
+                self.last_step = step
+            except self.errors as e:
+                logger.warning(f"⚠️ {self.label} at step {step} failed: {e}")
+
+    def close(self):
+        """
+        Write any pending item, then stop the thread.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
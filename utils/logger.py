@@ -5,58 +5,259 @@
 # Purpose     : Structured logging for multi-agent simulation & dashboard
 # =============================================================================
 
+import json
+import time
+import atexit
 import logging
+import logging.handlers
+import multiprocessing
 import os
 
+LOGGER_NAME = "EmergenceLab"
+LOG_FILE = os.path.join("results", "system.log")
+
+# One queue + listener per process tree; children only enqueue records
+_queue = None
+_listener = None
+
+
+# =============================================================================
+# 📝 Formatters
+# =============================================================================
+TEXT_FORMATTER = logging.Formatter(
+    "%(asctime)s | %(levelname)s | %(message)s",
+    "%Y-%m-%d %H:%M:%S",
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One compact JSON object per line: time, level, pid, message and any
+    `extra={"fields": {...}}` passed to the logging call.
+    """
+
+    def format(self, record):
+        entry = {
+            "t": round(record.created, 3),
+            "level": record.levelname,
+            "pid": record.process,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        return json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str)
+
 
 # =============================================================================
 # 🔎 Logger Setup Function
 # =============================================================================
-def setup_logger() -> logging.Logger:
+def setup_logger(log_file=LOG_FILE, structured=False, level=logging.INFO) -> logging.Logger:
     """
     Initializes a structured logger for EmergenceLab v5.
 
     Features:
     - Logs both to console and file
-    - Stores logs in 'results/system.log'
+    - Stores logs in 'results/system.log' by default
     - Timestamped entries for research reproducibility
+    - Non-blocking: the logger only enqueues records; a QueueListener
+      thread formats them and does the file / console I/O
+    - Idempotent: later calls return the same logger without adding
+      handlers; a call with another `log_file` or `structured` swaps the
+      listener's file handler (pass the queue from `log_queue()` to child
+      processes and call `attach_queue` there)
+
+    Parameters
+    ----------
+    log_file : str
+        File written by the listener.
+    structured : bool
+        Write JSON lines (see JsonFormatter) instead of text to the file.
     """
+    global _queue, _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    if _listener is None and _queue is not None:
+        raise RuntimeError(
+            "setup_logger() called in a process that forwards records to its parent's queue; "
+            "the parent's listener owns the log file"
+        )
+    if _listener is not None:
+        current = _listener.handlers[0]
+        if (current.baseFilename == os.path.abspath(log_file)
+                and isinstance(current.formatter, JsonFormatter) == structured):
+            return logger
 
     # -------------------------------------------------------------------------
     # 📂 Ensure logging directory exists
     # -------------------------------------------------------------------------
-    os.makedirs("results", exist_ok=True)
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
 
     # -------------------------------------------------------------------------
-    # 🧰 Create Logger Instance
+    # 📄 File Handler — Persistent Logging
     # -------------------------------------------------------------------------
-    logger = logging.getLogger("EmergenceLab")
-    logger.setLevel(logging.INFO)
+    fh = logging.FileHandler(log_file)
+    fh.setFormatter(JsonFormatter() if structured else TEXT_FORMATTER)
+
+    if _listener is not None:
+        # Another file: drain into the old one, then restart on the new one
+        _listener.stop()
+        current.close()
+        _listener = logging.handlers.QueueListener(
+            _queue, fh, *_listener.handlers[1:], respect_handler_level=True,
+        )
+        _listener.start()
+        return logger
 
     # -------------------------------------------------------------------------
-    # 📝 Formatter for Timestamps & Log Level
+    # 🖥️ Console Handler — Real-Time Feedback
     # -------------------------------------------------------------------------
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(message)s",
-        "%Y-%m-%d %H:%M:%S",
-    )
+    ch = logging.StreamHandler()
+    ch.setFormatter(TEXT_FORMATTER)
 
     # -------------------------------------------------------------------------
-    # 📄 File Handler — Persistent Logging
+    # 🔗 Queue → Listener Thread → Handlers
     # -------------------------------------------------------------------------
-    fh = logging.FileHandler("results/system.log")
-    fh.setFormatter(formatter)
+    _queue = multiprocessing.Queue(-1)
+    _listener = logging.handlers.QueueListener(_queue, fh, ch, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logger)
+
+    _install(logger, _queue, level)
+    return logger
+
+
+def log_queue():
+    """The process tree's record queue (None before `setup_logger`)."""
+    return _queue
+
+
+def attach_queue(queue, level=logging.INFO) -> logging.Logger:
+    """
+    Route this (child) process' logger into the parent's queue.
+
+    Safe to call repeatedly; a forked child that inherited the parent's
+    handler keeps exactly one.
+    """
+    global _queue
+    logger = logging.getLogger(LOGGER_NAME)
+    if queue is None:
+        return logger
+    _queue = queue
+    _install(logger, queue, level)
+    return logger
+
+
+def shutdown_logger():
+    """
+    Drain the queue and stop the listener (runs at exit in the parent).
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def _install(logger, queue, level):
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(queue))
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+# =============================================================================
+# 📊 Rate-Limited Step Summaries
+# =============================================================================
+class StepSummary:
+    """
+    Aggregate per-step scalars and log one line per `interval` seconds
+    (and/or `every` steps) with the min / mean / max of each.
+
+    `update` is a handful of float operations, so it can run on every
+    step at any rate; formatting and logging only happen on emission.
+    """
 
     # -------------------------------------------------------------------------
-    # 🖥️ Console Handler — Real-Time Feedback
+    # 🧰 Initialization
     # -------------------------------------------------------------------------
-    ch = logging.StreamHandler()
-    ch.setFormatter(formatter)
+    def __init__(self, logger, interval=1.0, every=None, label="STEPS", context=None, clock=time.monotonic):
+        """
+        Parameters
+        ----------
+        interval : float or None
+            Seconds between lines.
+        every : int or None
+            Steps between lines (checked before `interval`).
+        label : str
+            Prefix of each text line.
+        context : dict, optional
+            Constant structured fields added to every line (e.g. run_id).
+        """
+        self.logger = logger
+        self.interval = interval
+        self.every = every
+        self.label = label
+        self.context = dict(context or {})
+        self._clock = clock
+        self._reset(self._clock())
+
+    def _reset(self, now):
+        self._start = now
+        self._first = None
+        self._last = None
+        self._count = 0
+        self._stats = {}
 
     # -------------------------------------------------------------------------
-    # 🔗 Attach Handlers
+    # ➕ Accumulate
     # -------------------------------------------------------------------------
-    logger.addHandler(fh)
-    logger.addHandler(ch)
+    def update(self, step, **values):
+        if self._first is None:
+            self._first = step
+        self._last = step
+        self._count += 1
+
+        stats = self._stats
+        for name, value in values.items():
+            s = stats.get(name)
+            if s is None:
+                stats[name] = [value, value, value]
+            else:
+                if value < s[0]:
+                    s[0] = value
+                if value > s[2]:
+                    s[2] = value
+                s[1] += value
+
+        if self.every and self._count >= self.every:
+            self.flush()
+        elif self.interval and self._clock() - self._start >= self.interval:
+            self.flush()
 
-    return logger
\ No newline at end of file
+    # -------------------------------------------------------------------------
+    # 📤 Emit
+    # -------------------------------------------------------------------------
+    def flush(self):
+        """
+        Log the pending aggregate (if any) and start a new window.
+        """
+        now = self._clock()
+        if self._count:
+            elapsed = max(now - self._start, 1e-9)
+            fields = {
+                **self.context, "first_step": self._first, "last_step": self._last, "steps": self._count,
+                "steps_per_s": round(self._count / elapsed, 2),
+            }
+            parts = []
+            for name, (lo, total, hi) in self._stats.items():
+                mean = total / self._count
+                fields[name] = {"min": lo, "mean": mean, "max": hi}
+                parts.append(f"{name}={mean:.4f} [{lo:.4f}, {hi:.4f}]")
+            self.logger.info(
+                f"{self.label} {self._first}-{self._last} ({fields['steps_per_s']:.1f}/s) | " + " | ".join(parts),
+                extra={"fields": fields},
+            )
+        self._reset(now)
@@ -0,0 +1,253 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Scalable Network Layouts
+# File         : network_layout.py
+# Author       : AHMED ZARAI
+# Purpose      : Sparse belief-similarity graphs & cached, warm-started layouts
+# =============================================================================
+
+import os
+import hashlib
+import numpy as np
+import networkx as nx
+
+# -----------------------------------------------------------------------------
+# ⚙️ Layout Parameters
+# -----------------------------------------------------------------------------
+LAYOUT_CACHE_DIR = os.path.join("results", "layout_cache")
+TOP_K = 5                      # Strongest similarity edges kept per agent
+SIMILARITY_BLOCK_BYTES = 32 << 20
+SPRING_MAX_NODES = 300         # Above this, the spectral layout is used
+SPRING_ITERATIONS = 50
+SPRING_WARM_ITERATIONS = 15    # Refinement from a cached layout
+SPECTRAL_BLOCK = 4             # Subspace size (2 coordinates + 2 guard vectors)
+SPECTRAL_MAX_ITER = 3000
+SPECTRAL_TOL = 1e-6
+
+
+# =============================================================================
+# 🔗 Sparse Belief-Similarity Graph
+# =============================================================================
+def similarity_edges(beliefs, k=TOP_K, threshold=None):
+    """
+    Sparsified belief-overlap graph of a population.
+
+    The overlap of two agents is the Bhattacharyya coefficient
+    sum_v sqrt(p_i(v) p_j(v)) (the edge weight the trainer publishes),
+    computed for all pairs as blocks of one matrix product. Each agent
+    keeps its `k` strongest partners and/or those at or above
+    `threshold`; the union is returned as undirected edges.
+
+    Parameters
+    ----------
+    beliefs : array-like, shape (N, V)
+        One belief distribution per row.
+    k : int or None
+        Partners kept per agent (None keeps every pair above `threshold`).
+    threshold : float, optional
+        Minimum overlap of a kept edge.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (src, dst, weight) with src < dst, one entry per undirected edge.
+    """
+    root = np.sqrt(np.clip(np.asarray(beliefs, dtype=np.float64), 0.0, None))
+    n = root.shape[0]
+    if n < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0)
+    if k is None and threshold is None:
+        raise ValueError("similarity_edges needs k and/or threshold")
+    k = None if k is None else min(int(k), n - 1)
+
+    # Row blocks bound the working set to a few MB at any N
+    block = max(1, SIMILARITY_BLOCK_BYTES // (8 * n))
+    src, dst, weight = [], [], []
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        rows = np.arange(start, stop)
+        overlap = root[start:stop] @ root.T
+        overlap[rows - start, rows] = -np.inf
+
+        if k is not None:
+            cols = np.argpartition(overlap, -k, axis=1)[:, -k:]
+            values = np.take_along_axis(overlap, cols, axis=1)
+            keep = values >= threshold if threshold is not None else np.ones_like(values, dtype=bool)
+            src.append(np.broadcast_to(rows[:, None], cols.shape)[keep])
+            dst.append(cols[keep])
+            weight.append(values[keep])
+        else:
+            r, c = np.nonzero(overlap >= threshold)
+            src.append(r + start)
+            dst.append(c)
+            weight.append(overlap[r, c])
+
+    src, dst, weight = np.concatenate(src), np.concatenate(dst), np.concatenate(weight)
+
+    # Undirected: canonical (low, high) pairs, duplicates from both ends dropped
+    low, high = np.minimum(src, dst), np.maximum(src, dst)
+    _, first = np.unique(low * n + high, return_index=True)
+    return low[first], high[first], weight[first]
+
+
+# =============================================================================
+# 🌈 Spectral Layout (NumPy subspace iteration)
+# =============================================================================
+def spectral_layout(num_nodes, src, dst, weight, init=None, seed=42):
+    """
+    2-D spectral embedding of a sparse weighted graph.
+
+    Coordinates are the second and third eigenvectors of the normalized
+    adjacency D^-1/2 A D^-1/2, found by subspace iteration with sparse
+    edge-list products (O(edges) per iteration, no dense N x N matrix and
+    no SciPy). A weak uniform term tau/N (tau = mean degree) regularizes
+    the graph so disconnected similarity clusters do not collapse onto
+    single points.
+
+    Parameters
+    ----------
+    num_nodes : int
+    src, dst, weight : np.ndarray
+        Undirected edges (each listed once).
+    init : np.ndarray, optional
+        Previous (num_nodes, 2) layout; warm-starts the iteration.
+
+    Returns
+    -------
+    np.ndarray
+        (num_nodes, 2) positions scaled to [-1, 1].
+    """
+    n = int(num_nodes)
+    if n <= 2:
+        return np.column_stack([np.linspace(-1.0, 1.0, n), np.zeros(n)])
+
+    rows = np.concatenate([src, dst])
+    cols = np.concatenate([dst, src])
+    w = np.concatenate([weight, weight]).astype(np.float64)
+    degree = np.bincount(rows, weights=w, minlength=n)
+    tau = max(degree.mean(), 1e-12)
+    degree += tau
+    inv_sqrt = 1.0 / np.sqrt(degree)
+    trivial = np.sqrt(degree)
+    trivial /= np.linalg.norm(trivial)
+
+    def apply(X):
+        # Lazy walk (I + D^-1/2 A_tau D^-1/2) / 2: spectrum in [0, 1]
+        Y = X * inv_sqrt[:, None]
+        AY = np.empty_like(Y)
+        for c in range(Y.shape[1]):
+            AY[:, c] = np.bincount(rows, weights=w * Y[cols, c], minlength=n)
+        AY += (tau / n) * Y.sum(axis=0)
+        return 0.5 * (X + AY * inv_sqrt[:, None])
+
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n, SPECTRAL_BLOCK))
+    if init is not None:
+        X[:, :2] = np.asarray(init, dtype=np.float64) * trivial[:, None]
+
+    ritz = None
+    for it in range(SPECTRAL_MAX_ITER):
+        X -= trivial[:, None] * (trivial @ X)
+        X, _ = np.linalg.qr(apply(X))
+        if it % 10 == 9:
+            H = X.T @ apply(X)
+            values = np.linalg.eigvalsh(0.5 * (H + H.T))[::-1][:2]
+            if ritz is not None and np.max(np.abs(values - ritz)) < SPECTRAL_TOL:
+                break
+            ritz = values
+
+    # Rayleigh–Ritz: order the subspace, keep the two leading directions
+    X -= trivial[:, None] * (trivial @ X)
+    H = X.T @ apply(X)
+    _, vectors = np.linalg.eigh(0.5 * (H + H.T))
+    pos = (X @ vectors[:, ::-1][:, :2]) * inv_sqrt[:, None]
+    return _normalize(pos)
+
+
+def _normalize(pos):
+    pos = pos - pos.mean(axis=0)
+    scale = np.abs(pos).max()
+    return pos / scale if scale > 0 else pos
+
+
+# =============================================================================
+# 💾 Cached, Warm-Started Layouts
+# =============================================================================
+def layout_key(agents):
+    """Cache key of an agent set (order-sensitive ids)."""
+    ids = np.ascontiguousarray(np.asarray(agents, dtype=np.int64))
+    return hashlib.blake2b(memoryview(ids).cast("B"), digest_size=12).hexdigest()
+
+
+def edges_key(src, dst, weight):
+    """Digest of a weighted edge list (order-sensitive)."""
+    h = hashlib.blake2b(digest_size=12)
+    for values, dtype in ((src, np.int64), (dst, np.int64), (weight, np.float64)):
+        h.update(memoryview(np.ascontiguousarray(np.asarray(values, dtype=dtype))).cast("B"))
+    return h.hexdigest()
+
+
+class LayoutCache:
+    """
+    Node positions per agent set, kept in memory and under `directory`.
+
+    Each entry also records the digest of the edge list it was computed
+    for. Drawing the same graph again returns the stored positions as
+    they are; a changed graph over the same agents starts from them, so
+    it only needs a short refinement and the picture stays stable from
+    figure to figure.
+    """
+
+    def __init__(self, directory=LAYOUT_CACHE_DIR):
+        self.directory = directory
+        self._memory = {}
+
+    def load(self, agents):
+        """(positions, edges digest) stored for `agents`, or (None, None)."""
+        key = layout_key(agents)
+        entry = self._memory.get(key)
+        if entry is None:
+            try:
+                with np.load(os.path.join(self.directory, f"{key}.npz")) as data:
+                    entry = (data["pos"], str(data["edges"]))
+            except (OSError, ValueError, KeyError):
+                return None, None
+        pos, edges = entry
+        return (pos, edges) if pos.shape == (len(agents), 2) else (None, None)
+
+    def store(self, agents, pos, edges):
+        key = layout_key(agents)
+        self._memory[key] = (pos, edges)
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{key}.npz")
+        temp_path = path + ".tmp.npz"
+        np.savez(temp_path, pos=pos, edges=np.array(edges))
+        os.replace(temp_path, path)
+
+    # -------------------------------------------------------------------------
+    # 🧭 Layout
+    # -------------------------------------------------------------------------
+    def layout(self, agents, src, dst, weight):
+        """
+        Positions (len(agents), 2) for the graph given by edge positions
+        into `agents`: spring layout up to SPRING_MAX_NODES, spectral above.
+        """
+        n = len(agents)
+        edges = edges_key(src, dst, weight)
+        init, cached_edges = self.load(agents)
+        if init is not None and cached_edges == edges:
+            return init
+
+        if n <= SPRING_MAX_NODES:
+            G = nx.Graph()
+            G.add_nodes_from(range(n))
+            G.add_weighted_edges_from(zip(src.tolist(), dst.tolist(), np.asarray(weight).tolist()))
+            start = None if init is None else {i: init[i] for i in range(n)}
+            iterations = SPRING_ITERATIONS if init is None else SPRING_WARM_ITERATIONS
+            layout = nx.spring_layout(G, pos=start, iterations=iterations, seed=42)
+            pos = _normalize(np.array([layout[i] for i in range(n)]))
+        else:
+            pos = spectral_layout(n, src, dst, weight, init=init)
+
+        self.store(agents, pos, edges)
+        return pos
@@ -0,0 +1,174 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Run Result Cache
+# File         : result_cache.py
+# Author       : AHMED ZARAI
+# Purpose      : Config-hash keyed, size-bounded LRU store of metric series
+# =============================================================================
+
+import os
+import json
+import hashlib
+import zipfile
+import numpy as np
+
+from config.loader import result_config
+
+# -----------------------------------------------------------------------------
+# ⚙️ Cache Location & Budget
+# -----------------------------------------------------------------------------
+RESULT_CACHE_DIR = os.path.join("results", "cache")
+RESULT_CACHE_BYTES = 2 << 30    # Evict least recently used entries above 2 GiB
+RESULT_CACHE_VERSION = 1        # Bump when the stored format changes
+
+# Sources whose code determines a run's results (the code-version salt):
+# every package the trainer imports its dynamics and metrics from
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SALT_PACKAGES = ("config", "environment", "simulation", "metrics")
+
+_salt = None
+
+
+# =============================================================================
+# 🔑 Run Keys
+# =============================================================================
+def source_hash(base_dir=BASE_DIR, packages=SALT_PACKAGES):
+    """
+    Hash of every .py file directly under `base_dir/<package>`.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(RESULT_CACHE_VERSION).encode())
+    for package in packages:
+        folder = os.path.join(base_dir, package)
+        for name in sorted(os.listdir(folder)):
+            if name.endswith(".py"):
+                h.update(f"{package}/{name}".encode())
+                with open(os.path.join(folder, name), "rb") as f:
+                    h.update(f.read())
+    return h.hexdigest()
+
+
+def code_salt():
+    """
+    source_hash of SALT_PACKAGES (computed once per process), so editing
+    the environment, the simulation or the metrics invalidates cached
+    results.
+    """
+    global _salt
+    if _salt is None:
+        _salt = source_hash()
+    return _salt
+
+
+def config_hash(config):
+    """
+    Canonical hash of the keys of a resolved AppConfig that determine a
+    run's results (see config.loader.result_config): pacing, logging and
+    the sweep section never change the key.
+    """
+    resolved = result_config(config)
+    canonical = json.dumps(resolved, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def run_key(config, steps, seed=None):
+    """
+    Cache key of one headless run.
+
+    Parameters
+    ----------
+    config : AppConfig
+        Fully resolved configuration (overrides applied).
+    steps : int
+        Run length.
+    seed : int or np.random.SeedSequence, optional
+        Run seed as passed to Trainer (None = environment.seed).
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        seed = [seed.entropy, list(seed.spawn_key)]
+    run = json.dumps([config_hash(config), int(steps), seed, code_salt()], separators=(",", ":"))
+    return hashlib.blake2b(run.encode(), digest_size=20).hexdigest()
+
+
+# =============================================================================
+# 🔎 ResultCache Class
+# =============================================================================
+class ResultCache:
+    """
+    One `<key>.npz` of metric columns per run under `directory`.
+
+    A hit refreshes the entry's modification time, which is the LRU order:
+    every `put` evicts the least recently used entries until the cache
+    fits in `max_bytes`. Writes are temp-then-rename, so concurrent
+    processes never read a partial entry.
+
+    Attributes
+    ----------
+    hits, misses : int
+        Lookups answered / not answered by this instance.
+    """
+
+    def __init__(self, directory=RESULT_CACHE_DIR, max_bytes=RESULT_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    # -------------------------------------------------------------------------
+    # 📥 Lookup
+    # -------------------------------------------------------------------------
+    def get(self, key):
+        """
+        Cached series (column → np.ndarray) for `key`, or None. A
+        truncated or corrupt entry counts as a miss and is removed.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                series = {name: data[name] for name in data.files}
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            self.misses += 1
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return None
+        self.hits += 1
+        return series
+
+    # -------------------------------------------------------------------------
+    # 📤 Store & Evict
+    # -------------------------------------------------------------------------
+    def put(self, key, series):
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(temp_path, **series)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the total fits `max_bytes`.
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz") and ".tmp" not in entry.name:
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
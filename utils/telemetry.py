@@ -0,0 +1,338 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Step-Loop Telemetry
+# File         : telemetry.py
+# Author       : AHMED ZARAI
+# Purpose      : Cross-process stage histograms & counters, Prometheus export
+# =============================================================================
+
+import os
+import time
+import atexit
+import zlib
+import bisect
+import logging
+from multiprocessing import shared_memory, resource_tracker
+
+from utils.logger import LOGGER_NAME
+
+# -----------------------------------------------------------------------------
+# ⚙️ Switch & Segment
+# -----------------------------------------------------------------------------
+# EMERGENCELAB_TELEMETRY=0 replaces every instrument by a no-op object and
+# never creates the shared segment
+TELEMETRY_ENV = "EMERGENCELAB_TELEMETRY"
+TELEMETRY_NAME = os.environ.get("EMERGENCELAB_TELEMETRY_SHM", "emergencelab_telemetry")
+TELEMETRY_MAGIC = 0x4D4C4C45  # "ELLM"
+TELEMETRY_VERSION = 1
+METRIC_PREFIX = "emergencelab"
+
+# -----------------------------------------------------------------------------
+# 📐 Metric Registry (fixed, so every process computes the same layout)
+# -----------------------------------------------------------------------------
+# Upper bounds (seconds) of the latency buckets; a final +Inf bucket follows
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+# Stage → process that times it (each slot has exactly one writer process)
+STAGES = {
+    "sim_step": "trainer",       # act → field step → belief update
+    "metrics": "trainer",        # entropy, consensus KL, MI, connectivity
+    "record": "trainer",         # metric columns + trajectory store
+    "ring_write": "trainer",     # shared-memory frame ring
+    "json_encode": "trainer",    # dashboard JSON serialization
+    "file_replace": "trainer",   # temp write + os.replace
+    "watch_poll": "server",      # one watch_json pass (excluding its sleep)
+    "json_load": "server",       # reading the dashboard JSON file
+    "frame_encode": "server",    # ring frame → JSON dict / binary packet
+    "emit": "server",            # Socket.IO emit in the broadcaster
+}
+
+COUNTERS = {
+    "steps_total": "Simulation steps executed",
+    "step_overruns_total": "Steps that finished after their scheduled deadline",
+    "frames_published_total": "Frames handed to the dashboard transport by the trainer",
+    "frames_emitted_total": "Frames emitted to dashboard clients",
+    "frames_dropped_total": "Frames never emitted (ring overruns, torn reads, coalesced per client)",
+    "bytes_written_total": "Dashboard JSON bytes written by the trainer",
+    "dashboard_frames_dropped_total": "JSON frames superseded before the trainer's writer thread stored them",
+    "bytes_emitted_total": "Payload bytes handed to Socket.IO",
+}
+
+GAUGES = {
+    "steps_per_second": "Simulation throughput over the last rate window",
+    "step_lag_seconds": "Lateness of the most recent overrun step",
+    "connected_clients": "Connected dashboard clients",
+}
+
+# Counter → gauge holding its per-second rate, refreshed every RATE_WINDOW
+RATES = {"steps_total": "steps_per_second"}
+RATE_WINDOW = 1.0
+
+HEADER_SLOTS = 4    # magic, version, layout checksum, reserved
+_NUM_BUCKETS = len(LATENCY_BUCKETS)
+
+
+def _layout():
+    """
+    Slot offsets (float64 units) of every metric after the header.
+    """
+    offsets, cursor = {}, HEADER_SLOTS
+    for stage in STAGES:
+        offsets[stage] = cursor
+        cursor += len(LATENCY_BUCKETS) + 3  # buckets, +Inf, sum, count
+    for name in (*COUNTERS, *GAUGES):
+        offsets[name] = cursor
+        cursor += 1
+    return offsets, cursor
+
+
+def _checksum():
+    spec = repr((LATENCY_BUCKETS, tuple(STAGES.items()), tuple(COUNTERS), tuple(GAUGES)))
+    return float(zlib.crc32(spec.encode()))
+
+
+# =============================================================================
+# 🔎 Telemetry Class
+# =============================================================================
+class Telemetry:
+    """
+    Fixed-bucket latency histograms, counters and gauges in one shared
+    memory segment, readable and writable from every EmergenceLab process.
+
+    Updates are plain float adds on a memoryview (no locks): each slot has
+    a single writer process (see STAGES), and readers accept that a scrape
+    may straddle an in-progress update. The segment is not tied to any
+    process lifetime, so counters survive trainer restarts; `open` checks
+    its layout and replaces it when the metric registry changed.
+
+    Usage
+    -----
+    >>> t = telemetry.clock()
+    >>> ...                                # stage A
+    >>> t = telemetry.lap("sim_step", t)   # records A, restarts the clock
+    """
+
+    enabled = True
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, shm):
+        self._shm = shm
+        self._slots = shm.buf.cast("d")
+        self._offsets, _ = _layout()
+        self._rate_marks = {}
+
+    @classmethod
+    def open(cls, name=TELEMETRY_NAME):
+        """
+        Attach to the segment, creating (or replacing a mismatched) one.
+        """
+        _, size = _layout()
+        try:
+            shm = _shared_memory(name, create=True, size=size * 8)
+        except FileExistsError:
+            shm = _shared_memory(name)
+            slots = shm.buf.cast("d")
+            valid = tuple(slots[:3]) == (TELEMETRY_MAGIC, TELEMETRY_VERSION, _checksum())
+            slots.release()
+            if valid and shm.size >= size * 8:
+                return cls(shm)
+
+            # Left behind by an incompatible build: replace it
+            shm.close()
+            _unlink(name)
+            shm = _shared_memory(name, create=True, size=size * 8)
+
+        slots = shm.buf.cast("d")
+        slots[0], slots[1], slots[2] = float(TELEMETRY_MAGIC), float(TELEMETRY_VERSION), _checksum()
+        slots.release()
+        return cls(shm)
+
+    # -------------------------------------------------------------------------
+    # ⏱️ Instruments
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def clock():
+        return time.perf_counter()
+
+    def observe(self, stage, seconds):
+        base = self._offsets[stage]
+        slots = self._slots
+        slots[base + bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1.0
+        slots[base + _NUM_BUCKETS + 1] += seconds
+        slots[base + _NUM_BUCKETS + 2] += 1.0
+
+    def lap(self, stage, since):
+        """
+        Record the time elapsed since `since` under `stage`; return now.
+        """
+        now = time.perf_counter()
+        self.observe(stage, now - since)
+        return now
+
+    def count(self, name, amount=1):
+        self._slots[self._offsets[name]] += amount
+        gauge = RATES.get(name)
+        if gauge is not None:
+            self._update_rate(name, gauge)
+
+    def set(self, name, value):
+        self._slots[self._offsets[name]] = value
+
+    def _update_rate(self, counter, gauge):
+        now = time.monotonic()
+        value = self._slots[self._offsets[counter]]
+        mark = self._rate_marks.get(counter)
+        if mark is None:
+            self._rate_marks[counter] = (now, value)
+        elif now - mark[0] >= RATE_WINDOW:
+            self.set(gauge, (value - mark[1]) / (now - mark[0]))
+            self._rate_marks[counter] = (now, value)
+
+    # -------------------------------------------------------------------------
+    # 📤 Export
+    # -------------------------------------------------------------------------
+    def snapshot(self):
+        """
+        Current values: {"stages": {stage: {"buckets", "sum", "count"}},
+        "counters": {...}, "gauges": {...}} (bucket counts not cumulative).
+        """
+        slots, width = self._slots, len(LATENCY_BUCKETS)
+        stages = {}
+        for stage in STAGES:
+            base = self._offsets[stage]
+            stages[stage] = {
+                "buckets": list(slots[base:base + width + 1]),
+                "sum": slots[base + width + 1],
+                "count": slots[base + width + 2],
+            }
+        return {
+            "stages": stages,
+            "counters": {name: slots[self._offsets[name]] for name in COUNTERS},
+            "gauges": {name: slots[self._offsets[name]] for name in GAUGES},
+        }
+
+    def render(self):
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        snap = self.snapshot()
+        family = f"{METRIC_PREFIX}_stage_seconds"
+        lines = [
+            f"# HELP {family} Time spent in each stage of the step / publish loop",
+            f"# TYPE {family} histogram",
+        ]
+        for stage, h in snap["stages"].items():
+            labels = f'process="{STAGES[stage]}",stage="{stage}"'
+            cumulative = 0.0
+            for bound, n in zip((*LATENCY_BUCKETS, "+Inf"), h["buckets"]):
+                cumulative += n
+                lines.append(f'{family}_bucket{{{labels},le="{bound}"}} {_num(cumulative)}')
+            lines.append(f"{family}_sum{{{labels}}} {h['sum']!r}")
+            lines.append(f"{family}_count{{{labels}}} {_num(h['count'])}")
+
+        for kind, registry, values in (("counter", COUNTERS, snap["counters"]), ("gauge", GAUGES, snap["gauges"])):
+            for name, text in registry.items():
+                metric = f"{METRIC_PREFIX}_{name}"
+                lines += [f"# HELP {metric} {text}", f"# TYPE {metric} {kind}", f"{metric} {_num(values[name])}"]
+        return "\n".join(lines) + "\n"
+
+    # -------------------------------------------------------------------------
+    # ♻️ Teardown
+    # -------------------------------------------------------------------------
+    def close(self):
+        """Release this process' mapping (the segment itself persists)."""
+        self._slots.release()
+        self._shm.close()
+
+
+# =============================================================================
+# 🔕 Disabled Telemetry
+# =============================================================================
+class NullTelemetry:
+    """
+    Drop-in replacement used when telemetry is switched off: every
+    instrument is an empty method and no clock is ever read.
+    """
+
+    enabled = False
+
+    @staticmethod
+    def clock():
+        return 0.0
+
+    def observe(self, stage, seconds):
+        pass
+
+    def lap(self, stage, since):
+        return 0.0
+
+    def count(self, name, amount=1):
+        pass
+
+    def set(self, name, value):
+        pass
+
+    def render(self):
+        return ""
+
+    def close(self):
+        pass
+
+
+NULL_TELEMETRY = NullTelemetry()
+_telemetry = None
+
+
+def get_telemetry():
+    """
+    Process-wide telemetry handle (created on first use).
+
+    Returns NULL_TELEMETRY when EMERGENCELAB_TELEMETRY is "0"/"false"/"off"
+    or the shared segment cannot be created.
+    """
+    global _telemetry
+    if _telemetry is None:
+        if os.environ.get(TELEMETRY_ENV, "1").lower() in ("0", "false", "off", "no"):
+            _telemetry = NULL_TELEMETRY
+        else:
+            try:
+                _telemetry = Telemetry.open()
+                atexit.register(_telemetry.close)
+            except (OSError, ValueError) as e:
+                logging.getLogger(LOGGER_NAME).warning(f"⚠️ Telemetry unavailable ({e}); continuing without it")
+                _telemetry = NULL_TELEMETRY
+    return _telemetry
+
+
+def _shared_memory(name, create=False, size=0):
+    """
+    Open the segment without resource-tracker registration, so no process
+    exit (or a tracker shared with spawned children) ever unlinks it.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:
+        # Python < 3.13: register, then immediately forget it
+        shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _unlink(name):
+    shm = _shared_memory(name)
+    shm.close()
+    try:
+        if getattr(shm, "_track", True):
+            # Python < 3.13: unlink() unregisters, so register first
+            resource_tracker.register(shm._name, "shared_memory")
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _num(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
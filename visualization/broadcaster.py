@@ -0,0 +1,252 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Per-Client Dashboard Broadcaster
+# File         : broadcaster.py
+# Author       : AHMED ZARAI
+# Purpose      : Latest-wins frame delivery with per-client backpressure
+# =============================================================================
+
+import json
+import math
+import time
+from functools import partial
+
+from utils.telemetry import NULL_TELEMETRY
+
+# -----------------------------------------------------------------------------
+# ⚙️ Delivery Policy
+# -----------------------------------------------------------------------------
+DEFAULT_MAX_HZ = 30.0
+MIN_HZ = 0.5
+MAX_HZ = 120.0
+ACK_TIMEOUT = 1.0      # Re-send after this long without a client ack
+TICK = 0.005           # Sender loop period (200Hz)
+
+
+# =============================================================================
+# 🔎 Frame Merging
+# =============================================================================
+def merge_packets(older, newer):
+    """
+    Merge two binary packets (see frame_codec.py) into one that brings a
+    client from `older`'s base straight to `newer`'s state.
+    """
+    if older is None or newer["key"]:
+        return newer
+
+    merged = dict(newer)
+    merged["base"] = older["base"]
+    merged["key"] = older["key"]
+    merged["scalars"] = {**older["scalars"], **newer["scalars"]}
+    merged["blocks"] = {**older["blocks"], **newer["blocks"]}
+    if "agents" not in newer and "agents" in older:
+        merged["agents"] = older["agents"]
+    return merged
+
+
+def frame_nbytes(frame):
+    """
+    Payload size of one emitted frame: the raw block bytes of a binary
+    packet, or the compact JSON encoding of a JSON frame (computed once
+    per published frame, see Broadcaster.publish).
+    """
+    if "blocks" in frame and "key" in frame:
+        return sum(len(block["data"]) for block in frame["blocks"].values())
+    return len(json.dumps(frame, separators=(",", ":")))
+
+
+# =============================================================================
+# 🔎 ClientState Class
+# =============================================================================
+class ClientState:
+    """
+    Delivery state and lag counters for one connected dashboard.
+    """
+
+    def __init__(self, sid, protocol="json", max_hz=DEFAULT_MAX_HZ):
+        self.sid = sid
+        self.protocol = protocol
+        self.max_hz = max_hz
+        self.pending = None
+        self.pending_seq = 0
+        self.pending_nbytes = 0
+        self.needs_keyframe = protocol == "binary"
+
+        self.in_flight_since = None
+        self.last_sent = 0.0
+
+        self.delivered = 0
+        self.coalesced = 0
+        self.last_delivered_seq = 0
+        self.rtt = 0.0
+
+    def stats(self, latest_seq):
+        """JSON-serializable lag counters."""
+        return {
+            "sid": self.sid,
+            "protocol": self.protocol,
+            "max_hz": self.max_hz,
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "frames_behind": max(0, latest_seq - self.last_delivered_seq),
+            "in_flight": self.in_flight_since is not None,
+            "rtt_ms": round(self.rtt * 1000.0, 3),
+        }
+
+
+# =============================================================================
+# 🔎 Broadcaster Class
+# =============================================================================
+class Broadcaster:
+    """
+    Decouples the publish rate from each client's consumption rate.
+
+    `publish` only replaces (JSON) or merges (binary deltas) the single
+    pending frame per client; the sender loop delivers it once the client
+    acknowledged the previous frame and its requested max rate allows.
+    Slow viewers therefore skip frames instead of queueing them.
+
+    Attributes
+    ----------
+    clients : dict
+        sid → ClientState.
+    seq : int
+        Number of frames published so far.
+    telemetry : Telemetry or NullTelemetry
+        Emit timings and frame/byte counters (see utils/telemetry.py).
+    """
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, socketio, telemetry=NULL_TELEMETRY):
+        self.socketio = socketio
+        self.clients = {}
+        self.seq = 0
+        self.telemetry = telemetry
+
+    # -------------------------------------------------------------------------
+    # 👥 Client Registry
+    # -------------------------------------------------------------------------
+    def add(self, sid):
+        self.clients[sid] = ClientState(sid)
+        self.telemetry.set("connected_clients", len(self.clients))
+
+    def remove(self, sid):
+        self.clients.pop(sid, None)
+        self.telemetry.set("connected_clients", len(self.clients))
+
+    def set_protocol(self, sid, protocol):
+        client = self.clients.get(sid)
+        if client is None:
+            return
+        client.protocol = protocol
+        client.pending = None
+        client.needs_keyframe = protocol == "binary"
+
+    def set_max_hz(self, sid, max_hz):
+        """
+        Clamp a validated positive rate to [MIN_HZ, MAX_HZ]; returns False
+        (leaving the client unchanged) for anything that is not a finite
+        positive number.
+        """
+        if isinstance(max_hz, bool) or not isinstance(max_hz, (int, float)):
+            return False
+        if not math.isfinite(max_hz) or max_hz <= 0:
+            return False
+        client = self.clients.get(sid)
+        if client is not None:
+            client.max_hz = min(MAX_HZ, max(MIN_HZ, float(max_hz)))
+        return True
+
+    def wants(self, protocol):
+        """True if any client currently uses `protocol`."""
+        return any(c.protocol == protocol for c in self.clients.values())
+
+    def stats(self):
+        return [c.stats(self.seq) for c in list(self.clients.values())]
+
+    # -------------------------------------------------------------------------
+    # 📥 Publish (latest-wins)
+    # -------------------------------------------------------------------------
+    def publish(self, data=None, packet=None, data_nbytes=None):
+        """
+        Offer a frame to every client: `data` for JSON clients, `packet`
+        for binary ones. Never blocks and never queues more than one frame.
+
+        `data_nbytes` is the JSON frame's encoded size when the caller
+        already knows it (e.g. the file it was read from); otherwise it is
+        measured here once, not per client, and only with telemetry on.
+        """
+        self.seq += 1
+        if data is not None and data_nbytes is None and self.telemetry.enabled and self.wants("json"):
+            data_nbytes = frame_nbytes(data)
+
+        for client in list(self.clients.values()):
+            if client.protocol == "binary":
+                if packet is None:
+                    continue
+                if client.needs_keyframe:
+                    if not packet["key"]:
+                        continue
+                    client.needs_keyframe = False
+                frame = merge_packets(client.pending, packet)
+            else:
+                if data is None:
+                    continue
+                frame = data
+                client.pending_nbytes = data_nbytes or 0
+
+            if client.pending is not None:
+                client.coalesced += 1
+                self.telemetry.count("frames_dropped_total")
+            client.pending = frame
+            client.pending_seq = self.seq
+
+    # -------------------------------------------------------------------------
+    # 📤 Sender Loop
+    # -------------------------------------------------------------------------
+    def run(self):
+        """
+        Background task: deliver pending frames as clients become ready.
+        """
+        while True:
+            self.flush()
+            self.socketio.sleep(TICK)
+
+    def flush(self):
+        now = time.monotonic()
+        for client in list(self.clients.values()):
+            if client.pending is None:
+                continue
+            if client.in_flight_since is not None and now - client.in_flight_since < ACK_TIMEOUT:
+                continue
+            if now - client.last_sent < 1.0 / client.max_hz:
+                continue
+
+            frame, seq, nbytes = client.pending, client.pending_seq, client.pending_nbytes
+            client.pending = None
+            client.in_flight_since = now
+            client.last_sent = now
+
+            event = "frame" if client.protocol == "binary" else "update"
+            t = self.telemetry.clock()
+            self.socketio.emit(
+                event, frame, to=client.sid,
+                callback=partial(self._on_ack, client.sid, seq, now),
+            )
+            self.telemetry.lap("emit", t)
+            self.telemetry.count("frames_emitted_total")
+            if self.telemetry.enabled:
+                if client.protocol == "binary":
+                    nbytes = frame_nbytes(frame)
+                self.telemetry.count("bytes_emitted_total", nbytes)
+
+    def _on_ack(self, sid, seq, sent_at, *args):
+        client = self.clients.get(sid)
+        if client is None:
+            return
+        client.in_flight_since = None
+        client.delivered += 1
+        client.last_delivered_seq = max(client.last_delivered_seq, seq)
+        rtt = time.monotonic() - sent_at
+        client.rtt = rtt if client.delivered == 1 else 0.9 * client.rtt + 0.1 * rtt
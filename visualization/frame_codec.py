@@ -0,0 +1,119 @@
+# =============================================================================
+# 🛡️ EmergenceLab v5 — Binary Dashboard Frame Codec
+# File         : frame_codec.py
+# Author       : AHMED ZARAI
+# Purpose      : Encode dashboard frames as packed float32 keyframes + deltas
+# =============================================================================
+
+import numpy as np
+
+# Full frame at least this often so late joiners / lost deltas recover quickly
+KEYFRAME_INTERVAL = 50
+
+
+# =============================================================================
+# 🔎 FrameEncoder Class
+# =============================================================================
+class FrameEncoder:
+    """
+    Stateful encoder for the opt-in binary dashboard protocol.
+
+    Each packet is a small dict whose array blocks are raw little-endian
+    float32 bytes, so Socket.IO ships them as binary attachments:
+
+        {"v": 1, "seq": n, "base": n - 1 or None, "key": bool, "step": int,
+         "scalars": {name: value}, "blocks": {name: {"shape": [...], "data": b"..."}},
+         "agents": [...]}
+
+    Keyframes (base None) carry everything; delta frames carry only scalars
+    and blocks that changed since frame `base`. Encoding happens once per
+    frame regardless of the number of subscribers.
+
+    Attributes
+    ----------
+    keyframe_interval : int
+        Maximum number of frames between keyframes.
+    seq : int
+        Sequence number of the last encoded packet.
+    """
+
+    # -------------------------------------------------------------------------
+    # 🧰 Initialization
+    # -------------------------------------------------------------------------
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.seq = 0
+        self.force_keyframe()
+
+    def force_keyframe(self):
+        """
+        Make the next packet a keyframe (new subscriber, lost frame, ...).
+        """
+        self._since_key = None
+        self._scalars = {}
+        self._blocks = {}
+        self._agents = None
+
+    # -------------------------------------------------------------------------
+    # 📦 Encode Frame
+    # -------------------------------------------------------------------------
+    def encode(self, step, scalars, blocks, agents):
+        """
+        Encode one frame relative to the previously encoded one.
+
+        Parameters
+        ----------
+        step : int
+            Simulation step of the frame.
+        scalars : dict
+            JSON-serializable scalar values (entropy, kl, ...).
+        blocks : dict
+            Name → np.ndarray (e.g. beliefs, kl_matrix).
+        agents : list
+            Agent labels, sent on keyframes and whenever they change.
+
+        Returns
+        -------
+        dict
+            Packet ready for `socketio.emit`.
+        """
+        key = self._since_key is None or self._since_key + 1 >= self.keyframe_interval
+        if key:
+            self._scalars, self._blocks, self._agents = {}, {}, None
+
+        packet = {
+            "v": 1,
+            "seq": self.seq + 1,
+            "base": None if key else self.seq,
+            "key": key,
+            "step": int(step),
+            "scalars": {},
+            "blocks": {},
+        }
+
+        # ---------------------------------------------------------------------
+        # Changed scalars only
+        # ---------------------------------------------------------------------
+        for name, value in scalars.items():
+            if key or self._scalars.get(name) != value:
+                packet["scalars"][name] = value
+                self._scalars[name] = value
+
+        # ---------------------------------------------------------------------
+        # Changed blocks only, as packed float32
+        # ---------------------------------------------------------------------
+        for name, array in blocks.items():
+            array = np.ascontiguousarray(array, dtype="<f4")
+            previous = self._blocks.get(name)
+            if previous is not None and np.array_equal(previous, array):
+                continue
+            packet["blocks"][name] = {"shape": list(array.shape), "data": array.tobytes()}
+            self._blocks[name] = array.copy()
+
+        if agents != self._agents:
+            packet["agents"] = list(agents)
+            self._agents = list(agents)
+
+        self.seq += 1
+        self._since_key = 0 if key else self._since_key + 1
+        return packet
@@ -8,10 +8,20 @@
 import os
 import json
 import time
-from flask import Flask, render_template
+import logging
+import numpy as np
+from flask import Flask, Response, jsonify, render_template, request
 from flask_socketio import SocketIO
 
+from metrics.trajectory import TrajectoryStore
+from utils.frame_ring import FrameRing
+from utils.logger import LOGGER_NAME
+from utils.telemetry import get_telemetry
+from visualization.broadcaster import Broadcaster
+from visualization.frame_codec import FrameEncoder
+
 app = Flask(__name__, template_folder="templates", static_folder="static")
+logger = logging.getLogger(LOGGER_NAME)
 
 socketio = SocketIO(
     app,
@@ -21,25 +31,61 @@ socketio = SocketIO(
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(BASE_DIR, "results", "live_dashboard.json")
+TRAJECTORY_PATH = os.path.join(BASE_DIR, "results", "trajectory.bin")
+
+# "shm" reads frames from the trainer's shared-memory ring and only polls the
+# JSON file while no ring is available; "json" always polls the file
+TRANSPORT = os.environ.get("EMERGENCELAB_TRANSPORT", "shm")
+RING_POLL_INTERVAL = 0.01
+JSON_POLL_INTERVAL = 0.05
+
+# -----------------------------------------------------------------------------
+# 📦 Wire Protocols
+# -----------------------------------------------------------------------------
+# Clients start on the JSON "update" event; emitting
+# `subscribe {"protocol": "binary"}` moves them to packed float32 "frame"
+# events (keyframes + deltas, see frame_codec.py). Delivery goes through the
+# broadcaster, which keeps only the latest frame per client.
+encoder = FrameEncoder()
+telemetry = get_telemetry()
+broadcaster = Broadcaster(socketio, telemetry)
+telemetry.set("connected_clients", 0)  # the segment outlives server restarts
 
 def watch_json():
     """
     RESILIENT WATCHER: Synchronized with the Atomic Trainer.
     Handles the micro-second 'file rotation' without crashing.
+    Prefers the shared-memory frame ring; the JSON file is the fallback.
     """
     last_mtime = 0
+    ring = None
     os.makedirs(os.path.dirname(DATA_PATH), exist_ok=True)
     
     while True:
+        interval = JSON_POLL_INTERVAL
+        t = telemetry.clock()
         try:
-            if os.path.exists(DATA_PATH):
+            if ring is None and TRANSPORT == "shm":
+                ring = FrameRing.try_attach()
+
+            if ring is not None:
+                interval = RING_POLL_INTERVAL
+                _emit_ring_frames(ring)
+                if ring.is_stale():
+                    # Trainer restarted or exited; re-attach on the next pass
+                    ring.close()
+                    ring = None
+
+            elif os.path.exists(DATA_PATH):
                 mtime = os.path.getmtime(DATA_PATH)
                 if mtime > last_mtime:
                     with open(DATA_PATH, "r") as f:
                         # json.load is direct and memory-safe
+                        t_load = telemetry.clock()
                         data = json.load(f)
+                        telemetry.lap("json_load", t_load)
                         if data:
-                            socketio.emit("update", data)
+                            _emit_json_frame(data, nbytes=f.tell())
                     last_mtime = mtime
 
         except (json.JSONDecodeError, PermissionError, FileNotFoundError):
@@ -47,8 +93,95 @@ def watch_json():
             pass
         except Exception as e:
             print(f"⚠️ JSON update error: {e}")
-        
-        socketio.sleep(0.05) # 20Hz refresh for smooth physics
+
+        telemetry.lap("watch_poll", t)
+        socketio.sleep(interval)
+
+def _emit_ring_frames(ring):
+    """
+    Emit every frame published since the last poll, in order.
+    Frames the writer overwrote while being encoded are skipped.
+    """
+    dropped = ring.dropped
+    frames = ring.read_new()
+    if ring.dropped > dropped:
+        telemetry.count("frames_dropped_total", ring.dropped - dropped)
+
+    for frame in frames:
+        t = telemetry.clock()
+        data = frame.to_dict() if broadcaster.wants("json") else None
+
+        packet = None
+        if broadcaster.wants("binary"):
+            packet = encoder.encode(
+                frame.step, frame.scalar_dict(),
+                {"beliefs": frame.beliefs, "kl_matrix": frame.kl_matrix},
+                frame.agents,
+            )
+
+        telemetry.lap("frame_encode", t)
+
+        if not frame.valid():
+            if packet is not None:
+                # The encoder already diffed against torn data
+                encoder.force_keyframe()
+            telemetry.count("frames_dropped_total")
+            continue
+
+        broadcaster.publish(data, packet)
+
+def _emit_json_frame(data, nbytes=None):
+    """
+    Emit a frame read from the JSON file to both protocols; `nbytes` is
+    the file's size, reused as the JSON frame's byte count.
+    """
+    packet = None
+    if broadcaster.wants("binary"):
+        t = telemetry.clock()
+        beliefs = data.get("beliefs", [])
+        scalars = {k: v for k, v in data.items() if k not in ("step", "beliefs", "kl_matrix")}
+        packet = encoder.encode(
+            data.get("step", 0), scalars,
+            {
+                "beliefs": np.asarray([b["belief"] for b in beliefs], dtype=np.float32),
+                "kl_matrix": np.asarray(data.get("kl_matrix", []), dtype=np.float32),
+            },
+            [b["agent"] for b in beliefs],
+        )
+        telemetry.lap("frame_encode", t)
+    broadcaster.publish(data, packet, data_nbytes=nbytes)
+
+# =============================================================================
+# 🔌 Socket.IO Events
+# =============================================================================
+@socketio.on("connect")
+def on_connect():
+    """New clients receive JSON updates until they subscribe otherwise."""
+    broadcaster.add(request.sid)
+
+@socketio.on("disconnect")
+def on_disconnect():
+    broadcaster.remove(request.sid)
+
+@socketio.on("subscribe")
+def on_subscribe(data):
+    """
+    Switch wire protocol: {"protocol": "binary"} or {"protocol": "json"}.
+    Re-subscribing to binary also requests a fresh keyframe.
+    """
+    protocol = "binary" if (data or {}).get("protocol") == "binary" else "json"
+    broadcaster.set_protocol(request.sid, protocol)
+    if protocol == "binary":
+        encoder.force_keyframe()
+
+@socketio.on("configure")
+def on_configure(data):
+    """Set this client's maximum refresh rate: {"max_hz": 10}."""
+    if not isinstance(data, dict) or "max_hz" not in data:
+        return
+    max_hz = data["max_hz"]
+    if not broadcaster.set_max_hz(request.sid, max_hz):
+        logger.warning(f"⚠️ Ignoring invalid max_hz from {request.sid}: {max_hz!r}")
 
 # =============================================================================
 # 🌐 Flask Routes
@@ -58,9 +191,63 @@ def index():
     """Render the main dashboard interface."""
     return render_template("index.html")
 
+@app.route("/api/clients")
+def client_stats():
+    """Per-client delivery and lag counters."""
+    return jsonify(published=broadcaster.seq, clients=broadcaster.stats())
+
+@app.route("/metrics")
+def metrics():
+    """Step-loop stage histograms and counters, Prometheus text format."""
+    if not telemetry.enabled:
+        return Response("telemetry disabled\n", status=404, mimetype="text/plain")
+    return Response(telemetry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+# -----------------------------------------------------------------------------
+# 🕰️ History (memory-mapped trajectory store written by the trainer)
+# -----------------------------------------------------------------------------
+HISTORY_MAX_POINTS = 5000
+_trajectory = None
+
+def _history_store():
+    """Map the trajectory file, re-opening it after the trainer replaced it."""
+    global _trajectory
+    if _trajectory is not None and _trajectory.replaced():
+        _trajectory.close()
+        _trajectory = None
+    if _trajectory is None:
+        _trajectory = TrajectoryStore.try_open(TRAJECTORY_PATH)
+    return _trajectory
+
+@app.route("/api/history")
+def history():
+    """
+    Downsampled min/max/mean history: ?from=&to=&resolution= where
+    `resolution` is the maximum number of points returned (default 1000).
+    """
+    store = _history_store()
+    if store is None:
+        return jsonify(error="no trajectory recorded yet"), 404
+    try:
+        start = request.args.get("from", type=int)
+        stop = request.args.get("to", type=int)
+        resolution = min(HISTORY_MAX_POINTS, request.args.get("resolution", 1000, type=int))
+        return jsonify(store.history(start, stop, resolution))
+    except (ValueError, TypeError) as e:
+        return jsonify(error=str(e)), 400
+
+@app.route("/api/history/<int:step>")
+def history_step(step):
+    """Full record of one step: metrics, field state, noise and actions."""
+    store = _history_store()
+    record = store.record(step) if store is not None else None
+    if record is None:
+        return jsonify(error=f"step {step} is not retained"), 404
+    return jsonify(record)
 
 
 # =============================================================================
 # 🧵 Start Watcher Thread Automatically
 # =============================================================================
-socketio.start_background_task(watch_json)
\ No newline at end of file
+socketio.start_background_task(watch_json)
+socketio.start_background_task(broadcaster.run)
\ No newline at end of file